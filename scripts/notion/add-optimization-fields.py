@@ -8,26 +8,10 @@ Add new optimization fields to Notion database:
 These fields enable better card display and matching.
 """
 
-import os
-import requests
-import time
-from dotenv import load_dotenv
+from notionlib import NotionAPIError, NotionClient, require_env
 
-load_dotenv()
-
-NOTION_TOKEN = os.getenv('NOTION_TOKEN')
-THERAPISTS_DB_ID = os.getenv('THERAPISTS_DATABASE_ID')
-
-if not NOTION_TOKEN or not THERAPISTS_DB_ID:
-    print("❌ Error: NOTION_TOKEN and THERAPISTS_DATABASE_ID required in .env")
-    exit(1)
-
-NOTION_VERSION = "2022-06-28"
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Notion-Version": NOTION_VERSION,
-    "Content-Type": "application/json"
-}
+NOTION_TOKEN, THERAPISTS_DB_ID = require_env('NOTION_TOKEN', 'THERAPISTS_DATABASE_ID')
+client = NotionClient(NOTION_TOKEN)
 
 def main():
     print("═" * 80)
@@ -67,23 +51,15 @@ def main():
     # Add properties to database
     print("🔧 Adding properties to database...\n")
     
-    update_url = f"https://api.notion.com/v1/databases/{THERAPISTS_DB_ID}"
-    
-    response = requests.patch(
-        update_url,
-        headers=HEADERS,
-        json={"properties": new_properties}
-    )
-    
-    if response.status_code == 200:
+    try:
+        client.update_database(THERAPISTS_DB_ID, new_properties)
         print("✅ Properties added successfully!\n")
         print("New fields:")
         for prop_name in new_properties.keys():
             prop_type = list(new_properties[prop_name].keys())[0]
             print(f"   ✓ {prop_name} ({prop_type})")
-    else:
-        error = response.json()
-        print(f"❌ Error: {error.get('message', 'Unknown error')}")
+    except NotionAPIError as e:
+        print(f"❌ Error: {e.message}")
         print("\nNote: Some fields may already exist. Let's continue...")
     
     print()
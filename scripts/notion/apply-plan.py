@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Apply a change plan saved by a fixer's --plan mode.
+
+Nothing is re-read or re-evaluated: the plan's PATCHes are sent as they are.
+Each page is recorded in <plan>.done once its update succeeds, so if the run
+is interrupted, running the same command again only sends the pages that are
+still outstanding (failed pages are retried too).
+
+Pages the local snapshot shows as edited after the plan was made are held
+back, since the plan was computed from older values; re-plan them, or pass
+--force to write them anyway. Edits that are this plan's own earlier writes
+(recorded in the checkpoint) don't count, so --restart sends every page again.
+
+--async sends the PATCHes as coroutines on one event loop (notionlib.aio)
+instead of through the thread pool; it needs httpx.
+
+    python3 scripts/notion/intelligent-cleanup-other-contacts.py --plan
+    python3 scripts/notion/apply-plan.py .cache/plans/intelligent-cleanup-other-contacts.jsonl
+"""
+
+import argparse
+import asyncio
+
+from notionlib import NotionClient, WriteExecutor, print_failed_pages, print_write_result, require_env
+from notionlib.aio import AsyncNotionClient, AsyncWriteExecutor
+from notionlib.checkpoint import Checkpoint
+from notionlib.plan import WritePlan, load_plan
+from notionlib.snapshot import SnapshotMissing, load_pages
+
+NOTION_TOKEN, THERAPISTS_DB_ID = require_env('NOTION_TOKEN', 'THERAPISTS_DATABASE_ID')
+client = NotionClient(NOTION_TOKEN)
+
+async def write_async(changes, encoder, on_result, snapshot):
+    """Send the PATCHes through AsyncWriteExecutor; returns the writer"""
+    async with AsyncNotionClient(NOTION_TOKEN) as async_client:
+        async with AsyncWriteExecutor(async_client, on_result=on_result, snapshot=snapshot) as writer:
+            for change in changes:
+                await writer.submit(change.page_id, encoder.properties(change.changes), label=change.label)
+    return writer
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('plan', help="plan file (JSONL) written by --plan")
+    parser.add_argument('--restart', action='store_true', help="ignore the checkpoint and send every page again")
+    parser.add_argument('--force', action='store_true', help="also write pages edited since the plan was made")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="send the PATCHes on an asyncio event loop instead of threads (needs httpx)")
+    args = parser.parse_args()
+
+    print("═" * 80)
+    print("  Apply Change Plan")
+    print(f"  {args.plan}")
+    print("═" * 80)
+    print()
+
+    try:
+        changes = list(load_plan(args.plan))
+    except FileNotFoundError:
+        print(f"❌ Error: plan not found: {args.plan}")
+        exit(1)
+
+    checkpoint = Checkpoint(args.plan, restart=args.restart)
+    if checkpoint.stale:
+        print("⚠️  The plan changed since the last run - starting from the beginning\n")
+
+    # Edits seen by the local snapshot (no Notion request); the snapshot is
+    # also kept current with the pages written below
+    try:
+        snapshot = load_pages(client, THERAPISTS_DB_ID, offline=True)
+        edited = snapshot.edited_times()
+    except SnapshotMissing:
+        snapshot, edited = None, {}
+
+    pending = []
+    changed_since = []
+    for change in changes:
+        if change.page_id in checkpoint:
+            continue
+        current = edited.get(change.page_id)
+        # A page last edited by this plan's own earlier write isn't stale
+        ours = current == checkpoint.written.get(change.page_id)
+        stale = change.last_edited_time and current and current > change.last_edited_time and not ours
+        if not args.force and stale:
+            changed_since.append(change)
+            continue
+        pending.append(change)
+
+    print(f"📋 Plan: {len(changes)} pages")
+    print(f"   Already applied: {len(checkpoint)}")
+    print(f"   Edited since planning (held back): {len(changed_since)}")
+    print(f"   To write now: {len(pending)}")
+    print()
+
+    def on_result(result):
+        print_write_result(result)
+        if result.ok:
+            checkpoint.mark(result.page_id, result.page.get('last_edited_time'))
+
+    encoder = WritePlan()
+    with checkpoint:
+        if args.use_async:
+            try:
+                writer = asyncio.run(write_async(pending, encoder, on_result, snapshot))
+            except ImportError as e:
+                print(f"❌ Error: {e}")
+                exit(1)
+        else:
+            with WriteExecutor(client, on_result=on_result, snapshot=snapshot) as writer:
+                for change in pending:
+                    writer.submit(change.page_id, encoder.properties(change.changes), label=change.label)
+
+    for change in changed_since:
+        print(f"   ⏸️  Held back: {change.label} (edited {edited[change.page_id]})")
+    
+    print_failed_pages(writer.failures)
+
+    print()
+    print("═" * 80)
+    print()
+    print("📊 Summary:")
+    print(f"   Entries updated: {writer.succeeded}")
+    print(f"   Failed updates: {len(writer.failures)}")
+    print(f"   Held back: {len(changed_since)}")
+    print(f"   Plan complete: {len(checkpoint)}/{len(changes)} pages")
+    print()
+    if writer.failures:
+        print("🔁 Run the same command again to retry the failed pages.")
+    else:
+        print("✅ Done!")
+
+if __name__ == "__main__":
+    main()
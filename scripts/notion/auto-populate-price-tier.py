@@ -11,46 +11,25 @@ Bulk Billing = Bulk Billing checkbox is checked
 Sliding Scale = If "sliding scale" mentioned in rebates
 """
 
-import os
-import requests
-import time
-from dotenv import load_dotenv
+from notionlib import WriteExecutor, print_failed_pages, print_write_result, require_env
+from notionlib.cli import fixer_arguments, fixer_client, load_snapshot, save_plan
+from notionlib.columns import (
+    SESSION_FEE,
+    BULK_BILLING,
+    REBATES,
+    PRICE_TIER,
+)
+from notionlib.filters import is_empty
+from notionlib.plan import WritePlan
+from notionlib.record import TherapistRecord
 
-load_dotenv()
+THERAPISTS_DB_ID = require_env('THERAPISTS_DATABASE_ID')
 
-NOTION_TOKEN = os.getenv('NOTION_TOKEN')
-THERAPISTS_DB_ID = os.getenv('THERAPISTS_DATABASE_ID')
+# Only rows without a Price Tier yet need one computed
+WHERE = is_empty(PRICE_TIER)
 
-if not NOTION_TOKEN or not THERAPISTS_DB_ID:
-    print("❌ Error: NOTION_TOKEN and THERAPISTS_DATABASE_ID required in .env")
-    exit(1)
-
-NOTION_VERSION = "2022-06-28"
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Notion-Version": NOTION_VERSION,
-    "Content-Type": "application/json"
-}
-
-def get_property_value(prop):
-    """Extract value from a Notion property"""
-    if not prop:
-        return ""
-    
-    prop_type = prop.get('type')
-    
-    if prop_type == 'title':
-        return prop.get('title', [{}])[0].get('plain_text', '') if prop.get('title') else ''
-    elif prop_type == 'rich_text':
-        return prop.get('rich_text', [{}])[0].get('plain_text', '') if prop.get('rich_text') else ''
-    elif prop_type == 'number':
-        return prop.get('number')
-    elif prop_type == 'checkbox':
-        return prop.get('checkbox', False)
-    elif prop_type == 'select':
-        return prop.get('select', {}).get('name', '') if prop.get('select') else ''
-    
-    return ""
+# Columns this script reads (everything else is neither fetched nor decoded)
+COLUMNS = TherapistRecord.projection([SESSION_FEE, BULK_BILLING, REBATES, PRICE_TIER])
 
 def determine_price_tier(session_fee, bulk_billing, rebates):
     """Determine price tier from session fee"""
@@ -77,97 +56,80 @@ def determine_price_tier(session_fee, bulk_billing, rebates):
     else:
         return "$$$$"
 
+def fix(therapist, plan):
+    """Queue the Price Tier for one therapist; returns False if it can't be determined or is already set"""
+    # Extract values
+    name = therapist.display_name
+    
+    session_fee = therapist.session_fee
+    bulk_billing = therapist.bulk_billing
+    rebates = therapist.rebates
+    existing_price_tier = therapist.price_tier
+    
+    # Determine price tier
+    price_tier = determine_price_tier(session_fee, bulk_billing, rebates)
+    
+    # Skip if already has price tier or no data to determine it
+    if existing_price_tier or not price_tier:
+        return False
+    
+    # Update
+    print(f"📝 {name}")
+    print(f"   Session Fee: ${session_fee}" if session_fee else "   Session Fee: (not set)")
+    print(f"   Bulk Billing: {'Yes' if bulk_billing else 'No'}")
+    if rebates:
+        print(f"   Rebates: {rebates[:50]}...")
+    print(f"   → Price Tier: {price_tier}")
+    
+    plan.update(therapist, {PRICE_TIER: price_tier})
+    
+    print("   " + "─" * 76)
+    print()
+    return True
+
 def main():
+    args = fixer_arguments(__file__, __doc__)
+    
     print("═" * 80)
     print("  Auto-Populate Price Tier")
     print("  Based on Session Fee and Bulk Billing status")
     print("═" * 80)
     print()
     
-    # Query the database
-    url = f"https://api.notion.com/v1/databases/{THERAPISTS_DB_ID}/query"
-    all_results = []
-    has_more = True
-    start_cursor = None
-    
-    while has_more:
-        payload = {"page_size": 100}
-        if start_cursor:
-            payload["start_cursor"] = start_cursor
-        
-        response = requests.post(url, headers=HEADERS, json=payload)
-        
-        if response.status_code != 200:
-            print(f"❌ Error: {response.json()}")
-            exit(1)
-        
-        data = response.json()
-        all_results.extend(data.get('results', []))
-        has_more = data.get('has_more', False)
-        start_cursor = data.get('next_cursor')
-    
-    print(f"✅ Found {len(all_results)} total entries\n")
+    # Refresh the local snapshot (only pages edited since the last run are fetched),
+    # or read it offline in --plan mode
+    client = fixer_client(args)
+    snapshot = load_snapshot(client, THERAPISTS_DB_ID, args, where=WHERE, columns=COLUMNS)
+    
+    print(f"✅ Found {snapshot.count(WHERE)} entries without a Price Tier\n")
     print("═" * 80)
     print()
     
-    updated_count = 0
+    plan = WritePlan()
     skipped_count = 0
     
-    for entry in all_results:
-        props = entry.get('properties', {})
-        page_id = entry.get('id')
-        
-        # Extract values
-        first_name = get_property_value(props.get('First Name'))
-        last_name = get_property_value(props.get('Last Name'))
-        name = f"{first_name} {last_name}".strip() if first_name or last_name else "Unknown"
-        
-        session_fee = get_property_value(props.get('Session Fee'))
-        bulk_billing = get_property_value(props.get('Bulk Billing'))
-        rebates = get_property_value(props.get('Do you offer rebates or other funding models?'))
-        existing_price_tier = get_property_value(props.get('Price Tier'))
-        
-        # Determine price tier
-        price_tier = determine_price_tier(session_fee, bulk_billing, rebates)
-        
-        # Skip if already has price tier or no data to determine it
-        if existing_price_tier or not price_tier:
+    for therapist in snapshot.rows(COLUMNS, WHERE):
+        if not fix(therapist, plan):
             skipped_count += 1
-            continue
-        
-        # Update
-        print(f"📝 {name}")
-        print(f"   Session Fee: ${session_fee}" if session_fee else "   Session Fee: (not set)")
-        print(f"   Bulk Billing: {'Yes' if bulk_billing else 'No'}")
-        if rebates:
-            print(f"   Rebates: {rebates[:50]}...")
-        print(f"   → Price Tier: {price_tier}")
-        
-        update_url = f"https://api.notion.com/v1/pages/{page_id}"
-        update_payload = {
-            "properties": {
-                "Price Tier": {"select": {"name": price_tier}}
-            }
-        }
-        
-        update_response = requests.patch(update_url, headers=HEADERS, json=update_payload)
-        
-        if update_response.status_code == 200:
-            print(f"   ✅ Updated")
-            updated_count += 1
-        else:
-            print(f"   ❌ Error: {update_response.json().get('message', 'Unknown')}")
-        
-        print("   " + "─" * 76)
-        print()
-        
-        time.sleep(0.334)
     
+    plan.report()
+    
+    if args.plan:
+        save_plan(plan, args)
+        return
+    
+    with WriteExecutor(client, on_result=print_write_result, snapshot=snapshot) as writer:
+        plan.apply(writer)
+    
+    print_failed_pages(writer.failures)
+    updated_count = writer.succeeded
+
     print()
     print("═" * 80)
     print()
     print("📊 Summary:")
     print(f"   Entries updated: {updated_count}")
+    print(f"   Failed updates: {len(writer.failures)}")
     print(f"   Entries skipped: {skipped_count}")
     print()
     
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Benchmark the maintenance pass against the local Notion API stand-in.
+
+For each dataset size a synthetic therapists database (notionlib.synthetic:
+realistic, messy "Other contacts" text, shared clinic phones, ...) is served
+by MockNotion with the given latency, and the pass is timed stage by stage:
+
+    fetch   full (sharded) query of the database into a throwaway snapshot
+    decode  snapshot rows -> TherapistRecords, for every column the stages read
+    parse   "Other contacts" interpretation of the interpreting stages,
+            starting from an empty cache
+    diff    every stage's fix() on every row it matches, into one WritePlan
+    write   PATCHing the first --writes pages of the plan
+
+Each stage reports rows/s and, where it talks to the server, requests/s.
+Nothing touches Notion, the real snapshot or the interpretation cache.
+
+    python3 scripts/notion/benchmark.py                       # 1k, 10k and 100k rows
+    python3 scripts/notion/benchmark.py --rows 10000 --latency 0.1 --workers 4
+    python3 scripts/notion/benchmark.py --save bench.json
+    python3 scripts/notion/benchmark.py --baseline bench.json  # exit 1 on a regression
+
+With --rate 0 (the default) neither the server nor the client throttles, so
+fetch and write measure the client's concurrency rather than Notion's
+3 req/s budget; pass --rate 3 to see real-world times.
+
+The server runs in the benchmark's own process, so its CPU time is part of
+every number: compare timings taken on the same machine, and treat small
+datasets (where a run is a fraction of a second) as noisy.
+"""
+
+import argparse
+import io
+import itertools
+import json
+import os
+import time
+from collections import namedtuple
+from contextlib import redirect_stdout
+
+# Stage scripts read these at import; keep them off the real database and cache
+os.environ.setdefault('NOTION_TOKEN', 'mock')
+os.environ.setdefault('THERAPISTS_DATABASE_ID', 'benchmark')
+os.environ['NOTION_MEMO'] = 'off'
+
+from notionlib import NotionClient, RateLimiter, WriteExecutor
+from notionlib.cli import load_script
+from notionlib.filters import any_of
+from notionlib.mockserver import MockNotion, start_server
+from notionlib.plan import WritePlan
+from notionlib.record import TherapistRecord
+from notionlib.snapshot import Snapshot
+from notionlib.synthetic import synthetic_pages
+
+DATABASE_ID = 'benchmark'
+
+# The stages of run-maintenance.py, in order
+STAGES = load_script('run-maintenance.py').STAGES
+
+# Client budget when nothing throttles (RateLimiter needs a finite rate)
+UNLIMITED = 1e6
+
+# With no injected latency the mock must answer in under this share of
+# --latency, or fetch and write time the HTTP stack rather than the latency
+MAX_OVERHEAD = 0.25
+
+Timing = namedtuple('Timing', ['stage', 'rows', 'seconds', 'requests'])
+
+
+def rate(count, seconds):
+    return count / seconds if seconds else 0.0
+
+
+def timed(timings, stage, mock, func):
+    """Run one stage with its output silenced; func() returns (result, rows handled)"""
+    requests_before = mock.stats['requests']
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        result, rows = func()
+    timings.append(Timing(stage, rows, time.perf_counter() - started, mock.stats['requests'] - requests_before))
+    return result
+
+
+def server_overhead(samples=50):
+    """Mean seconds per request against a latency-free mock: the floor under every fetch and write"""
+    mock = MockNotion()
+    mock.add_database(DATABASE_ID, synthetic_pages(1, seed=0))
+    server, base_url = start_server(mock)
+    client = NotionClient('mock', base_url=base_url, rate_limiter=RateLimiter(rate=UNLIMITED, burst=UNLIMITED))
+    try:
+        client.get_database(DATABASE_ID)
+        started = time.perf_counter()
+        for _ in range(samples):
+            client.get_database(DATABASE_ID)
+        return (time.perf_counter() - started) / samples
+    finally:
+        server.shutdown()
+        client.session.close()
+
+
+def run(rows, args):
+    """Benchmark one dataset size; returns the list of Timings"""
+    mock = MockNotion(latency=args.latency, jitter=args.jitter, rate=args.rate or None)
+    mock.add_database(DATABASE_ID, synthetic_pages(rows, seed=args.seed))
+    server, base_url = start_server(mock)
+
+    client_rate = RateLimiter(rate=args.rate, burst=3) if args.rate else RateLimiter(rate=UNLIMITED, burst=UNLIMITED)
+    client = NotionClient('mock', base_url=base_url, rate_limiter=client_rate)
+
+    # Fresh modules, so every size starts with empty caches
+    stages = [load_script(name) for name in STAGES]
+    columns = TherapistRecord.projection([column for stage in stages for column in stage.COLUMNS])
+    where = any_of(*[stage.WHERE for stage in stages])
+
+    timings = []
+    try:
+        def fetch():
+            snapshot = Snapshot(DATABASE_ID, path=':memory:')
+            return snapshot, snapshot.refresh(client, full=True, shards=args.shards)
+
+        def decode():
+            records = list(snapshot.rows(columns, where))
+            return records, len(records)
+
+        def parse():
+            parsed = 0
+            for stage in stages:
+                if hasattr(stage, 'interpret'):
+                    matching = [record for record in records if stage.WHERE.matches(record)]
+                    texts = [record.other_contacts for record in matching]
+                    contexts = [stage.row_context(record) for record in matching]
+                    parsed += sum(1 for _ in stage.interpret.map(texts, contexts, workers=args.workers))
+            return None, parsed
+
+        def diff():
+            plan = WritePlan()
+            for therapist in records:
+                for stage in stages:
+                    record = plan.view(therapist)
+                    if stage.WHERE.matches(record):
+                        stage.fix(record, plan)
+            return plan, len(records)
+
+        def write():
+            with WriteExecutor(client, max_in_flight=args.in_flight) as writer:
+                for change in itertools.islice(plan, args.writes):
+                    writer.submit(change.page_id, plan.properties(change.changes), label=change.label)
+            return writer, writer.succeeded + len(writer.failures)
+
+        snapshot = timed(timings, 'fetch', mock, fetch)
+        records = timed(timings, 'decode', mock, decode)
+        timed(timings, 'parse', mock, parse)
+        plan = timed(timings, 'diff', mock, diff)
+        writer = timed(timings, 'write', mock, write)
+    finally:
+        server.shutdown()
+        client.session.close()
+
+    print(f"   Plan: {len(plan)} pages to change, {plan.changes} values; "
+          f"{writer.succeeded} written, {len(writer.failures)} failed, {mock.stats['throttled']} throttled")
+    return timings
+
+
+def print_timings(rows, timings):
+    print()
+    print(f"   {'stage':<8} {'rows':>8} {'seconds':>9} {'rows/s':>11} {'requests':>9} {'req/s':>8}")
+    for timing in timings:
+        requests_per_second = f"{rate(timing.requests, timing.seconds):8.1f}" if timing.requests else f"{'-':>8}"
+        print(f"   {timing.stage:<8} {timing.rows:>8} {timing.seconds:>9.3f} "
+              f"{rate(timing.rows, timing.seconds):>11.0f} {timing.requests:>9} {requests_per_second}")
+    print(f"   {'total':<8} {rows:>8} {sum(timing.seconds for timing in timings):>9.3f}")
+    print()
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print rows/s against a saved run; returns the stages that got slower by
+    more than `tolerance` (a fraction).
+    """
+    regressions = []
+    print("📈 Against baseline:")
+    for rows, timings in results.items():
+        before = {timing['stage']: timing for timing in baseline.get(str(rows), [])}
+        for timing in timings:
+            old = before.get(timing.stage)
+            if not old or not old['seconds'] or not timing.seconds:
+                continue
+            old_rate, new_rate = rate(old['rows'], old['seconds']), rate(timing.rows, timing.seconds)
+            if not old_rate:
+                continue
+            change = new_rate / old_rate - 1
+            slower = change < -tolerance
+            if slower:
+                regressions.append((rows, timing.stage))
+            print(f"   {'❌' if slower else '✓'} {rows:>7} {timing.stage:<8} {old_rate:>10.0f} -> {new_rate:>10.0f} rows/s ({change:+.0%})")
+    print()
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], metavar='N',
+                        help="dataset sizes (default: 1000 10000 100000)")
+    parser.add_argument('--seed', type=int, default=0, help="dataset seed (same seed, same rows)")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds the server adds to every response")
+    parser.add_argument('--jitter', type=float, default=0.02, help="up to this many more seconds, at random")
+    parser.add_argument('--rate', type=float, default=0,
+                        help="requests per second for server and client (default 0: no throttling)")
+    parser.add_argument('--shards', type=int, default=None, help="created_time shards for the fetch")
+    parser.add_argument('--workers', type=int, default=1, help="parse worker processes (0 = one per core)")
+    parser.add_argument('--in-flight', type=int, default=4, help="PATCHes in flight during the write stage")
+    parser.add_argument('--writes', type=int, default=1000, help="pages PATCHed in the write stage")
+    parser.add_argument('--save', metavar='PATH', help="save the timings as JSON")
+    parser.add_argument('--baseline', metavar='PATH', help="compare with timings saved by --save")
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help="slowdown against the baseline that counts as a regression (default 0.3 = 30%%)")
+    args = parser.parse_args()
+
+    print("═" * 80)
+    print("  Maintenance Pass Benchmark")
+    print(f"  Mock Notion API: {args.latency}s latency (+{args.jitter}s), "
+          f"{args.rate or 'unlimited'} req/s, {args.in_flight} writes in flight")
+    print("═" * 80)
+    print()
+
+    overhead = server_overhead()
+    print(f"⏱️  Server overhead: {overhead * 1000:.1f} ms per request with no latency")
+    if args.latency and overhead > args.latency * MAX_OVERHEAD:
+        print(f"❌ Error: that is more than {MAX_OVERHEAD:.0%} of the {args.latency}s latency, "
+              f"so fetch and write would measure the server, not the client")
+        exit(1)
+    if args.latency:
+        # In-flight requests overlap their latency but not their CPU time,
+        # which the client and the in-process server spend under one GIL
+        ceiling = args.in_flight / (args.latency + args.jitter / 2 + args.in_flight * overhead)
+        print(f"   Write can reach about {ceiling:.0f} req/s ({args.in_flight} in flight)")
+    print()
+
+    results = {}
+    for rows in args.rows:
+        print(f"🧪 {rows} rows")
+        results[rows] = run(rows, args)
+        print_timings(rows, results[rows])
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({str(rows): [timing._asdict() for timing in timings] for rows, timings in results.items()},
+                      f, indent=2)
+        print(f"💾 Timings saved to {args.save}\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} stages slower than the baseline by more than {args.tolerance:.0%}")
+            exit(1)
+        print("✅ No regressions")
+
+if __name__ == "__main__":
+    main()
@@ -9,47 +9,47 @@ Final comprehensive cleanup - handles all remaining edge cases:
 - Business names for website column
 """
 
-import os
-import requests
 import re
-import time
-from dotenv import load_dotenv
+from notionlib import WriteExecutor, print_failed_pages, print_write_result, require_env
+from notionlib.cli import fixer_arguments, fixer_client, load_snapshot, save_plan
+from notionlib.columns import (
+    BUSINESS_NAME,
+    WEBSITE,
+    OTHER_CONTACTS,
+    ADMIN_NOTES,
+)
+from notionlib.extract import scan_text
+from notionlib.filters import is_not_empty
+from notionlib.memo import Memo, rules_version
+from notionlib.plan import WritePlan
+from notionlib.platforms import PLATFORMS, social_platforms
+from notionlib.record import TherapistRecord
 
-load_dotenv()
+THERAPISTS_DB_ID = require_env('THERAPISTS_DATABASE_ID')
 
-NOTION_TOKEN = os.getenv('NOTION_TOKEN')
-THERAPISTS_DB_ID = os.getenv('THERAPISTS_DATABASE_ID')
+# Only rows with something left in "Other contacts" are relevant
+WHERE = is_not_empty(OTHER_CONTACTS)
 
-HEADERS = {
-    'Authorization': f'Bearer {NOTION_TOKEN}',
-    'Notion-Version': '2022-06-28',
-    'Content-Type': 'application/json'
-}
+# Platforms with their own column (Instagram, Facebook, Twitter, LinkedIn, ...)
+SOCIAL_PLATFORMS = social_platforms()
 
-def get_property_value(prop):
-    if not prop:
-        return ""
-    prop_type = prop.get('type')
-    if prop_type == 'title':
-        return prop.get('title', [{}])[0].get('plain_text', '') if prop.get('title') else ''
-    elif prop_type == 'rich_text':
-        return prop.get('rich_text', [{}])[0].get('plain_text', '') if prop.get('rich_text') else ''
-    elif prop_type == 'url':
-        return prop.get('url', '')
-    return ""
+# Columns this script reads (everything else is neither fetched nor decoded)
+COLUMNS = TherapistRecord.projection([BUSINESS_NAME, WEBSITE, OTHER_CONTACTS, ADMIN_NOTES]
+                                     + [rule.column for rule in SOCIAL_PLATFORMS])
+
+# Whole-value checks (the per-token patterns live in notionlib.extract)
+BARE_HANDLE_PATTERN = re.compile(r'^[a-z0-9_.]+$')
+BUSINESS_NAME_PATTERN = re.compile(r'^[A-Za-z\s]{3,50}$')
 
 def comprehensive_interpret(text, context):
     """Final comprehensive interpretation with all edge cases"""
-    result = {
-        'instagram': None,
-        'facebook': None,
-        'twitter': None,
-        'linkedin': None,
+    result = {rule.name: None for rule in SOCIAL_PLATFORMS}
+    result.update({
         'website': None,
         'notes': None,
         'should_clear': False,
         'reasoning': []
-    }
+    })
     
     if not text or not text.strip():
         return result
@@ -57,111 +57,54 @@ def comprehensive_interpret(text, context):
     text_clean = text.strip()
     text_lower = text_clean.lower()
     
-    # === MULTIPLE URLs IN ONE LINE ===
-    url_pattern = r'https?://[^\s]+'
-    urls = re.findall(url_pattern, text_clean)
+    # Tokenize once; everything below reads the tokens
+    scan = scan_text(text_clean)
     
-    for url in urls:
-        url_lower = url.lower()
-        
-        if 'instagram.com' in url_lower and not context.get('existing_instagram'):
-            # Extract handle
-            handle_match = re.search(r'instagram\.com/([^/?]+)', url)
-            if handle_match:
-                handle = handle_match.group(1)
-                result['instagram'] = f"@{handle}"
-                result['reasoning'].append(f"Extracted Instagram: @{handle}")
-        
-        elif 'facebook.com' in url_lower and not context.get('existing_facebook'):
-            result['facebook'] = url
-            result['reasoning'].append(f"Extracted Facebook URL")
-        
-        elif 'linkedin.com' in url_lower and not context.get('existing_linkedin'):
-            result['linkedin'] = url
-            result['reasoning'].append(f"Extracted LinkedIn URL")
-        
-        elif 'twitter.com' in url_lower and not context.get('existing_twitter'):
-            handle_match = re.search(r'twitter\.com/([^/?]+)', url)
-            if handle_match:
-                result['twitter'] = f"https://twitter.com/{handle_match.group(1)}"
-                result['reasoning'].append(f"Extracted Twitter")
-        
-        elif not urls[0] == url:  # Not the first URL
-            continue
-        elif not context.get('existing_website'):
-            result['website'] = url
-            result['reasoning'].append(f"Extracted website")
-    
-    # === INSTAGRAM WITH PARENTHESES ===
-    # "@handle (instagram)" or "handle (Instagram)"
-    ig_paren_match = re.search(r'@?([a-z0-9_.]+)\s*\(instagram\)', text_lower)
-    if ig_paren_match and not context.get('existing_instagram'):
-        handle = ig_paren_match.group(1)
-        result['instagram'] = f"@{handle}"
-        result['reasoning'].append(f"Extracted Instagram from parentheses: @{handle}")
-    
-    # "Instagram: @handle" or "Instagram @handle"
-    ig_colon_match = re.search(r'instagram[\s:]+@?([a-z0-9_.]+)', text_lower)
-    if ig_colon_match and not context.get('existing_instagram') and not result['instagram']:
-        handle = ig_colon_match.group(1)
-        if handle not in ['sound', 'and']:  # Filter out common words
-            result['instagram'] = f"@{handle}"
-            result['reasoning'].append(f"Extracted Instagram: @{handle}")
+    # === SOCIAL PROFILES ===
+    # Profile links (with or without https://), then handles named next to a
+    # platform keyword: "@handle (instagram)", "Instagram: @handle", "Twitter: x"
+    for platform, value in scan.social_values().items():
+        if not context.get(f"existing_{platform}"):
+            result[platform] = value
+            result['reasoning'].append(f"Extracted {PLATFORMS[platform].label}: {value}")
     
     # Just "@handle" alone
-    lone_handle_match = re.match(r'^@([a-z0-9_.]+)$', text_lower)
-    if lone_handle_match and not context.get('existing_instagram'):
-        handle = lone_handle_match.group(1)
-        result['instagram'] = f"@{handle}"
+    handle = scan.lone_handle()
+    if handle and not context.get('existing_instagram'):
+        result['instagram'] = PLATFORMS['instagram'].value(handle)
         result['reasoning'].append(f"Extracted Instagram handle: @{handle}")
     
     # "handle_name" alone (username without @)
     if not result['instagram'] and not context.get('existing_instagram'):
-        if re.match(r'^[a-z0-9_.]+$', text_lower) and len(text_clean) > 3 and '_' in text_clean:
-            result['instagram'] = f"@{text_clean}"
-            result['reasoning'].append(f"Inferred Instagram handle: @{text_clean}")
-    
-    # === FACEBOOK WITHOUT HTTPS ===
-    if 'facebook.com' in text_lower and not result['facebook'] and not context.get('existing_facebook'):
-        fb_match = re.search(r'(?:www\.)?facebook\.com/([^\s]+)', text_lower)
-        if fb_match:
-            result['facebook'] = f"https://facebook.com/{fb_match.group(1)}"
-            result['reasoning'].append(f"Added https:// to Facebook URL")
-    
-    # "Facebook: pagename" or "Facebook pagename"
-    if not result['facebook'] and not context.get('existing_facebook'):
-        fb_page_match = re.search(r'facebook[\s:]+@?([a-z0-9_.]+)', text_lower)
-        if fb_page_match:
-            pagename = fb_page_match.group(1)
-            if pagename not in ['page', 'the', 'and']:
-                result['facebook'] = f"https://facebook.com/{pagename}"
-                result['reasoning'].append(f"Constructed Facebook URL: {pagename}")
-    
-    # === LINKEDIN WITHOUT HTTPS ===
-    if 'linkedin.com' in text_lower and not result['linkedin'] and not context.get('existing_linkedin'):
-        li_match = re.search(r'linkedin\.com/in/([^\s]+)', text_lower)
-        if li_match:
-            result['linkedin'] = f"https://linkedin.com/in/{li_match.group(1)}"
-            result['reasoning'].append(f"Added https:// to LinkedIn URL")
-    
-    # === TWITTER/X HANDLES ===
-    if not result['twitter'] and not context.get('existing_twitter'):
-        tw_match = re.search(r'(?:twitter|x)[\s:]+@?([a-z0-9_]+)', text_lower)
-        if tw_match:
-            result['twitter'] = f"https://twitter.com/{tw_match.group(1)}"
-            result['reasoning'].append(f"Extracted Twitter handle")
+        if BARE_HANDLE_PATTERN.match(text_lower) and len(text_clean) > 3 and '_' in text_clean:
+            result['instagram'] = PLATFORMS['instagram'].value(text_lower)
+            result['reasoning'].append(f"Inferred Instagram handle: @{text_lower}")
+    
+    # === MULTIPLE URLs IN ONE LINE ===
+    for i, url in enumerate(scan.urls):
+        rule = PLATFORMS.get(url.platform)
+        
+        if rule is not None:
+            if rule.column is None:
+                # No dedicated column (TikTok) - add to notes
+                result['notes'] = f"{rule.label}: {url.text}"
+                result['reasoning'].append(f"Added {rule.label} to notes")
+        elif i == 0 and not context.get('existing_website'):
+            # Only the first URL is taken as the website
+            result['website'] = url.text
+            result['reasoning'].append(f"Extracted website")
     
     # === INCOMPLETE PHONE NUMBERS ===
     # Numbers like "412930789" (9 digits, missing leading 0)
-    if re.match(r'^\d{9}$', text_clean):
+    if text_clean.isdigit() and len(text_clean) == 9:
         result['notes'] = f"Possible phone (missing leading 0): {text_clean}"
         result['reasoning'].append("Incomplete phone - added to notes")
     
     # === BUSINESS NAMES AS WEBSITES ===
     # If it looks like a business name with no other data
-    if not any([result['instagram'], result['facebook'], result['twitter'], result['linkedin'], result['website']]):
+    if not result['website'] and not any(result[rule.name] for rule in SOCIAL_PLATFORMS):
         # Check if it's a simple name (2-4 words, no special chars except spaces)
-        if re.match(r'^[A-Za-z\s]{3,50}$', text_clean) and text_clean.count(' ') <= 3:
+        if BUSINESS_NAME_PATTERN.match(text_clean) and text_clean.count(' ') <= 3:
             # It's likely just a business name - check against context
             if context.get('business_name') and context['business_name'].lower() in text_lower:
                 result['should_clear'] = True
@@ -177,140 +120,147 @@ def comprehensive_interpret(text, context):
     # === WEBSITES WITHOUT HTTP ===
     # www.domain.com or domain.com
     if not result['website'] and not context.get('existing_website'):
-        www_match = re.search(r'(?:www\.)?([a-z0-9\-]+\.[a-z]{2,}(?:/[^\s]*)?)', text_lower)
-        if www_match and not any(x in text_lower for x in ['instagram', 'facebook', 'linkedin', 'twitter']):
-            domain = www_match.group(0)
-            result['website'] = f"https://{domain}" if not domain.startswith('http') else domain
+        domain = scan.first('domain')
+        if domain and not scan.platforms:
+            result['website'] = f"https://{domain.lower}"
             result['reasoning'].append(f"Constructed website URL")
     
     # === DETERMINE IF SHOULD CLEAR ===
-    if any([result['instagram'], result['facebook'], result['twitter'], 
-            result['linkedin'], result['website'], result['notes']]):
+    if result['website'] or result['notes'] or any(result[rule.name] for rule in SOCIAL_PLATFORMS):
         result['should_clear'] = True
     
     return result
 
+def row_context(therapist):
+    """Context for comprehensive_interpret(): what the row already has"""
+    context = {
+        'business_name': therapist.business_name,
+        'existing_website': therapist.website,
+    }
+    for rule in SOCIAL_PLATFORMS:
+        context[f"existing_{rule.name}"] = therapist.get(rule.column)
+    return context
+
+def interpretation_key(text, context):
+    """
+    What comprehensive_interpret() reads from (text, context), for the cache:
+    the stripped text, whether each existing column is filled, and whether
+    the text mentions the business name.
+    """
+    text_clean = text.strip()
+    key = {field: bool(value) for field, value in context.items() if field.startswith('existing_')}
+    business_name = context.get('business_name')
+    key['business_name'] = bool(business_name) and business_name.lower() in text_clean.lower()
+    return [text_clean, key]
+
+# Identical text in the same context is interpreted once, then reused from
+# .cache/memo.sqlite until this script or the extraction rules change
+interpret = Memo('final-comprehensive-cleanup', comprehensive_interpret,
+                 key=interpretation_key, version=rules_version(__file__))
+
+def fix(therapist, plan, interpreted=None):
+    """Interpret one therapist's Other Contacts and queue the changes; returns False if nothing changes"""
+    name = therapist.display_name
+    
+    other_contacts = therapist.other_contacts
+    
+    if not other_contacts or not other_contacts.strip():
+        return False
+    
+    context = row_context(therapist)
+    
+    if interpreted is None:
+        interpreted = interpret(other_contacts, context)
+    
+    updates = {}
+    
+    for rule in SOCIAL_PLATFORMS:
+        if interpreted[rule.name] and not context[f"existing_{rule.name}"]:
+            updates[rule.column] = interpreted[rule.name]
+    
+    if interpreted['website'] and not context['existing_website']:
+        updates[WEBSITE] = interpreted['website']
+    
+    if interpreted['notes']:
+        existing_notes = therapist.admin_notes
+        new_notes = f"{existing_notes}\n{interpreted['notes']}" if existing_notes else interpreted['notes']
+        updates[ADMIN_NOTES] = new_notes.strip()
+    
+    if interpreted['should_clear']:
+        updates[OTHER_CONTACTS] = ""
+    
+    if not plan.update(therapist, updates):
+        return False
+    
+    print(f"📝 {name}")
+    print(f"   Original: \"{other_contacts}\"")
+    if interpreted['reasoning']:
+        print(f"   🧠 Reasoning: {', '.join(interpreted['reasoning'])}")
+    
+    for rule in SOCIAL_PLATFORMS:
+        if interpreted[rule.name]:
+            print(f"   {rule.icon} {rule.label}: {interpreted[rule.name]}")
+    if interpreted['website']:
+        print(f"   🌐 Website: {interpreted['website']}")
+    if interpreted['notes']:
+        print(f"   📝 Notes: {interpreted['notes']}")
+    
+    print("   " + "─" * 76)
+    print()
+    return True
+
 def main():
+    args = fixer_arguments(__file__, __doc__, workers=True)
+    
     print("═" * 80)
     print("  Final Comprehensive Cleanup")
     print("  Handling all remaining edge cases")
     print("═" * 80)
     print()
     
-    url = f"https://api.notion.com/v1/databases/{THERAPISTS_DB_ID}/query"
-    all_results = []
-    has_more = True
-    start_cursor = None
-    
-    while has_more:
-        payload = {"page_size": 100}
-        if start_cursor:
-            payload["start_cursor"] = start_cursor
-        
-        response = requests.post(url, headers=HEADERS, json=payload)
-        data = response.json()
-        all_results.extend(data.get('results', []))
-        has_more = data.get('has_more', False)
-        start_cursor = data.get('next_cursor')
+    # Refresh the local snapshot (only pages edited since the last run are fetched),
+    # or read it offline in --plan mode
+    client = fixer_client(args)
+    snapshot = load_snapshot(client, THERAPISTS_DB_ID, args, where=WHERE, columns=COLUMNS)
     
-    print(f"✅ Found {len(all_results)} total entries\n")
+    print(f"✅ Found {snapshot.count(WHERE)} entries with \"Other Contacts\" data\n")
     print("═" * 80)
     print()
     
-    updated_count = 0
+    plan = WritePlan()
     
-    for entry in all_results:
-        props = entry.get('properties', {})
-        page_id = entry.get('id')
-        
-        first_name = get_property_value(props.get('First Name'))
-        last_name = get_property_value(props.get('Last Name'))
-        name = f"{first_name} {last_name}".strip() if first_name or last_name else "Unknown"
-        
-        other_contacts = get_property_value(props.get('Other contact details, social media, etc.'))
-        
-        if not other_contacts or not other_contacts.strip():
-            continue
-        
-        context = {
-            'business_name': get_property_value(props.get('Business Name')),
-            'existing_instagram': get_property_value(props.get('Instagram')),
-            'existing_facebook': get_property_value(props.get('Facebook')),
-            'existing_twitter': get_property_value(props.get('Twitter/X')),
-            'existing_linkedin': get_property_value(props.get('LinkedIn')),
-            'existing_website': get_property_value(props.get('Website (or alternative listing like Facebook or health engine)')),
-        }
-        
-        interpreted = comprehensive_interpret(other_contacts, context)
-        
-        updates = {}
-        has_updates = False
-        
-        if interpreted['instagram'] and not context['existing_instagram']:
-            updates['Instagram'] = {'rich_text': [{'text': {'content': interpreted['instagram']}}]}
-            has_updates = True
-        
-        if interpreted['facebook'] and not context['existing_facebook']:
-            updates['Facebook'] = {'url': interpreted['facebook']}
-            has_updates = True
-        
-        if interpreted['twitter'] and not context['existing_twitter']:
-            updates['Twitter/X'] = {'rich_text': [{'text': {'content': interpreted['twitter']}}]}
-            has_updates = True
-        
-        if interpreted['linkedin'] and not context['existing_linkedin']:
-            updates['LinkedIn'] = {'url': interpreted['linkedin']}
-            has_updates = True
-        
-        if interpreted['website'] and not context['existing_website']:
-            updates['Website (or alternative listing like Facebook or health engine)'] = {'url': interpreted['website']}
-            has_updates = True
-        
-        if interpreted['notes']:
-            existing_notes = get_property_value(props.get('Admin Notes'))
-            new_notes = f"{existing_notes}\n{interpreted['notes']}" if existing_notes else interpreted['notes']
-            updates['Admin Notes'] = {'rich_text': [{'text': {'content': new_notes.strip()}}]}
-            has_updates = True
-        
-        if interpreted['should_clear']:
-            updates['Other contact details, social media, etc.'] = {'rich_text': []}
-            has_updates = True
-        
-        if has_updates:
-            print(f"📝 {name}")
-            print(f"   Original: \"{other_contacts}\"")
-            if interpreted['reasoning']:
-                print(f"   🧠 Reasoning: {', '.join(interpreted['reasoning'])}")
-            
-            if interpreted['instagram']:
-                print(f"   📸 Instagram: {interpreted['instagram']}")
-            if interpreted['facebook']:
-                print(f"   👥 Facebook: {interpreted['facebook']}")
-            if interpreted['twitter']:
-                print(f"   🐦 Twitter: {interpreted['twitter']}")
-            if interpreted['linkedin']:
-                print(f"   💼 LinkedIn: {interpreted['linkedin']}")
-            if interpreted['website']:
-                print(f"   🌐 Website: {interpreted['website']}")
-            if interpreted['notes']:
-                print(f"   📝 Notes: {interpreted['notes']}")
-            
-            update_url = f"https://api.notion.com/v1/pages/{page_id}"
-            update_response = requests.patch(update_url, headers=HEADERS, json={"properties": updates})
-            
-            if update_response.status_code == 200:
-                print(f"   ✅ Updated successfully")
-                updated_count += 1
-            else:
-                print(f"   ❌ Error: {update_response.json().get('message', 'Unknown')}")
-            
-            print("   " + "─" * 76)
-            print()
-            time.sleep(0.334)
+    rows = list(snapshot.rows(COLUMNS, WHERE))
     
+    # Interpretation is the CPU-heavy part: text already seen is taken from the
+    # cache, and with --workers the rest runs in a process pool
+    interpretations = interpret.map(
+        [therapist.other_contacts for therapist in rows],
+        [row_context(therapist) for therapist in rows],
+        workers=args.workers,
+    )
+    
+    for therapist, interpreted in zip(rows, interpretations):
+        fix(therapist, plan, interpreted)
+    
+    print(f"🗃️  Interpretations: {interpret.misses} parsed, {interpret.hits} reused from the cache")
+    interpret.save()
+    
+    plan.report()
+    
+    if args.plan:
+        save_plan(plan, args)
+        return
+    
+    with WriteExecutor(client, on_result=print_write_result, snapshot=snapshot) as writer:
+        plan.apply(writer)
+    
+    print_failed_pages(writer.failures)
+    updated_count = writer.succeeded
+
     print()
     print("═" * 80)
     print(f"📊 Updated: {updated_count} entries")
+    print(f"❌ Failed: {len(writer.failures)} entries")
     print("✅ Final cleanup complete!")
 
 if __name__ == "__main__":
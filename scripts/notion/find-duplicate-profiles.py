@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Find therapist profiles that are probably the same person, across the whole
+database: rows sharing a phone number (with or without area code), an email
+address or a website, or with near-identical names ("Jane Smith" /
+"Dr Jane Smith"). Read-only; prints clusters for manual review.
+"""
+
+from notionlib import NotionClient, require_env
+from notionlib.cli import load_snapshot
+from notionlib.columns import EMAIL, PHONE, WEBSITE, OTHER_CONTACTS
+from notionlib.duplicates import DuplicateIndex
+from notionlib.names import NameIndex
+from notionlib.record import TherapistRecord
+
+NOTION_TOKEN, THERAPISTS_DB_ID = require_env('NOTION_TOKEN', 'THERAPISTS_DATABASE_ID')
+client = NotionClient(NOTION_TOKEN)
+
+# Columns this script reads (everything else is neither fetched nor decoded)
+COLUMNS = TherapistRecord.projection([EMAIL, PHONE, WEBSITE, OTHER_CONTACTS])
+
+KEY_LABELS = {
+    'phone': '📱 Phone',
+    'email': '📧 Email',
+    'website': '🌐 Website',
+    'name': '🪪 Name',
+}
+
+def main():
+    print("═" * 80)
+    print("  Find Duplicate Therapist Profiles")
+    print("  Shared phone numbers, emails and websites across the whole database")
+    print("═" * 80)
+    print()
+    print("🔍 Reading Victorian Therapists database...\n")
+
+    # Refresh the local snapshot (only pages edited since the last run are fetched)
+    snapshot = load_snapshot(client, THERAPISTS_DB_ID, columns=COLUMNS)
+
+    index = DuplicateIndex()
+    names = NameIndex()
+    for therapist in snapshot.rows(COLUMNS):
+        index.add(therapist)
+        names.add(therapist)
+
+    # Similar names join the same clusters as shared contact details
+    name_matches = names.matches()
+    for match in name_matches:
+        index.link(match.a, match.b, ('name', f"{match.a.full_name} ~ {match.b.full_name} ({match.score:.0%})"))
+
+    clusters = index.clusters()
+
+    print(f"✅ Indexed {len(index)} therapists\n")
+    print("═" * 80)
+    print()
+
+    for i, cluster in enumerate(clusters, 1):
+        print(f"👥 Cluster {i}: {len(cluster.records)} profiles")
+        for kind, value in cluster.keys:
+            print(f"   {KEY_LABELS.get(kind, kind)}: {value}")
+        print()
+        for therapist in cluster.records:
+            print(f"   • {therapist.display_name}  ({therapist.page_id})")
+            if therapist.phone:
+                print(f"       Phone:          \"{therapist.phone}\"")
+            if therapist.email:
+                print(f"       Email:          \"{therapist.email}\"")
+            if therapist.website:
+                print(f"       Website:        \"{therapist.website}\"")
+            if therapist.other_contacts:
+                print(f"       Other Contacts: \"{therapist.other_contacts}\"")
+        print("   " + "─" * 76)
+        print()
+
+    duplicate_profiles = sum(len(cluster.records) for cluster in clusters)
+
+    print()
+    print("═" * 80)
+    print()
+    print("📊 Summary:")
+    print(f"   Therapists indexed: {len(index)}")
+    print(f"   Similar name pairs: {len(name_matches)}")
+    if names.skipped_blocks:
+        print(f"   Name blocks too common to compare: {names.skipped_blocks}")
+    print(f"   Clusters of likely duplicates: {len(clusters)}")
+    print(f"   Profiles in those clusters: {duplicate_profiles}")
+    print()
+    print("✅ Analysis complete!")
+
+if __name__ == "__main__":
+    main()
@@ -19,50 +19,34 @@ Global best practices applied:
 6. Log all changes for audit trail
 """
 
-import os
-import json
-import requests
-import re
-import time
-from urllib.parse import urlparse
-from dotenv import load_dotenv
+from notionlib import WriteExecutor, print_failed_pages, print_write_result, require_env
+from notionlib.cli import fixer_arguments, fixer_client, load_snapshot, save_plan
+from notionlib.columns import (
+    BUSINESS_NAME,
+    PHONE,
+    WEBSITE,
+    OTHER_CONTACTS,
+    ADMIN_NOTES,
+)
+from notionlib.extract import scan_text
+from notionlib.filters import is_not_empty
+from notionlib.memo import Memo, rules_version
+from notionlib.phones import format_phone
+from notionlib.plan import WritePlan
+from notionlib.platforms import PLATFORMS, social_platforms
+from notionlib.record import TherapistRecord
 
-# Load environment variables
-load_dotenv()
+THERAPISTS_DB_ID = require_env('THERAPISTS_DATABASE_ID')
 
-NOTION_TOKEN = os.getenv('NOTION_TOKEN')
-THERAPISTS_DB_ID = os.getenv('THERAPISTS_DATABASE_ID')
+# Only rows with something left in "Other contacts" are relevant
+WHERE = is_not_empty(OTHER_CONTACTS)
 
-if not NOTION_TOKEN or not THERAPISTS_DB_ID:
-    print("❌ Error: NOTION_TOKEN and THERAPISTS_DATABASE_ID required in .env")
-    exit(1)
+# Platforms with their own column (Instagram, Facebook, Twitter, LinkedIn, ...)
+SOCIAL_PLATFORMS = social_platforms()
 
-NOTION_VERSION = "2022-06-28"
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Notion-Version": NOTION_VERSION,
-    "Content-Type": "application/json"
-}
-
-def get_property_value(prop):
-    """Extract value from a Notion property"""
-    if not prop:
-        return ""
-    
-    prop_type = prop.get('type')
-    
-    if prop_type == 'title':
-        return prop.get('title', [{}])[0].get('plain_text', '') if prop.get('title') else ''
-    elif prop_type == 'rich_text':
-        return prop.get('rich_text', [{}])[0].get('plain_text', '') if prop.get('rich_text') else ''
-    elif prop_type == 'phone_number':
-        return prop.get('phone_number', '')
-    elif prop_type == 'url':
-        return prop.get('url', '')
-    elif prop_type == 'email':
-        return prop.get('email', '')
-    
-    return ""
+# Columns this script reads (everything else is neither fetched nor decoded)
+COLUMNS = TherapistRecord.projection([BUSINESS_NAME, PHONE, WEBSITE, OTHER_CONTACTS, ADMIN_NOTES]
+                                     + [rule.column for rule in SOCIAL_PLATFORMS])
 
 def normalize_name_for_url(name):
     """Convert name to URL-friendly format: 'John Smith' → 'john-smith'"""
@@ -70,30 +54,6 @@ def normalize_name_for_url(name):
         return ""
     return name.lower().replace(' ', '-').replace('.', '').replace(',', '').strip()
 
-def extract_url_username(url):
-    """Extract username from social media URL"""
-    if not url:
-        return None
-    
-    # Remove protocol and www
-    clean_url = re.sub(r'^https?://(www\.)?', '', url)
-    
-    # Common patterns
-    patterns = [
-        r'instagram\.com/([^/?]+)',
-        r'facebook\.com/([^/?]+)',
-        r'twitter\.com/([^/?]+)',
-        r'linkedin\.com/in/([^/?]+)',
-        r'tiktok\.com/@?([^/?]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, clean_url)
-        if match:
-            return match.group(1)
-    
-    return None
-
 def interpret_other_contacts(text, context):
     """
     Intelligently interpret the "Other Contacts" field using context.
@@ -105,18 +65,15 @@ def interpret_other_contacts(text, context):
     Returns:
         Dict with extracted data: {instagram, facebook, twitter, linkedin, website, phone, email, notes, should_clear}
     """
-    result = {
-        'instagram': None,
-        'facebook': None,
-        'twitter': None,
-        'linkedin': None,
+    result = {rule.name: None for rule in SOCIAL_PLATFORMS}
+    result.update({
         'website': None,
         'phone': None,
         'email': None,
         'notes': None,
         'should_clear': False,
         'reasoning': []
-    }
+    })
     
     if not text or text.strip() in ['', 'n/a', 'N/A', 'nil', 'none', 'None']:
         result['should_clear'] = True
@@ -125,130 +82,56 @@ def interpret_other_contacts(text, context):
     
     text_lower = text.lower().strip()
     
-    # === FULL URLs ===
-    # Extract all URLs from the text
-    url_pattern = r'https?://[^\s,]+'
-    urls = re.findall(url_pattern, text)
-    
-    for url in urls:
-        url_lower = url.lower()
+    # Tokenize once; everything below reads the tokens
+    scan = scan_text(text)
+    
+    # === SOCIAL PROFILES ===
+    # Profile links first, then handles named next to a platform keyword
+    # ("Instagram: @x", "@x (instagram)", "Facebook & Instagram - x")
+    for platform, value in scan.social_values().items():
+        if not context.get(f"existing_{platform}"):
+            result[platform] = value
+            result['reasoning'].append(f"Extracted {PLATFORMS[platform].label}: {value}")
+    
+    # "@handle" on its own is an Instagram handle
+    handle = scan.lone_handle()
+    if handle and not result['instagram'] and not context.get('existing_instagram'):
+        result['instagram'] = PLATFORMS['instagram'].value(handle)
+        result['reasoning'].append(f"Extracted Instagram handle: {handle}")
+    
+    # Just says "linkedin" - construct from name
+    if scan.mentions('linkedin') and not result['linkedin'] and not context.get('existing_linkedin'):
+        name_slug = normalize_name_for_url(context.get('fullname') or f"{context.get('first_name')} {context.get('last_name')}")
+        if name_slug:
+            result['linkedin'] = PLATFORMS['linkedin'].value(name_slug)
+            result['reasoning'].append(f"Constructed LinkedIn from name: {name_slug}")
+    
+    # === OTHER URLs ===
+    for url in scan.urls:
+        rule = PLATFORMS.get(url.platform)
         
-        if 'instagram.com' in url_lower and not context.get('existing_instagram'):
-            # Extract handle from URL
-            username = extract_url_username(url)
-            if username:
-                result['instagram'] = f"@{username}" if not username.startswith('@') else username
-                result['reasoning'].append(f"Extracted Instagram from URL: {url}")
+        if rule is None:
+            if not context.get('existing_website'):
+                # Generic URL - might be website
+                result['website'] = url.text
+                result['reasoning'].append(f"Extracted website URL: {url.text}")
         
-        elif 'facebook.com' in url_lower and not context.get('existing_facebook'):
-            result['facebook'] = url
-            result['reasoning'].append(f"Extracted Facebook URL: {url}")
-        
-        elif 'twitter.com' in url_lower or 'x.com' in url_lower and not context.get('existing_twitter'):
-            username = extract_url_username(url)
-            if username:
-                result['twitter'] = f"https://twitter.com/{username}"
-                result['reasoning'].append(f"Extracted Twitter from URL: {url}")
-        
-        elif 'linkedin.com' in url_lower and not context.get('existing_linkedin'):
-            result['linkedin'] = url
-            result['reasoning'].append(f"Extracted LinkedIn URL: {url}")
-        
-        elif 'tiktok.com' in url_lower:
-            # TikTok doesn't have a dedicated column, add to notes
-            result['notes'] = f"TikTok: {url}"
-            result['reasoning'].append(f"Added TikTok to notes: {url}")
-        
-        elif not context.get('existing_website'):
-            # Generic URL - might be website
-            result['website'] = url
-            result['reasoning'].append(f"Extracted website URL: {url}")
-    
-    # === EXPLICIT PLATFORM MENTIONS ===
-    
-    # LinkedIn variations
-    if re.search(r'\blinkedin\b', text_lower) and not context.get('existing_linkedin'):
-        # Check for explicit URL
-        linkedin_match = re.search(r'linkedin\.com/in/([^\s,\)]+)', text_lower)
-        if linkedin_match:
-            result['linkedin'] = f"https://linkedin.com/in/{linkedin_match.group(1)}"
-            result['reasoning'].append(f"Extracted LinkedIn URL")
-        else:
-            # Just says "linkedin" - construct from name
-            name_slug = normalize_name_for_url(context.get('fullname') or f"{context.get('first_name')} {context.get('last_name')}")
-            if name_slug:
-                result['linkedin'] = f"https://linkedin.com/in/{name_slug}"
-                result['reasoning'].append(f"Constructed LinkedIn from name: {name_slug}")
-    
-    # Instagram with @ handle or username
-    instagram_patterns = [
-        r'(?:instagram|ig|insta)[\s:]+@?([a-z0-9_.]+)',
-        r'@([a-z0-9_.]+)(?:\s+\(instagram\)|\s+instagram)',
-        r'^@([a-z0-9_.]+)$',  # Just an @ handle alone
-    ]
-    
-    for pattern in instagram_patterns:
-        match = re.search(pattern, text_lower, re.IGNORECASE)
-        if match and not context.get('existing_instagram'):
-            handle = match.group(1)
-            result['instagram'] = f"@{handle}" if not handle.startswith('@') else handle
-            result['reasoning'].append(f"Extracted Instagram handle: {handle}")
-            break
-    
-    # Facebook page name
-    facebook_patterns = [
-        r'(?:facebook|fb)[\s:]+([^\s,\.\)]+)',
-        r'([^\s]+)\s+(?:on\s+)?facebook',
-    ]
-    
-    for pattern in facebook_patterns:
-        match = re.search(pattern, text_lower, re.IGNORECASE)
-        if match and not context.get('existing_facebook'):
-            page_name = match.group(1).strip()
-            if page_name not in ['page', 'the']:
-                result['facebook'] = f"https://facebook.com/{page_name}"
-                result['reasoning'].append(f"Constructed Facebook URL from page name: {page_name}")
-                break
-    
-    # Twitter/X handle
-    twitter_patterns = [
-        r'(?:twitter|x)[\s:]+@?([a-z0-9_]+)',
-        r'@([a-z0-9_]+)(?:\s+\(twitter\)|\s+twitter)',
-    ]
-    
-    for pattern in twitter_patterns:
-        match = re.search(pattern, text_lower, re.IGNORECASE)
-        if match and not context.get('existing_twitter'):
-            handle = match.group(1)
-            result['twitter'] = f"https://twitter.com/{handle}"
-            result['reasoning'].append(f"Extracted Twitter handle: {handle}")
-            break
+        elif rule.column is None:
+            # No dedicated column (TikTok) - add to notes
+            result['notes'] = f"{rule.label}: {url.text}"
+            result['reasoning'].append(f"Added {rule.label} to notes: {url.text}")
     
     # === EMAIL ADDRESSES ===
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    email_match = re.search(email_pattern, text)
-    if email_match:
-        result['email'] = email_match.group(0)
-        result['reasoning'].append(f"Extracted email: {email_match.group(0)}")
+    email = scan.first('email')
+    if email:
+        result['email'] = email.text
+        result['reasoning'].append(f"Extracted email: {email.text}")
     
     # === PHONE NUMBERS ===
-    phone_patterns = [
-        r'(?:phone|mobile|ph|mob|m|t)[\s:]+(\d[\d\s\(\)\-]+)',
-        r'(\+?61[\s]?[2-478][\s]?\d{4}[\s]?\d{4})',
-        r'(\(0\d\)[\s]?\d{4}[\s]?\d{4})',
-        r'(0[2-478]\d{8})',
-        r'(04\d{2}[\s]?\d{3}[\s]?\d{3})',
-    ]
-    
-    for pattern in phone_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            phone_str = match.group(1).strip()
-            # Validate it has at least 8 digits
-            if len(re.sub(r'\D', '', phone_str)) >= 8:
-                result['phone'] = phone_str
-                result['reasoning'].append(f"Extracted phone: {phone_str}")
-                break
+    phone_str = scan.phone()
+    if phone_str:
+        result['phone'] = format_phone(phone_str)
+        result['reasoning'].append(f"Extracted phone: {phone_str}")
     
     # === DIRECTORY LISTINGS ===
     if any(domain in text_lower for domain in ['psychologytoday.com', 'goodtherapy.com', 'halaxy.com']):
@@ -263,9 +146,8 @@ def interpret_other_contacts(text, context):
             result['reasoning'].append(f"Business name matches existing data")
     
     # === DETERMINE IF SHOULD CLEAR ===
-    if any([result['instagram'], result['facebook'], result['twitter'], 
-            result['linkedin'], result['website'], result['phone'], 
-            result['email'], result['notes']]):
+    if any(result[rule.name] for rule in SOCIAL_PLATFORMS) or any([
+            result['website'], result['phone'], result['email'], result['notes']]):
         result['should_clear'] = True
     
     # === SPECIAL CASES ===
@@ -276,7 +158,119 @@ def interpret_other_contacts(text, context):
     
     return result
 
+def row_context(therapist):
+    """Context for interpret_other_contacts(): what the row already has"""
+    context = {
+        'first_name': therapist.first_name,
+        'last_name': therapist.last_name,
+        'fullname': therapist.fullname,
+        'business_name': therapist.business_name,
+        'existing_website': therapist.website,
+        'existing_phone': therapist.phone,
+    }
+    for rule in SOCIAL_PLATFORMS:
+        context[f"existing_{rule.name}"] = therapist.get(rule.column)
+    return context
+
+def interpretation_key(text, context):
+    """
+    What interpret_other_contacts() reads from (text, context), for the cache.
+    
+    The text is kept as given (it can be copied to the notes verbatim). Existing
+    columns only matter as filled or empty, the business name only as mentioned
+    or not, and the name only when the text mentions LinkedIn.
+    """
+    text_lower = text.lower().strip()
+    key = {field: bool(value) for field, value in context.items() if field.startswith('existing_')}
+    business_name = context.get('business_name')
+    key['business_name'] = bool(business_name) and business_name.lower() in text_lower
+    
+    linkedin = PLATFORMS['linkedin']
+    if any(word in text_lower for word in linkedin.keywords + linkedin.domains):
+        key['fullname'] = context.get('fullname')
+        key['first_name'] = context.get('first_name')
+        key['last_name'] = context.get('last_name')
+    return [text, key]
+
+# Identical text in the same context is interpreted once, then reused from
+# .cache/memo.sqlite until this script or the extraction rules change
+interpret = Memo('intelligent-cleanup-other-contacts', interpret_other_contacts,
+                 key=interpretation_key, version=rules_version(__file__))
+
+def fix(therapist, plan, interpreted=None):
+    """Interpret one therapist's Other Contacts and queue the changes; returns False if nothing changes"""
+    name = therapist.display_name
+    
+    other_contacts = therapist.other_contacts
+    
+    # Skip if empty
+    if not other_contacts or not other_contacts.strip():
+        return False
+    
+    context = row_context(therapist)
+    
+    # Interpret the other contacts field
+    if interpreted is None:
+        interpreted = interpret(other_contacts, context)
+    
+    # Build updates
+    updates = {}
+    
+    for rule in SOCIAL_PLATFORMS:
+        if interpreted[rule.name] and not context[f"existing_{rule.name}"]:
+            updates[rule.column] = interpreted[rule.name]
+    
+    if interpreted['website'] and not context['existing_website']:
+        updates[WEBSITE] = interpreted['website']
+    
+    if interpreted['phone'] and not context['existing_phone']:
+        updates[PHONE] = interpreted['phone']
+    
+    # Notes go to Admin Notes if anything useful was extracted
+    if interpreted['notes']:
+        existing_notes = therapist.admin_notes
+        new_notes = f"{existing_notes}\n{interpreted['notes']}" if existing_notes else interpreted['notes']
+        updates[ADMIN_NOTES] = new_notes.strip()
+    
+    # Clear if we extracted something or it's determined to be unnecessary
+    if interpreted['should_clear']:
+        updates[OTHER_CONTACTS] = ""
+    
+    if not plan.update(therapist, updates):
+        return False
+    
+    print(f"📝 {name}")
+    print(f"   Original: \"{other_contacts}\"")
+    print()
+    
+    if interpreted['reasoning']:
+        print("   🧠 Reasoning:")
+        for reason in interpreted['reasoning']:
+            print(f"      • {reason}")
+        print()
+    
+    print("   ✨ Changes:")
+    for rule in SOCIAL_PLATFORMS:
+        if interpreted[rule.name]:
+            print(f"      {rule.icon} {rule.label}: {interpreted[rule.name]}")
+    if interpreted['website']:
+        print(f"      🌐 Website: {interpreted['website']}")
+    if interpreted['phone']:
+        print(f"      📱 Phone: {interpreted['phone']}")
+    if interpreted['email']:
+        print(f"      📧 Email: {interpreted['email']}")
+    if interpreted['notes']:
+        print(f"      📝 Notes: {interpreted['notes']}")
+    if interpreted['should_clear']:
+        print(f"      🧹 Clearing \"Other Contacts\" field")
+    
+    print("   " + "─" * 76)
+    print()
+    return True
+
 def main():
+    args = fixer_arguments(__file__, __doc__, workers=True)
+    
     print("═" * 80)
     print("  Intelligent Cleanup: Other Contacts Column")
     print("  Context-aware interpretation using AI-like reasoning")
@@ -284,176 +278,54 @@ def main():
     print()
     print("🔍 Reading Victorian Therapists database...\n")
     
-    # Query the database
-    url = f"https://api.notion.com/v1/databases/{THERAPISTS_DB_ID}/query"
-    all_results = []
-    has_more = True
-    start_cursor = None
-    
-    while has_more:
-        payload = {"page_size": 100}
-        if start_cursor:
-            payload["start_cursor"] = start_cursor
-        
-        response = requests.post(url, headers=HEADERS, json=payload)
-        
-        if response.status_code != 200:
-            print(f"❌ Error: {response.json()}")
-            exit(1)
-        
-        data = response.json()
-        all_results.extend(data.get('results', []))
-        has_more = data.get('has_more', False)
-        start_cursor = data.get('next_cursor')
+    # Refresh the local snapshot (only pages edited since the last run are fetched),
+    # or read it offline in --plan mode
+    client = fixer_client(args)
+    snapshot = load_snapshot(client, THERAPISTS_DB_ID, args, where=WHERE, columns=COLUMNS)
     
-    print(f"✅ Found {len(all_results)} total entries\n")
+    print(f"✅ Found {snapshot.count(WHERE)} entries with \"Other Contacts\" data\n")
     print("═" * 80)
     print()
     
-    updated_count = 0
+    plan = WritePlan()
     skipped_count = 0
     
-    for entry in all_results:
-        props = entry.get('properties', {})
-        page_id = entry.get('id')
-        
-        # Extract current values
-        first_name = get_property_value(props.get('First Name'))
-        last_name = get_property_value(props.get('Last Name'))
-        fullname = get_property_value(props.get('Fullname'))
-        business_name = get_property_value(props.get('Business Name'))
-        
-        # Construct display name
-        if first_name and last_name:
-            name = f"{first_name} {last_name}"
-        elif fullname:
-            name = fullname
-        elif first_name:
-            name = first_name
-        else:
-            name = "Unknown"
-        
-        other_contacts = get_property_value(props.get('Other contact details, social media, etc.'))
-        
-        # Skip if empty
-        if not other_contacts or not other_contacts.strip():
-            continue
-        
-        # Build context
-        context = {
-            'first_name': first_name,
-            'last_name': last_name,
-            'fullname': fullname,
-            'business_name': business_name,
-            'existing_instagram': get_property_value(props.get('Instagram')),
-            'existing_facebook': get_property_value(props.get('Facebook')),
-            'existing_twitter': get_property_value(props.get('Twitter/X')),
-            'existing_linkedin': get_property_value(props.get('LinkedIn')),
-            'existing_website': get_property_value(props.get('Website (or alternative listing like Facebook or health engine)')),
-            'existing_phone': get_property_value(props.get('Phone')),
-        }
-        
-        # Interpret the other contacts field
-        interpreted = interpret_other_contacts(other_contacts, context)
-        
-        # Build updates
-        updates = {}
-        has_updates = False
-        
-        if interpreted['instagram'] and not context['existing_instagram']:
-            updates['Instagram'] = {'rich_text': [{'text': {'content': interpreted['instagram']}}]}
-            has_updates = True
-        
-        if interpreted['facebook'] and not context['existing_facebook']:
-            updates['Facebook'] = {'url': interpreted['facebook']}
-            has_updates = True
-        
-        if interpreted['twitter'] and not context['existing_twitter']:
-            updates['Twitter/X'] = {'rich_text': [{'text': {'content': interpreted['twitter']}}]}
-            has_updates = True
-        
-        if interpreted['linkedin'] and not context['existing_linkedin']:
-            updates['LinkedIn'] = {'url': interpreted['linkedin']}
-            has_updates = True
-        
-        if interpreted['website'] and not context['existing_website']:
-            updates['Website (or alternative listing like Facebook or health engine)'] = {'url': interpreted['website']}
-            has_updates = True
-        
-        if interpreted['phone'] and not context['existing_phone']:
-            updates['Phone'] = {'rich_text': [{'text': {'content': interpreted['phone']}}]}
-            has_updates = True
-        
-        # Notes go to Admin Notes if anything useful was extracted
-        if interpreted['notes']:
-            existing_notes = get_property_value(props.get('Admin Notes'))
-            new_notes = f"{existing_notes}\n{interpreted['notes']}" if existing_notes else interpreted['notes']
-            updates['Admin Notes'] = {'rich_text': [{'text': {'content': new_notes.strip()}}]}
-            has_updates = True
-        
-        # Clear if we extracted something or it's determined to be unnecessary
-        if interpreted['should_clear']:
-            updates['Other contact details, social media, etc.'] = {'rich_text': []}
-            has_updates = True
-        
-        if has_updates:
-            print(f"📝 {name}")
-            print(f"   Original: \"{other_contacts}\"")
-            print()
-            
-            if interpreted['reasoning']:
-                print("   🧠 Reasoning:")
-                for reason in interpreted['reasoning']:
-                    print(f"      • {reason}")
-                print()
-            
-            print("   ✨ Changes:")
-            if interpreted['instagram']:
-                print(f"      📸 Instagram: {interpreted['instagram']}")
-            if interpreted['facebook']:
-                print(f"      👥 Facebook: {interpreted['facebook']}")
-            if interpreted['twitter']:
-                print(f"      🐦 Twitter: {interpreted['twitter']}")
-            if interpreted['linkedin']:
-                print(f"      💼 LinkedIn: {interpreted['linkedin']}")
-            if interpreted['website']:
-                print(f"      🌐 Website: {interpreted['website']}")
-            if interpreted['phone']:
-                print(f"      📱 Phone: {interpreted['phone']}")
-            if interpreted['email']:
-                print(f"      📧 Email: {interpreted['email']}")
-            if interpreted['notes']:
-                print(f"      📝 Notes: {interpreted['notes']}")
-            if interpreted['should_clear']:
-                print(f"      🧹 Clearing \"Other Contacts\" field")
-            
-            # Update the database
-            update_url = f"https://api.notion.com/v1/pages/{page_id}"
-            update_payload = {"properties": updates}
-            
-            update_response = requests.patch(update_url, headers=HEADERS, json=update_payload)
-            
-            if update_response.status_code == 200:
-                print(f"   ✅ Updated successfully")
-                updated_count += 1
-            else:
-                error_data = update_response.json()
-                print(f"   ❌ Error: {error_data.get('message', 'Unknown error')}")
-            
-            print("   " + "─" * 76)
-            print()
-            
-            # Rate limiting
-            time.sleep(0.334)
-        else:
+    rows = list(snapshot.rows(COLUMNS, WHERE))
+    
+    # Interpretation is the CPU-heavy part: text already seen is taken from the
+    # cache, and with --workers the rest runs in a process pool
+    interpretations = interpret.map(
+        [therapist.other_contacts for therapist in rows],
+        [row_context(therapist) for therapist in rows],
+        workers=args.workers,
+    )
+    
+    for therapist, interpreted in zip(rows, interpretations):
+        if not fix(therapist, plan, interpreted):
             skipped_count += 1
     
+    print(f"🗃️  Interpretations: {interpret.misses} parsed, {interpret.hits} reused from the cache")
+    interpret.save()
+    
+    plan.report()
+    
+    if args.plan:
+        save_plan(plan, args)
+        return
+    
+    with WriteExecutor(client, on_result=print_write_result, snapshot=snapshot) as writer:
+        plan.apply(writer)
+    
+    print_failed_pages(writer.failures)
+    updated_count = writer.succeeded
+
     print()
     print("═" * 80)
     print()
     print("📊 Summary:")
-    print(f"   Entries processed: {len(all_results)}")
+    print(f"   Entries processed: {snapshot.count(WHERE)}")
     print(f"   Entries updated: {updated_count}")
+    print(f"   Failed updates: {len(writer.failures)}")
     print(f"   Entries skipped: {skipped_count}")
     print()
     print("✅ Intelligent cleanup complete!")
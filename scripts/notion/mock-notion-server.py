@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Run a local stand-in for the Notion API, seeded from a snapshot.
+
+Serves databases/{id}/query, databases/{id} and pages/{id} from an in-memory
+copy of the snapshot (see notionlib.mockserver), with Notion's rate limit
+(429 + Retry-After), added latency and optional 503s, so the scripts can be
+benchmarked and regression-tested with no network and no token:
+
+    python3 scripts/notion/mock-notion-server.py --port 8765 --latency 0.2
+    python3 scripts/notion/mock-notion-server.py --synthetic 10000    # no snapshot needed
+
+    NOTION_API_URL=http://127.0.0.1:8765/v1 NOTION_TOKEN=mock \\
+    NOTION_SNAPSHOT_DIR=/tmp/mock-cache \\
+        python3 scripts/notion/intelligent-cleanup-other-contacts.py
+
+Use a separate NOTION_SNAPSHOT_DIR for runs against the server, or they will
+sync the mock's edits into your real snapshot. Writes stay in memory and are
+gone when the server stops.
+"""
+
+import argparse
+import time
+
+from notionlib.config import require_env
+from notionlib.mockserver import MockNotion, start_server
+from notionlib.snapshot import snapshot_path
+from notionlib.synthetic import synthetic_pages
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('snapshot', nargs='?',
+                        help="snapshot file to serve (default: the THERAPISTS_DATABASE_ID snapshot in .cache/)")
+    parser.add_argument('--synthetic', type=int, metavar='N',
+                        help="serve N synthetic therapists (notionlib.synthetic) instead of a snapshot")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many more seconds, at random")
+    parser.add_argument('--rate', type=float, default=3.0,
+                        help="requests per second before answering 429 (default 3, like Notion; 0 = unlimited)")
+    parser.add_argument('--burst', type=int, default=10, help="requests allowed back-to-back above the rate")
+    parser.add_argument('--fail', type=float, default=0.0, metavar='RATE',
+                        help="share of requests answered with a 503 (e.g. 0.05)")
+    args = parser.parse_args()
+
+    mock = MockNotion(latency=args.latency, jitter=args.jitter, rate=args.rate or None,
+                      burst=args.burst, failure_rate=args.fail)
+
+    if args.synthetic:
+        database = mock.add_database('synthetic', synthetic_pages(args.synthetic))
+    else:
+        path = args.snapshot or snapshot_path(require_env('THERAPISTS_DATABASE_ID'))
+        try:
+            database = mock.add_snapshot(path)
+        except FileNotFoundError:
+            print(f"❌ Error: snapshot not found: {path}")
+            exit(1)
+
+    server, base_url = start_server(mock, args.host, args.port)
+
+    print("═" * 80)
+    print("  Mock Notion API")
+    print(f"  {base_url}")
+    print("═" * 80)
+    print()
+    print(f"🗄️  Database {database.id}: {len(database.pages)} pages, {len(database.properties)} properties")
+    print(f"⏱️  Latency {args.latency}s (+{args.jitter}s), {args.rate or 'unlimited'} req/s, {args.fail:.0%} failures")
+    print()
+    print("Point the scripts at it with:")
+    print(f"   NOTION_API_URL={base_url} NOTION_TOKEN=mock THERAPISTS_DATABASE_ID={database.id} \\")
+    print("   NOTION_SNAPSHOT_DIR=/tmp/mock-cache python3 scripts/notion/<script>.py")
+    print()
+    print("Ctrl-C to stop.")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+    print()
+    print("📊 Requests served:")
+    for route, count in sorted(mock.stats.items()):
+        print(f"   {route}: {count}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Shared building blocks for the Notion maintenance scripts in scripts/notion.
+
+The scripts are run directly (python3 scripts/notion/<script>.py), which puts
+this directory on sys.path, so they can simply `import notionlib`.
+"""
+
+from notionlib.client import NotionAPIError, NotionClient
+from notionlib.config import require_env
+from notionlib.ratelimit import RateLimiter
+from notionlib.writer import WriteExecutor, WriteResult, print_failed_pages, print_write_result
+
+__all__ = [
+    'NotionAPIError',
+    'NotionClient',
+    'RateLimiter',
+    'WriteExecutor',
+    'WriteResult',
+    'print_failed_pages',
+    'print_write_result',
+    'require_env',
+]
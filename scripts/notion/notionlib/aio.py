@@ -0,0 +1,265 @@
+"""
+asyncio variant of the Notion client and page writer.
+
+NotionClient and WriteExecutor overlap requests with threads, one database at
+a time. Jobs that touch several databases (the therapists directory plus the
+EOI and research databases notion-sync.php writes to) can instead run every
+query's pagination and the PATCH stream as coroutines on one event loop:
+
+    async with AsyncNotionClient(NOTION_TOKEN) as client:
+        therapists, eoi, research = await asyncio.gather(
+            client.query_all(THERAPISTS_DB_ID),
+            client.query_all(EOI_DB_ID),
+            client.query_all(RESEARCH_DB_ID),
+        )
+        async with AsyncWriteExecutor(client, on_result=print_write_result) as writer:
+            for page_id, properties in updates:
+                await writer.submit(page_id, properties, label=name)
+
+All coroutines share one AsyncRateLimiter, so running more of them at once
+fills Notion's ~3 req/s budget without exceeding it. Errors, retries
+(RetryPolicy) and results (NotionAPIError, WriteResult) behave the same as
+in the threaded client.
+
+apply-plan.py --async sends a plan's PATCHes this way. Needs httpx
+(pip install -r scripts/notion/requirements-async.txt), which the
+synchronous scripts don't.
+"""
+
+import asyncio
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from notionlib.client import NOTION_VERSION, NotionAPIError
+from notionlib.config import api_url
+from notionlib.ratelimit import RateLimiter, parse_retry_after
+from notionlib.retry import RetryPolicy, classify
+from notionlib.writer import DEFAULT_MAX_IN_FLIGHT, WriteResult
+
+
+def _require_httpx():
+    if httpx is None:
+        raise ImportError("notionlib.aio needs httpx: pip install -r scripts/notion/requirements-async.txt")
+
+
+def classify_error(error):
+    """classify() for httpx exceptions: 'timeout', 'connection' or None"""
+    if isinstance(error, httpx.TimeoutException):
+        return 'timeout'
+    if isinstance(error, httpx.TransportError):
+        return 'connection'
+    return None
+
+
+class AsyncRateLimiter(RateLimiter):
+    """RateLimiter whose acquire() is a coroutine (same bucket, same AIMD)"""
+
+    async def acquire(self):
+        while True:
+            wait = self.reserve()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+class AsyncNotionClient:
+    """
+    Notion REST API client for asyncio, with pooled connections.
+
+    Args:
+        token: Notion integration token
+        base_url: API root (default: notionlib.config.api_url())
+        pool_size: Maximum number of keep-alive connections kept open
+        timeout: Per-request timeout in seconds
+        rate_limiter: Shared AsyncRateLimiter (a default ~3 req/s bucket if omitted)
+        retry: RetryPolicy for transient failures
+    """
+
+    def __init__(self, token, base_url=None, pool_size=10, timeout=30,
+                 rate_limiter=None, retry=None):
+        _require_httpx()
+        self.base_url = (base_url or api_url()).rstrip('/')
+        self.rate_limiter = rate_limiter or AsyncRateLimiter()
+        self.retry = retry or RetryPolicy()
+
+        self.session = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Notion-Version": NOTION_VERSION,
+                "Content-Type": "application/json"
+            },
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.session.aclose()
+
+    async def request(self, method, path, json=None, params=None):
+        """Send one request and return the decoded JSON body (see NotionClient.request)"""
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        attempt = 0
+
+        while True:
+            await self.rate_limiter.acquire()
+            try:
+                response = await self.session.request(method, url, json=json, params=params)
+            except httpx.HTTPError as e:
+                if classify_error(e) is None or attempt >= self.retry.max_retries:
+                    raise
+                await asyncio.sleep(self.retry.delay(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code == 200:
+                self.rate_limiter.on_success()
+                return response.json()
+
+            kind = classify(response.status_code)
+            if kind is None or attempt >= self.retry.max_retries:
+                raise NotionAPIError.from_response(response, attempts=attempt + 1)
+
+            if kind == 'throttled':
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                self.rate_limiter.on_throttle(retry_after)
+                if retry_after is None:
+                    await asyncio.sleep(self.retry.delay(attempt))
+            else:
+                await asyncio.sleep(self.retry.delay(attempt))
+            attempt += 1
+
+    # === DATABASES ===
+
+    async def get_database(self, database_id):
+        """Fetch a database object, including its property schema"""
+        return await self.request('GET', f"databases/{database_id}")
+
+    async def update_database(self, database_id, properties):
+        """Add or change properties on a database schema"""
+        return await self.request('PATCH', f"databases/{database_id}", json={"properties": properties})
+
+    async def query_database(self, database_id, start_cursor=None, page_size=100, params=None, **body):
+        """Fetch a single batch of query results (one page of the cursor)"""
+        payload = {"page_size": page_size, **body}
+        if start_cursor:
+            payload["start_cursor"] = start_cursor
+
+        return await self.request('POST', f"databases/{database_id}/query", json=payload, params=params)
+
+    async def iter_query(self, database_id, page_size=100, params=None, **body):
+        """
+        Yield query results page by page as each batch arrives.
+
+        The request for the next cursor is started as soon as a batch lands,
+        so the caller's processing of one batch overlaps the next round trip.
+        """
+        batch = asyncio.ensure_future(self.query_database(database_id, None, page_size, params, **body))
+        try:
+            while batch is not None:
+                data = await batch
+                batch = None
+                if data.get('has_more'):
+                    batch = asyncio.ensure_future(
+                        self.query_database(database_id, data.get('next_cursor'), page_size, params, **body)
+                    )
+                for page in data.get('results', []):
+                    yield page
+        finally:
+            if batch is not None:
+                batch.cancel()
+
+    async def query_all(self, database_id, page_size=100, **body):
+        """Follow the query cursor until has_more is false and return every page"""
+        return [page async for page in self.iter_query(database_id, page_size=page_size, **body)]
+
+    # === PAGES ===
+
+    async def get_page(self, page_id):
+        return await self.request('GET', f"pages/{page_id}")
+
+    async def update_page(self, page_id, properties):
+        """PATCH a page's properties and return the updated page"""
+        return await self.request('PATCH', f"pages/{page_id}", json={"properties": properties})
+
+
+class AsyncWriteExecutor:
+    """
+    Send page updates as concurrent tasks with a bounded number in flight.
+
+    The asyncio counterpart of WriteExecutor: submit() waits while
+    `max_in_flight` PATCHes are outstanding, results go to `on_result` as
+    each one finishes, and `succeeded` / `failures` are kept the same way.
+
+    Args:
+        client: AsyncNotionClient used for the PATCHes
+        max_in_flight: Number of PATCHes allowed to be outstanding at once
+        on_result: Optional callback(WriteResult)
+        snapshot: Optional Snapshot to keep current with the pages Notion returns
+    """
+
+    def __init__(self, client, max_in_flight=DEFAULT_MAX_IN_FLIGHT, on_result=None, snapshot=None):
+        self.client = client
+        self.on_result = on_result
+        self.snapshot = snapshot
+
+        self.succeeded = 0
+        self.failures = []
+
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._pending = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _send(self, page_id, properties, label):
+        try:
+            page = await self.client.update_page(page_id, properties)
+            return WriteResult(page_id, label, page, None)
+        except (NotionAPIError, httpx.HTTPError) as e:
+            return WriteResult(page_id, label, None, e)
+        finally:
+            self._slots.release()
+
+    async def _write(self, page_id, properties, label):
+        # Anything other than a request failure is a bug: it propagates
+        # through flush() rather than being reported as a failed page
+        result = await self._send(page_id, properties, label)
+
+        if result.ok:
+            self.succeeded += 1
+            if self.snapshot is not None:
+                self.snapshot.upsert(result.page)
+        else:
+            self.failures.append(result)
+
+        if self.on_result:
+            self.on_result(result)
+
+    async def submit(self, page_id, properties, label=None):
+        """Start a PATCH, waiting while the in-flight window is full"""
+        await self._slots.acquire()
+        task = asyncio.ensure_future(self._write(page_id, properties, label))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def flush(self):
+        """Wait for every started PATCH to finish"""
+        if self._pending:
+            await asyncio.gather(*self._pending)
+
+    async def close(self):
+        await self.flush()
+        if self.snapshot is not None:
+            self.snapshot.commit()
@@ -0,0 +1,117 @@
+"""
+Resumable progress for applying a saved write plan.
+
+apply-plan.py appends each page id to a checkpoint file (<plan>.done) as soon
+as its PATCH succeeds, so a run that dies halfway (network blip, 429 storm)
+resumes with the pages that are still outstanding instead of starting over.
+
+Each line also keeps the last_edited_time Notion returned for the write, so
+apply-plan.py can tell its own writes from later edits by someone else.
+
+The first line records a digest of the plan file. If the plan is regenerated
+the old checkpoint no longer applies and is started afresh. A restart (send
+every page again) appends a marker instead of truncating: only the pages
+after the last marker count as done, but the edit times before it are kept.
+
+    # plan 3f2a9c...
+    page-1 2025-10-14T03:12:00.000Z
+    page-4 2025-10-14T03:12:00.000Z
+    # restart
+    page-1 2025-10-15T09:40:00.000Z
+"""
+
+import hashlib
+import os
+
+HEADER = '# plan '
+RESTART = '# restart'
+
+
+def file_digest(path):
+    """SHA-1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    Append-only set of completed page ids for one plan file.
+
+    `written` maps every page this plan has written (including before a
+    restart) to the last_edited_time of its latest write.
+
+    Args:
+        plan_path: The plan being applied
+        path: Checkpoint file (default: <plan_path>.done)
+        restart: Ignore any existing progress (edit times are still kept)
+
+    Usage:
+        with Checkpoint(plan_path) as done:
+            for change in load_plan(plan_path):
+                if change.page_id not in done:
+                    ...
+                    done.mark(change.page_id, page['last_edited_time'])
+    """
+
+    def __init__(self, plan_path, path=None, restart=False):
+        self.path = path or f"{plan_path}.done"
+        self.digest = file_digest(plan_path)
+        self.done = set()
+        self.written = {}
+        self.stale = False
+
+        current = False
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            current = bool(lines) and lines[0] == HEADER + self.digest
+            if current:
+                for line in lines[1:]:
+                    if line == RESTART:
+                        self.done.clear()
+                    elif line:
+                        page_id, _, edited = line.partition(' ')
+                        self.done.add(page_id)
+                        if edited:
+                            self.written[page_id] = edited
+            else:
+                self.stale = True
+
+        if current:
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if restart and self.done:
+                self.done.clear()
+                self._write(RESTART)
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write(HEADER + self.digest)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, page_id):
+        return page_id in self.done
+
+    def __len__(self):
+        return len(self.done)
+
+    def _write(self, line):
+        self._file.write(line + '\n')
+        self._file.flush()
+
+    def mark(self, page_id, last_edited_time=None):
+        """Record a page as written, with the edit time Notion returned (flushed immediately)"""
+        if page_id not in self.done:
+            self.done.add(page_id)
+            if last_edited_time:
+                self.written[page_id] = last_edited_time
+            self._write(f"{page_id} {last_edited_time}" if last_edited_time else page_id)
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,129 @@
+"""
+Command line shared by the fixer scripts.
+
+Each fixer builds a WritePlan and applies it. With --plan it stops before
+the writes instead: the plan is evaluated against the local snapshot with no
+network calls at all, and saved as JSONL (see notionlib.plan) for review or
+for applying later.
+
+    python3 scripts/notion/clean-other-contacts.py                 # apply
+    python3 scripts/notion/clean-other-contacts.py --plan          # .cache/plans/clean-other-contacts.jsonl
+    python3 scripts/notion/clean-other-contacts.py --plan out.jsonl --refresh
+
+--refresh syncs the snapshot from Notion first (one incremental query), for
+when the local copy is stale or doesn't exist yet. An offline --plan needs
+only THERAPISTS_DATABASE_ID; NOTION_TOKEN is required once the run will
+talk to Notion (see fixer_client()). Fixers with CPU-heavy
+interpretation also take --workers N (see notionlib.parallel).
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+
+import requests
+
+from notionlib.client import NotionAPIError, NotionClient
+from notionlib.config import require_env, snapshot_dir
+from notionlib.snapshot import SnapshotMissing, load_pages
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def plan_dir():
+    """Where --plan saves plans by default (plans/ in the snapshot directory)"""
+    return os.path.join(snapshot_dir(), 'plans')
+
+
+def fixer_arguments(script, description=None, argv=None, workers=False):
+    """
+    Parse the fixer command line.
+
+    Args:
+        script: The fixer's __file__ (names the default plan file)
+        description: Help text (usually the script's __doc__)
+        workers: Also accept --workers N for a process-pool parse stage
+
+    Returns:
+        argparse.Namespace with `plan` (output path, or None to apply the
+        changes), `refresh` and, if enabled, `workers`
+    """
+    name = os.path.splitext(os.path.basename(script))[0]
+    parser = argparse.ArgumentParser(
+        description=description,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        '--plan', nargs='?', const='', metavar='PATH',
+        help=f"don't write to Notion: evaluate the local snapshot offline and save the change plan "
+             f"as JSONL (default: {os.path.join(plan_dir(), name + '.jsonl')})",
+    )
+    parser.add_argument(
+        '--refresh', action='store_true',
+        help="with --plan, sync the snapshot from Notion before planning",
+    )
+    if workers:
+        parser.add_argument(
+            '--workers', type=int, default=1, metavar='N',
+            help="interpret rows in N worker processes (0 = one per CPU core; default 1, no pool)",
+        )
+    args = parser.parse_args(argv)
+    if args.plan == '':
+        args.plan = os.path.join(plan_dir(), f"{name}.jsonl")
+    return args
+
+
+def fixer_client(args):
+    """
+    NotionClient for a fixer run, or None for an offline --plan (which makes
+    no requests, so doesn't need NOTION_TOKEN).
+    """
+    if args.plan is not None and not args.refresh:
+        return None
+    return NotionClient(require_env('NOTION_TOKEN'))
+
+
+def load_snapshot(client, database_id, args=None, where=None, columns=None):
+    """
+    load_pages() for a script: offline in a fixer's plan mode (unless
+    --refresh), refreshed otherwise (and always for read-only scripts, which
+    pass no args). Exits with the usual error message on failure.
+    """
+    offline = args is not None and args.plan is not None and not args.refresh
+    try:
+        return load_pages(client, database_id, where=where, columns=columns, offline=offline)
+    except NotionAPIError as e:
+        print(f"❌ Error: {e.body}")
+        exit(1)
+    except requests.RequestException as e:
+        # Timeouts and connection errors that outlasted the retries
+        print(f"❌ Error: could not reach Notion: {e}")
+        exit(1)
+    except SnapshotMissing as e:
+        print(f"❌ Error: {e}")
+        exit(1)
+
+
+def save_plan(plan, args):
+    """Write the plan to the --plan path and say where it went"""
+    pages = plan.save(args.plan)
+    print()
+    print(f"💾 Plan saved: {pages} pages, {plan.changes} changes -> {args.plan}")
+    print("   Nothing was written to Notion.")
+
+
+def load_script(filename):
+    """
+    Import a sibling script as a module without running its main()
+    (the hyphenated file names can't be imported normally).
+
+    The module is registered in sys.modules under its underscored name, so
+    its functions can be pickled to worker processes (map_in_processes).
+    """
+    path = os.path.join(SCRIPTS_DIR, filename)
+    spec = importlib.util.spec_from_file_location(os.path.splitext(filename)[0].replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,202 @@
+"""
+Shared Notion API client for the scripts in scripts/notion.
+
+Every script used to call bare requests.post/requests.patch with its own
+HEADERS dict, which opened a fresh TCP+TLS connection per call. The client
+below owns one requests.Session with a keep-alive connection pool, so a full
+scan plus a few hundred PATCHes reuse a handful of warm connections.
+
+Every request also passes through a shared RateLimiter, so scripts no longer
+need their own time.sleep() between calls, and transient failures (429, 409,
+5xx, timeouts) are retried with backoff according to a RetryPolicy (see
+notionlib.retry).
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from notionlib.config import api_url
+from notionlib.ratelimit import RateLimiter, parse_retry_after
+from notionlib.retry import RetryPolicy, classify
+
+NOTION_VERSION = "2022-06-28"
+
+
+class NotionAPIError(Exception):
+    """
+    A non-200 response from the Notion API.
+
+    `kind` is the transient failure class from notionlib.retry ('throttled',
+    'conflict', 'server'), or None for a permanent error; `attempts` is how
+    many times the request was sent before giving up.
+    """
+
+    def __init__(self, status_code, message, body=None, attempts=1):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.body = body or {}
+        self.attempts = attempts
+
+    @property
+    def kind(self):
+        return classify(self.status_code)
+
+    @classmethod
+    def from_response(cls, response, attempts=1):
+        try:
+            body = response.json()
+        except ValueError:
+            body = {'message': response.text}
+        message = body.get('message') or f"HTTP {response.status_code}"
+        return cls(response.status_code, message, body, attempts)
+
+
+class NotionClient:
+    """
+    Thin wrapper around the Notion REST API with pooled connections.
+
+    Args:
+        token: Notion integration token
+        base_url: API root (default: NOTION_API_URL from the environment or
+                  .env, else Notion's; see notionlib.config.api_url())
+        pool_size: Maximum number of keep-alive connections kept open
+        timeout: Per-request timeout in seconds
+        rate_limiter: Shared RateLimiter (a default ~3 req/s bucket if omitted)
+        retry: RetryPolicy for transient failures (5 retries with backoff
+               if omitted; notionlib.retry.NO_RETRY to disable)
+    """
+
+    def __init__(self, token, base_url=None, pool_size=10, timeout=30,
+                 rate_limiter=None, retry=None):
+        self.base_url = (base_url or api_url()).rstrip('/')
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry = retry or RetryPolicy()
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Notion-Version": NOTION_VERSION,
+            "Content-Type": "application/json"
+        })
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def request(self, method, path, json=None, params=None):
+        """
+        Send one request and return the decoded JSON body.
+
+        Transient failures are retried under the rate limiter with backoff;
+        once the retries run out (or for a permanent error) NotionAPIError is
+        raised, or the requests exception for timeouts and connection errors.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        attempt = 0
+
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, json=json, params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                if classify(error=e) is None or attempt >= self.retry.max_retries:
+                    raise
+                time.sleep(self.retry.delay(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code == 200:
+                self.rate_limiter.on_success()
+                return response.json()
+
+            kind = classify(response.status_code)
+            if kind is None or attempt >= self.retry.max_retries:
+                raise NotionAPIError.from_response(response, attempts=attempt + 1)
+
+            if kind == 'throttled':
+                # Everyone waits out Retry-After; without one, back off too
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                self.rate_limiter.on_throttle(retry_after)
+                if retry_after is None:
+                    time.sleep(self.retry.delay(attempt))
+            else:
+                time.sleep(self.retry.delay(attempt))
+            attempt += 1
+
+    # === DATABASES ===
+
+    def get_database(self, database_id):
+        """Fetch a database object, including its property schema"""
+        return self.request('GET', f"databases/{database_id}")
+
+    def update_database(self, database_id, properties):
+        """Add or change properties on a database schema"""
+        return self.request('PATCH', f"databases/{database_id}", json={"properties": properties})
+
+    def query_database(self, database_id, start_cursor=None, page_size=100, params=None, **body):
+        """
+        Fetch a single batch of query results (one page of the cursor).
+
+        `params` is the query string, e.g. Projection.query_params() to limit
+        the properties returned; everything else goes in the JSON body.
+        """
+        payload = {"page_size": page_size, **body}
+        if start_cursor:
+            payload["start_cursor"] = start_cursor
+
+        return self.request('POST', f"databases/{database_id}/query", json=payload, params=params)
+
+    def iter_query(self, database_id, page_size=100, prefetch=True, params=None, **body):
+        """
+        Yield query results page by page as each batch arrives.
+
+        With prefetch on, the request for the next cursor is sent as soon as a
+        batch lands, so the caller's processing of one batch overlaps with the
+        network round trip for the next and only two batches are held at once.
+        """
+        if not prefetch:
+            start_cursor = None
+            while True:
+                data = self.query_database(database_id, start_cursor, page_size, params, **body)
+                yield from data.get('results', [])
+                if not data.get('has_more'):
+                    return
+                start_cursor = data.get('next_cursor')
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='notion-query') as pool:
+            future = pool.submit(self.query_database, database_id, None, page_size, params, **body)
+
+            while future is not None:
+                data = future.result()
+                future = None
+                if data.get('has_more'):
+                    future = pool.submit(self.query_database, database_id, data.get('next_cursor'), page_size, params, **body)
+
+                yield from data.get('results', [])
+
+    def query_all(self, database_id, page_size=100, **body):
+        """Follow the query cursor until has_more is false and return every page"""
+        return list(self.iter_query(database_id, page_size=page_size, **body))
+
+    # === PAGES ===
+
+    def get_page(self, page_id):
+        return self.request('GET', f"pages/{page_id}")
+
+    def update_page(self, page_id, properties):
+        """PATCH a page's properties and return the updated page"""
+        return self.request('PATCH', f"pages/{page_id}", json={"properties": properties})
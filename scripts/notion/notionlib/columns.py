@@ -0,0 +1,46 @@
+"""
+Column names and Notion property types of the Victorian Therapists database.
+
+Several of these names are long free-text questions from the original intake
+form, so scripts refer to them through these constants rather than retyping
+them. COLUMN_TYPES is what the filter builders use to pick the right Notion
+filter shape for a column.
+"""
+
+FIRST_NAME = 'First Name'
+LAST_NAME = 'Last Name'
+FULLNAME = 'Fullname'
+BUSINESS_NAME = 'Business Name'
+EMAIL = 'Email Address'
+PHONE = 'Phone'
+WEBSITE = 'Website (or alternative listing like Facebook or health engine)'
+OTHER_CONTACTS = 'Other contact details, social media, etc.'
+INSTAGRAM = 'Instagram'
+FACEBOOK = 'Facebook'
+TWITTER = 'Twitter/X'
+LINKEDIN = 'LinkedIn'
+SESSION_FEE = 'Session Fee'
+BULK_BILLING = 'Bulk Billing'
+REBATES = 'Do you offer rebates or other funding models?'
+PRICE_TIER = 'Price Tier'
+ADMIN_NOTES = 'Admin Notes'
+
+COLUMN_TYPES = {
+    FIRST_NAME: 'title',
+    LAST_NAME: 'rich_text',
+    FULLNAME: 'rich_text',
+    BUSINESS_NAME: 'rich_text',
+    EMAIL: 'email',
+    PHONE: 'rich_text',
+    WEBSITE: 'url',
+    OTHER_CONTACTS: 'rich_text',
+    INSTAGRAM: 'rich_text',
+    FACEBOOK: 'url',
+    TWITTER: 'rich_text',
+    LINKEDIN: 'url',
+    SESSION_FEE: 'number',
+    BULK_BILLING: 'checkbox',
+    REBATES: 'multi_select',
+    PRICE_TIER: 'select',
+    ADMIN_NOTES: 'rich_text',
+}
@@ -0,0 +1,58 @@
+"""
+Environment loading shared by the Notion scripts.
+"""
+
+import os
+from dotenv import load_dotenv
+
+NOTION_API_URL = "https://api.notion.com/v1"
+
+# Concurrent created_time ranges for full scans, unless NOTION_QUERY_SHARDS says otherwise
+QUERY_SHARDS = 4
+
+# Snapshots, plans and the interpretation cache, unless NOTION_SNAPSHOT_DIR says otherwise
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache')
+
+
+def require_env(*names):
+    """
+    Load .env and return the requested variables, exiting with the usual
+    error message if any of them is missing.
+    """
+    load_dotenv()
+
+    values = tuple(os.getenv(name) for name in names)
+
+    if not all(values):
+        print(f"❌ Error: {' and '.join(names)} required in .env")
+        exit(1)
+
+    return values if len(values) > 1 else values[0]
+
+
+def api_url():
+    """
+    Load .env and return the API root the clients talk to: NOTION_API_URL
+    if set (e.g. mock-notion-server.py), otherwise Notion's own.
+    """
+    load_dotenv()
+    return os.getenv('NOTION_API_URL', NOTION_API_URL)
+
+
+def snapshot_dir():
+    """
+    Load .env and return the directory holding snapshots, plans and the
+    interpretation cache: NOTION_SNAPSHOT_DIR if set, otherwise .cache/
+    next to the scripts.
+    """
+    load_dotenv()
+    return os.getenv('NOTION_SNAPSHOT_DIR', CACHE_DIR)
+
+
+def query_shards():
+    """
+    Load .env and return the number of shards a full scan is split into:
+    NOTION_QUERY_SHARDS if set, otherwise QUERY_SHARDS.
+    """
+    load_dotenv()
+    return int(os.getenv('NOTION_QUERY_SHARDS', QUERY_SHARDS))
@@ -0,0 +1,198 @@
+"""
+Database-wide duplicate detection for therapist profiles.
+
+find-duplicate-phones.py only compares a row's Phone with the number in that
+same row's "Other contacts". Here every record is hashed under its contact
+keys instead:
+
+    ('phone', '90878379')               landlines by their last 8 digits, so
+                                        "9087 8379" and "(03) 9087 8379" meet
+    ('phone', '0412345678')             other numbers by their national form
+    ('email', 'jane@example.com')
+    ('website', 'janepsychology.com.au')              own domain
+    ('website', 'facebook.com/janepsych')             shared hosts keep the path
+
+Records sharing any key are merged with a union-find, so clustering the whole
+directory is a single O(n) pass with no pairwise comparisons.
+
+Usage:
+    index = DuplicateIndex()
+    for therapist in snapshot.rows(COLUMNS):
+        index.add(therapist)
+    for cluster in index.clusters():
+        print([record.display_name for record in cluster.records], cluster.keys)
+"""
+
+import re
+from collections import defaultdict, namedtuple
+
+from notionlib.columns import OTHER_CONTACTS
+from notionlib.extract import extract_phone, scan_text
+from notionlib.phones import MIN_DIGITS, parse_phone
+from notionlib.platforms import DOMAINS
+
+# Hosts many therapists share, where only host + path identifies a profile
+SHARED_HOSTS = set(DOMAINS) | {
+    'psychologytoday.com',
+    'goodtherapy.com',
+    'halaxy.com',
+    'healthengine.com.au',
+    'psychology.com.au',
+    'linktr.ee',
+    'sites.google.com',
+}
+
+# scheme://user@host:port/path -> host, path (scheme optional)
+URL_PARTS = re.compile(r'^(?:[a-z][a-z0-9+.-]*://)?(?:[^@/]*@)?([^/:?#\s]+)(?::\d+)?([^?#\s]*)', re.IGNORECASE)
+
+Cluster = namedtuple('Cluster', ['records', 'keys'])
+
+
+class DisjointSet:
+    """Union-find over hashable items (path halving, union by size)"""
+
+    def __init__(self):
+        self._parent = {}
+        self._size = {}
+
+    def add(self, item):
+        if item not in self._parent:
+            self._parent[item] = item
+            self._size[item] = 1
+
+    def find(self, item):
+        parent = self._parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+        return a
+
+    def groups(self):
+        """dict of root -> list of members, in insertion order"""
+        groups = defaultdict(list)
+        for item in self._parent:
+            groups[self.find(item)].append(item)
+        return groups
+
+
+def phone_key(raw):
+    """Index key for a phone value, or None if it's too short to be one"""
+    phone = parse_phone(raw)
+    if len(phone.national) < MIN_DIGITS:
+        return None
+    if phone.kind == 'landline' or len(phone.national) == MIN_DIGITS:
+        # Drop the area code: "9087 8379" matches "(03) 9087 8379"
+        return ('phone', phone.national[-MIN_DIGITS:])
+    return ('phone', phone.national)
+
+
+def website_key(url):
+    """Index key for a website value: its host, or host + path on shared hosts"""
+    match = URL_PARTS.match((url or '').strip())
+    if not match:
+        return None
+    host = match.group(1).lower().removeprefix('www.')
+    if '.' not in host:
+        return None
+
+    shared = host
+    while shared and shared not in SHARED_HOSTS:
+        _, _, shared = shared.partition('.')
+    if shared:
+        path = match.group(2).strip('/').lower()
+        return ('website', f"{shared}/{path}") if path else None
+    return ('website', host)
+
+
+def contact_keys(record):
+    """
+    Contact keys of a TherapistRecord: Phone, Email Address and Website,
+    plus the phone and emails in "Other contacts" when the record has it.
+    """
+    yield phone_key(record.phone)
+    if record.email:
+        yield ('email', record.email.strip().lower())
+    yield website_key(record.website)
+
+    if record.has(OTHER_CONTACTS) and record.other_contacts:
+        yield phone_key(extract_phone(record.other_contacts))
+        for email in scan_text(record.other_contacts).of('email'):
+            yield ('email', email.lower)
+
+
+class DuplicateIndex:
+    """
+    Hash index of records by contact key, clustering records that share one.
+
+    Args:
+        keys: Function yielding the index keys of a record (None entries are
+              ignored); contact_keys by default
+    """
+
+    def __init__(self, keys=contact_keys):
+        self.keys = keys
+        self.records = {}
+        self._pages_by_key = {}
+        self._groups = DisjointSet()
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, record):
+        page_id = record.page_id
+        self.records[page_id] = record
+        self._groups.add(page_id)
+
+        for key in set(self.keys(record)):
+            if key is None:
+                continue
+            pages = self._pages_by_key.setdefault(key, [])
+            if pages:
+                self._groups.union(pages[0], page_id)
+            pages.append(page_id)
+
+    def link(self, a, b, key):
+        """
+        Record outside evidence that two indexed records are the same
+        profile (a name match, say), under a key describing it.
+        """
+        pages = self._pages_by_key.setdefault(key, [])
+        for record in (a, b):
+            if record.page_id not in pages:
+                pages.append(record.page_id)
+        self._groups.union(a.page_id, b.page_id)
+
+    def pages(self, key):
+        """Page ids indexed under a key"""
+        return list(self._pages_by_key.get(key, ()))
+
+    def clusters(self):
+        """
+        Groups of two or more records linked by shared keys.
+
+        Returns:
+            list of Cluster(records, keys), largest first; `keys` are the
+            shared keys that linked the group
+        """
+        shared = defaultdict(list)
+        for key, pages in self._pages_by_key.items():
+            if len(pages) > 1:
+                shared[self._groups.find(pages[0])].append(key)
+
+        clusters = [
+            Cluster([self.records[page_id] for page_id in members], shared[root])
+            for root, members in self._groups.groups().items()
+            if len(members) > 1
+        ]
+        clusters.sort(key=lambda cluster: len(cluster.records), reverse=True)
+        return clusters
@@ -0,0 +1,289 @@
+"""
+Single-pass extraction engine for the free-text "Other contacts" column.
+
+The cleanup scripts used to run a dozen or more re.search calls per row, each
+with its own inline pattern and often on both `text` and `text.lower()`. Here
+one precompiled scanner splits the text into typed tokens in a single pass:
+
+    url      https://instagram.com/jane.psych
+    email    jane@example.com
+    handle   @jane.psych
+    domain   www.janepsychology.com.au/contact
+    number   (03) 9087 8379
+    word     Instagram, linkedin, Jane
+    punct    : ( ) & ...
+
+While scanning, each token is classified: words and URL/domain hosts are
+looked up in the tables compiled from the platform registry
+(notionlib.platforms), so "fb", "facebook" and m.facebook.com all map to
+'facebook', and number runs are matched against the Australian phone shapes.
+The interpreters then answer questions like "what follows 'Instagram:'?" by
+walking the token list rather than re-scanning the string.
+
+Usage:
+    scan = scan_text(text)
+    for platform, value in scan.social_values().items():
+        ...                                  # {'instagram': '@jane.psych'}
+    phone = scan.phone()
+"""
+
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from notionlib.phones import MIN_DIGITS, PHONE_SHAPES
+from notionlib.platforms import DOMAINS, KEYWORDS, PLATFORMS
+
+TOKEN_PATTERN = re.compile(r"""
+      (?P<url>https?://[^\s,]+)
+    | (?P<email>[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})
+    | (?P<handle>@[A-Za-z0-9_.]+)
+    | (?P<domain>(?:www\.)?[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}(?:/[^\s,]*)?)
+    | (?P<number>\+?\(?\d[\d\s()-]*\d|\d)
+    | (?P<word>[A-Za-z0-9_.'-]+)
+    | (?P<punct>[^\s\w])
+""", re.VERBOSE)
+
+# Words that introduce a phone number ("Phone: 9087 8379", "M 0412 345 678")
+PHONE_LABELS = {
+    'phone', 'ph', 'p', 'mobile', 'mob', 'm', 't', 'tel', 'telephone',
+    'call', 'contact', 'text', 'landline', 'office',
+}
+
+# Tokens allowed between a keyword and its value ("Instagram: x", "FB - x", "IG is x")
+SEPARATORS = {':', '-', '=', 'is'}
+
+# Tokens joining platform keywords that share one value ("Facebook & Instagram: x")
+CONJUNCTIONS = {'&', 'and', '/', ','}
+
+# Words allowed between a handle and the keyword after it ("@jane on facebook")
+VIA = {'on'}
+
+# Values that are never a handle or page name ("Instagram and Facebook", "Facebook page")
+NOT_HANDLES = {'and', 'or', 'the', 'page', 'profile', 'is', 'on', 'at', 'via', 'us', 'me', 'my', 'our', 'sound'}
+
+# Token kinds that can hold a handle / page name
+VALUE_KINDS = ('handle', 'word', 'domain', 'number')
+
+NON_DIGITS = re.compile(r'\D')
+
+
+def _platform_for_host(host):
+    """Look a host up in the registered domains, trying each parent domain"""
+    while host:
+        platform = DOMAINS.get(host)
+        if platform:
+            return platform
+        _, _, host = host.partition('.')
+    return None
+
+
+class Token:
+    """One classified piece of the scanned text"""
+
+    __slots__ = ('kind', 'text', 'lower', 'platform', 'host', 'path', 'phone_rank', 'phone')
+
+    def __init__(self, kind, text):
+        self.kind = kind
+        self.text = text
+        self.lower = text.lower()
+        self.platform = None
+        self.host = ''
+        self.path = ''
+        self.phone_rank = None
+        self.phone = None
+
+        if kind == 'word':
+            self.platform = KEYWORDS.get(self.lower.strip('.'))
+        elif kind == 'url':
+            try:
+                parts = urlsplit(text)
+                self.host = (parts.hostname or '').removeprefix('www.')
+                self.path = parts.path.lstrip('/')
+            except ValueError:
+                pass
+            self.platform = _platform_for_host(self.host)
+        elif kind == 'domain':
+            host, _, path = text.partition('/')
+            self.host = host.lower().removeprefix('www.')
+            self.path = path
+            self.platform = _platform_for_host(self.host)
+        elif kind == 'number':
+            for rank, shape in enumerate(PHONE_SHAPES):
+                match = shape.search(text)
+                if match:
+                    self.phone_rank = rank
+                    self.phone = match.group(0)
+                    break
+
+    @property
+    def segments(self):
+        """Non-empty path segments of a url/domain token"""
+        return [segment for segment in self.path.split('?', 1)[0].split('/') if segment]
+
+    @property
+    def digits(self):
+        return NON_DIGITS.sub('', self.text)
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.text!r})"
+
+
+class Scan:
+    """Tokens of one text, with lookups used by the interpreters"""
+
+    __slots__ = ('text', 'tokens', 'urls', 'links', 'platforms')
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = []
+        self.urls = []
+        self.links = []     # url/domain tokens pointing at a registered platform
+        self.platforms = set()
+
+        for match in TOKEN_PATTERN.finditer(text):
+            token = Token(match.lastgroup, match.group())
+            self.tokens.append(token)
+            if token.kind == 'url':
+                self.urls.append(token)
+            if token.platform:
+                self.platforms.add(token.platform)
+                if token.kind != 'word':
+                    self.links.append(token)
+
+    def of(self, kind):
+        return [token for token in self.tokens if token.kind == kind]
+
+    def first(self, kind, platform=None):
+        for token in self.tokens:
+            if token.kind == kind and (platform is None or token.platform == platform):
+                return token
+        return None
+
+    def mentions(self, platform):
+        """Whether the text names or links to a platform anywhere"""
+        return platform in self.platforms
+
+    def lone_handle(self):
+        """The handle when the whole text is just "@handle" """
+        if len(self.tokens) == 1 and self.tokens[0].kind == 'handle':
+            return self.tokens[0].lower[1:]
+        return None
+
+    def handles(self):
+        """
+        Handles named next to a platform keyword, in one pass over the tokens:
+
+            "Instagram: @jane"             value after the keyword
+            "Facebook & Instagram - jane"  shared by joined keywords
+            "@jane instagram", "@jane on facebook"
+            "jane_psych (Instagram)"       value before the keyword
+
+        Values that are platform links, platform names or filler words are
+        skipped; each value is cut to the platform's handle characters.
+
+        Returns:
+            dict of platform -> lowercased handle (first mention wins)
+        """
+        found = {}
+        for i, token in enumerate(self.tokens):
+            platform = token.platform
+            if token.kind != 'word' or not platform or platform in found:
+                continue
+            chars = PLATFORMS[platform].handle_chars
+            value = self._value_after(i, chars) or self._value_before(i, chars)
+            if value:
+                found[platform] = value
+        return found
+
+    def social_values(self):
+        """
+        Column value for each platform with a Notion column: from the first
+        profile link, else from a handle named next to a keyword.
+
+        Returns:
+            dict of platform -> value to store ("@jane", "https://...")
+        """
+        values = {}
+        for link in self.links:
+            rule = PLATFORMS[link.platform]
+            if rule.column and rule.name not in values:
+                value = rule.value_from_link(link)
+                if value:
+                    values[rule.name] = value
+        for platform, handle in self.handles().items():
+            rule = PLATFORMS[platform]
+            if rule.column and platform not in values:
+                values[platform] = rule.value(handle)
+        return values
+
+    def _value_after(self, i, chars):
+        tokens = self.tokens
+        j = i + 1
+        while j < len(tokens):
+            if tokens[j].lower in SEPARATORS:
+                j += 1
+            elif (tokens[j].lower in CONJUNCTIONS and j + 1 < len(tokens)
+                  and tokens[j + 1].kind == 'word' and tokens[j + 1].platform):
+                j += 2
+            else:
+                break
+        return _value(tokens[j], chars) if j < len(tokens) else None
+
+    def _value_before(self, i, chars):
+        tokens = self.tokens
+        j = i - 1
+        if j >= 0 and tokens[j].text == '(':
+            # "name (Instagram)": any kind of value
+            if i + 1 >= len(tokens) or tokens[i + 1].text != ')':
+                return None
+            j -= 1
+            kinds = VALUE_KINDS
+        else:
+            # "@name instagram": only an explicit handle
+            while j >= 0 and tokens[j].lower in VIA:
+                j -= 1
+            kinds = ('handle',)
+        if j >= 0 and tokens[j].kind in kinds:
+            return _value(tokens[j], chars)
+        return None
+
+    def phone(self, min_digits=MIN_DIGITS):
+        """
+        Phone number in the text: a labelled number ("Phone: 9087 8379")
+        first, else the best-ranked Australian phone shape.
+        """
+        tokens = self.tokens
+        best = None
+        for i, token in enumerate(tokens):
+            if token.kind != 'number':
+                continue
+            j = i - 1
+            while j >= 0 and tokens[j].lower in SEPARATORS:
+                j -= 1
+            if j >= 0 and tokens[j].lower in PHONE_LABELS and len(token.digits) >= min_digits:
+                return token.text.strip()
+            if token.phone is not None and (best is None or token.phone_rank < best.phone_rank):
+                best = token
+        return best.phone if best else None
+
+
+def _value(token, chars):
+    if token.kind not in VALUE_KINDS or token.platform:
+        return None
+    match = chars.match(token.lower.lstrip('@'))
+    value = match.group(0).rstrip('.') if match else ''
+    if not value or value in NOT_HANDLES:
+        return None
+    return value
+
+
+def scan_text(text):
+    """Tokenize and classify `text` in one pass"""
+    return Scan(text or '')
+
+
+@lru_cache(maxsize=65536)
+def extract_phone(text):
+    """Phone number found in `text`, or None (cached per distinct text)"""
+    return scan_text(text).phone()
@@ -0,0 +1,181 @@
+"""
+Declarative row filters that can be pushed down to where the data lives.
+
+Most scripts only care about a subset of therapists (rows with something in
+"Other contacts", rows without a Price Tier), yet they used to page through
+and decode every row. A Filter built here compiles two ways:
+
+    to_notion()  -> the JSON filter for a databases/{id}/query body, so a live
+                    query only transfers matching pages
+    to_sql()     -> a WHERE clause over the snapshot's stored page JSON, so a
+                    snapshot read only json-decodes matching rows
+    matches(r)   -> the same test on a decoded record, e.g. a stage of
+                    run-maintenance.py looking at changes not yet written
+
+Usage:
+    where = all_of(is_not_empty(OTHER_CONTACTS), is_empty(PRICE_TIER))
+    for page in snapshot.pages(where):
+        ...
+"""
+
+from notionlib.columns import COLUMN_TYPES
+
+# Property types whose value is a JSON array (empty array == empty value)
+ARRAY_TYPES = {'title', 'rich_text', 'multi_select', 'people', 'files', 'relation'}
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, (str, list, tuple)) and not value)
+
+
+def _json_path(column, *keys):
+    path = f'$.properties."{column}".' + '.'.join(keys)
+    return path.rstrip('.')
+
+
+class Filter:
+    """Base class; subclasses implement to_notion() and to_sql()"""
+
+    def to_notion(self):
+        raise NotImplementedError
+
+    def to_sql(self):
+        """Return (clause, params) usable in `WHERE <clause>` against the pages table"""
+        raise NotImplementedError
+
+    def matches(self, record):
+        """Whether a decoded record (get(column), last_edited_time) passes the filter"""
+        raise NotImplementedError
+
+
+class PropertyFilter(Filter):
+    """A single condition on one column, e.g. Phone is_empty"""
+
+    def __init__(self, column, condition, value=True, kind=None):
+        self.column = column
+        self.condition = condition
+        self.value = value
+        self.kind = kind or COLUMN_TYPES.get(column)
+
+        if not self.kind:
+            raise ValueError(f"Unknown property type for column {column!r}; pass kind=")
+
+    def to_notion(self):
+        return {"property": self.column, self.kind: {self.condition: self.value}}
+
+    def to_sql(self):
+        path = _json_path(self.column, self.kind)
+
+        if self.condition in ('is_empty', 'is_not_empty'):
+            if self.kind in ARRAY_TYPES:
+                clause = "COALESCE(json_array_length(data, ?), 0) = 0"
+            else:
+                clause = "COALESCE(json_extract(data, ?), '') = ''"
+            if self.condition == 'is_not_empty':
+                clause = f"NOT ({clause})"
+            return clause, [path]
+
+        if self.condition == 'equals':
+            if self.kind in ('select', 'status'):
+                path = _json_path(self.column, self.kind, 'name')
+            elif self.kind == 'checkbox':
+                return "json_extract(data, ?) = ?", [path, 1 if self.value else 0]
+            elif self.kind in ARRAY_TYPES:
+                raise ValueError(f"equals is not supported on {self.kind} columns")
+            return "json_extract(data, ?) = ?", [path, self.value]
+
+        raise ValueError(f"Unsupported filter condition: {self.condition}")
+
+    def matches(self, record):
+        value = record.get(self.column)
+        if self.condition == 'is_empty':
+            return _is_empty(value)
+        if self.condition == 'is_not_empty':
+            return not _is_empty(value)
+        if self.condition == 'equals':
+            if self.kind == 'checkbox':
+                return bool(value) == bool(self.value)
+            return value == self.value
+        raise ValueError(f"Unsupported filter condition: {self.condition}")
+
+
+class TimestampFilter(Filter):
+    """A condition on a page timestamp (created_time / last_edited_time)"""
+
+    OPERATORS = {'on_or_after': '>=', 'after': '>', 'on_or_before': '<=', 'before': '<'}
+
+    def __init__(self, timestamp, condition, value):
+        if condition not in self.OPERATORS:
+            raise ValueError(f"Unsupported timestamp condition: {condition}")
+        self.timestamp = timestamp
+        self.condition = condition
+        self.value = value
+
+    def to_notion(self):
+        return {"timestamp": self.timestamp, self.timestamp: {self.condition: self.value}}
+
+    def to_sql(self):
+        # Notion's ISO timestamps compare correctly as strings
+        return f"json_extract(data, ?) {self.OPERATORS[self.condition]} ?", [f'$.{self.timestamp}', self.value]
+
+    def matches(self, record):
+        if self.timestamp != 'last_edited_time':
+            raise ValueError(f"Records don't carry {self.timestamp}")
+        current = record.last_edited_time or ''
+        return {
+            'on_or_after': current >= self.value,
+            'after': current > self.value,
+            'on_or_before': current <= self.value,
+            'before': current < self.value,
+        }[self.condition]
+
+
+class CompoundFilter(Filter):
+    """and/or over several filters"""
+
+    def __init__(self, operator, filters):
+        self.operator = operator
+        self.filters = list(filters)
+
+    def to_notion(self):
+        return {self.operator: [f.to_notion() for f in self.filters]}
+
+    def to_sql(self):
+        clauses, params = [], []
+        for f in self.filters:
+            clause, clause_params = f.to_sql()
+            clauses.append(f"({clause})")
+            params.extend(clause_params)
+        return f" {self.operator.upper()} ".join(clauses), params
+
+    def matches(self, record):
+        test = all if self.operator == 'and' else any
+        return test(f.matches(record) for f in self.filters)
+
+
+def is_empty(column, kind=None):
+    return PropertyFilter(column, 'is_empty', True, kind)
+
+
+def is_not_empty(column, kind=None):
+    return PropertyFilter(column, 'is_not_empty', True, kind)
+
+
+def equals(column, value, kind=None):
+    return PropertyFilter(column, 'equals', value, kind)
+
+
+def created_on_or_after(timestamp):
+    return TimestampFilter('created_time', 'on_or_after', timestamp)
+
+
+def created_before(timestamp):
+    return TimestampFilter('created_time', 'before', timestamp)
+
+
+def all_of(*filters):
+    return CompoundFilter('and', filters)
+
+
+def any_of(*filters):
+    return CompoundFilter('or', filters)
@@ -0,0 +1,254 @@
+"""
+Memoised interpretation results.
+
+Many therapists have the same "Other contacts" text ("as above", "linkedin",
+"n/a", one practice URL shared by a whole clinic), and every run used to
+interpret every row again, even over an unchanged database. Memo wraps an
+interpreter so each distinct input is interpreted once: results are kept in
+an in-process LRU and in a SQLite file next to the snapshots
+(.cache/memo.sqlite), so the next run starts warm.
+
+    interpret = Memo('intelligent-cleanup', interpret_other_contacts,
+                     key=interpretation_key, version=rules_version(__file__))
+
+    interpreted = interpret(text, context)                      # one row
+    for interpreted in interpret.map(texts, contexts, workers=4):  # many rows
+        ...
+
+The cache key is a hash of what the interpreter actually reads: key(text,
+context) reduces a row to its normalised text and the context fields that
+can change the result (usually whether a column is filled, not its value),
+so rows that differ only in ways the interpreter ignores share one entry.
+
+Entries belong to a rules version, a hash of the interpreter's script, the
+modules the rules live in (tokenizer, phone shapes, platform registry) and
+the registered platforms. Editing any of them changes the version, and the
+stored entries for that interpreter are dropped when it is next opened. At
+most MAX_ENTRIES per interpreter are kept on disk, least recently used
+first out.
+
+NOTION_MEMO=off keeps the cache in memory for the one run.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+from notionlib import extract, phones, platforms
+from notionlib.config import snapshot_dir
+from notionlib.parallel import map_in_processes
+
+# Results held in process per interpreter
+MEMORY_SIZE = 65536
+
+# Results stored on disk per interpreter
+MAX_ENTRIES = 200000
+
+# Modules whose source defines the interpretation rules
+RULE_MODULES = (extract, phones, platforms)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memo (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (name, key)
+);
+CREATE TABLE IF NOT EXISTS versions (
+    name TEXT PRIMARY KEY,
+    version TEXT NOT NULL
+);
+"""
+
+
+def memo_path():
+    """Default cache file (memo.sqlite in the snapshot directory)"""
+    return os.path.join(snapshot_dir(), 'memo.sqlite')
+
+
+def rules_version(*paths):
+    """
+    Hash of the interpretation rules: the given source files (usually the
+    interpreter's own script), RULE_MODULES and the registered platforms.
+    """
+    digest = hashlib.sha1()
+    for path in [*paths, *(module.__file__ for module in RULE_MODULES)]:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+
+    # Platforms can be registered at run time, outside any of those files
+    for rule in platforms.PLATFORMS.values():
+        digest.update(repr((
+            rule.name, rule.label, rule.keywords, rule.domains, rule.handle_chars.pattern,
+            rule.profile_url, rule.column, rule.column_format, rule.path_prefix, sorted(rule.reserved),
+        )).encode())
+    return digest.hexdigest()
+
+
+class Memo:
+    """
+    A cached interpreter, func(text, context) -> JSON-serialisable result.
+
+    Args:
+        name: Cache namespace (usually the script name)
+        func: Module-level interpreter (map() may run it in worker processes)
+        key: key(text, context) -> the parts of the input the result depends
+             on, e.g. (text.strip(), {'existing_website': True})
+        version: Rules version (see rules_version()); entries from any other
+                 version are dropped
+        path: SQLite file (default memo_path(); ':memory:' for no persistence)
+    """
+
+    def __init__(self, name, func, key, version, path=None, memory_size=MEMORY_SIZE,
+                 max_entries=MAX_ENTRIES):
+        if path is None:
+            path = ':memory:' if os.getenv('NOTION_MEMO', 'on').lower() in ('off', '0', 'false') else memo_path()
+
+        self.name = name
+        self.func = func
+        self.key = key
+        self.version = version
+        self.path = path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        self.db = None
+        self._memory = OrderedDict()   # key -> JSON result, most recently used last
+        self._pending = {}             # results not written to disk yet
+        self._used = set()             # stored keys read this run
+
+    def __call__(self, text, context):
+        """Interpret one row, from the cache if its key has been seen"""
+        key = self.digest(text, context)
+        value = self._lookup(key)
+        if value is None:
+            value = self._store(key, self.func(text, context))
+        return json.loads(value)
+
+    def map(self, texts, contexts, workers=1):
+        """
+        Yield the interpretation of each (text, context) pair, in order.
+
+        Only inputs that are neither cached nor repeated earlier in the batch
+        are interpreted, through map_in_processes() with `workers`.
+        """
+        keys = [self.digest(text, context) for text, context in zip(texts, contexts)]
+
+        values = {}
+        missing = {}   # key -> first (text, context) with it, in row order
+        for key, text, context in zip(keys, texts, contexts):
+            if key in values or key in missing:
+                self.hits += 1
+                continue
+            value = self._lookup(key)
+            if value is None:
+                missing[key] = (text, context)
+            else:
+                values[key] = value
+
+        # Results come back in first-seen order, which is the order rows need them
+        computed = zip(missing, map_in_processes(
+            self.func,
+            [text for text, _ in missing.values()],
+            [context for _, context in missing.values()],
+            workers=workers,
+        ))
+        for key in keys:
+            if key not in values:
+                computed_key, result = next(computed)
+                values[computed_key] = self._store(computed_key, result)
+            yield json.loads(values[key])
+
+    def digest(self, text, context):
+        """Cache key for an input: hash of the rules version and key(text, context)"""
+        material = json.dumps([self.version, self.key(text, context)], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(material.encode()).hexdigest()
+
+    # === STORAGE ===
+
+    def _open(self):
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(SCHEMA)
+
+        # The rules changed since these entries were stored
+        row = self.db.execute("SELECT version FROM versions WHERE name = ?", (self.name,)).fetchone()
+        if row is None or row[0] != self.version:
+            self.db.execute("DELETE FROM memo WHERE name = ?", (self.name,))
+            self.db.execute("INSERT OR REPLACE INTO versions (name, version) VALUES (?, ?)",
+                            (self.name, self.version))
+            self.db.commit()
+
+        atexit.register(self.close)
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key):
+        """JSON result for a key, or None (counts the hit)"""
+        value = self._memory.get(key)
+        if value is None:
+            if self.db is None:
+                self._open()
+            row = self.db.execute("SELECT value FROM memo WHERE name = ? AND key = ?",
+                                  (self.name, key)).fetchone()
+            if row is None:
+                return None
+            value = row[0]
+            self._used.add(key)
+
+        self.hits += 1
+        self._remember(key, value)
+        return value
+
+    def _store(self, key, result):
+        self.misses += 1
+        value = json.dumps(result, ensure_ascii=False)
+        self._remember(key, value)
+        self._pending[key] = value
+        return value
+
+    def save(self):
+        """Write new results to disk and evict the least recently used beyond max_entries"""
+        if self.db is None:
+            return
+
+        now = time.time()
+        self.db.executemany(
+            "INSERT OR REPLACE INTO memo (name, key, value, used) VALUES (?, ?, ?, ?)",
+            [(self.name, key, value, now) for key, value in self._pending.items()]
+        )
+        self.db.executemany(
+            "UPDATE memo SET used = ? WHERE name = ? AND key = ?",
+            [(now, self.name, key) for key in self._used]
+        )
+        self.db.execute(
+            "DELETE FROM memo WHERE name = ? AND key IN "
+            "(SELECT key FROM memo WHERE name = ? ORDER BY used DESC LIMIT -1 OFFSET ?)",
+            (self.name, self.name, self.max_entries)
+        )
+        self.db.commit()
+
+        self._pending.clear()
+        self._used.clear()
+
+    def close(self):
+        """Save and close (also run at exit once the cache has been used)"""
+        if self.db is None:
+            return
+        self.save()
+        self.db.close()
+        self.db = None
+        atexit.unregister(self.close)
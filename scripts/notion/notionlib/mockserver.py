@@ -0,0 +1,533 @@
+"""
+Local stand-in for the Notion API.
+
+Nothing in scripts/notion could be run without a live token and the real
+database. MockNotion keeps databases and pages in memory and answers the
+endpoints the scripts use, the way Notion does:
+
+    POST  databases/{id}/query   filter (property, timestamp and and/or
+                                 filters), sorts, filter_properties,
+                                 page_size / start_cursor pagination
+    GET   databases/{id}         schema, with property ids and created_time
+    PATCH databases/{id}         add, rename or remove properties
+    GET   pages/{id}
+    PATCH pages/{id}             properties in write format (rich_text
+                                 content, select name, ...), archived
+
+Errors have Notion's JSON shape (object_not_found, validation_error, ...).
+A RateLimiter bucket answers 429 rate_limited with Retry-After once the
+request budget is spent, `latency` (plus up to `jitter`) is added to every
+response, and `failure_rate` turns a share of requests into 503s, so the
+client's throttling, retries and concurrency see realistic conditions.
+
+    mock = MockNotion(latency=0.2, rate=3)
+    mock.add_snapshot('.cache/<database id>.sqlite')
+    server, base_url = start_server(mock)
+    client = NotionClient('mock-token', base_url=base_url)
+
+The scripts pick the server up from NOTION_API_URL (see
+mock-notion-server.py). Writes only change the in-memory copy.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from notionlib.ratelimit import RateLimiter
+from notionlib.snapshot import Snapshot
+
+# Largest page_size Notion accepts
+MAX_PAGE_SIZE = 100
+
+# Empty value of each property type, as a page shows it
+EMPTY_VALUES = {
+    'title': [],
+    'rich_text': [],
+    'multi_select': [],
+    'people': [],
+    'files': [],
+    'relation': [],
+    'checkbox': False,
+}
+
+DEFAULT_ANNOTATIONS = {
+    "bold": False, "italic": False, "strikethrough": False,
+    "underline": False, "code": False, "color": "default",
+}
+
+
+class MockError(Exception):
+    """An error response, in Notion's {object: error, status, code, message} shape"""
+
+    def __init__(self, status, code, message):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+    def body(self):
+        return {"object": "error", "status": self.status, "code": self.code, "message": self.message}
+
+
+def now_iso(precision='milliseconds'):
+    return datetime.now(timezone.utc).isoformat(timespec=precision).replace('+00:00', 'Z')
+
+
+def edited_iso():
+    """last_edited_time for a write: Notion rounds it down to the minute"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:00.000Z')
+
+
+def plain_value(prop):
+    """A page property reduced to what filters and sorts compare"""
+    if not prop:
+        return None
+    kind = prop.get('type')
+    value = prop.get(kind)
+
+    if kind in ('title', 'rich_text'):
+        return ''.join(item.get('plain_text', '') for item in value or [])
+    if kind in ('select', 'status'):
+        return value.get('name') if value else None
+    if kind == 'multi_select':
+        return [option.get('name') for option in value or []]
+    if kind == 'date':
+        return value.get('start') if value else None
+    if kind == 'formula':
+        return value.get(value.get('type')) if value else None
+    return value
+
+
+def read_value(kind, value):
+    """A property value in write format (as sent in a PATCH) as a page shows it"""
+    if kind in ('title', 'rich_text'):
+        items = []
+        for item in value or []:
+            text = item.get('text') or {}
+            content = text.get('content', item.get('plain_text', ''))
+            link = text.get('link')
+            items.append({
+                "type": "text",
+                "text": {"content": content, "link": link},
+                "annotations": dict(DEFAULT_ANNOTATIONS),
+                "plain_text": content,
+                "href": link.get('url') if link else None,
+            })
+        return items
+    if kind in ('select', 'status'):
+        return {"name": value['name'], "color": value.get('color', 'default')} if value else None
+    if kind == 'multi_select':
+        return [{"name": option['name'], "color": option.get('color', 'default')} for option in value or []]
+    return value
+
+
+def _text(value):
+    return value if isinstance(value, str) else ''
+
+
+# condition -> test(current value, filter argument)
+CONDITIONS = {
+    'equals': lambda current, arg: current == arg,
+    'does_not_equal': lambda current, arg: current != arg,
+    'contains': lambda current, arg: arg in current if isinstance(current, list) else arg in _text(current),
+    'does_not_contain': lambda current, arg: arg not in (current if isinstance(current, list) else _text(current)),
+    'starts_with': lambda current, arg: _text(current).startswith(arg),
+    'ends_with': lambda current, arg: _text(current).endswith(arg),
+    'is_empty': lambda current, arg: current in (None, '', []),
+    'is_not_empty': lambda current, arg: current not in (None, '', []),
+    'greater_than': lambda current, arg: current is not None and current > arg,
+    'less_than': lambda current, arg: current is not None and current < arg,
+    'greater_than_or_equal_to': lambda current, arg: current is not None and current >= arg,
+    'less_than_or_equal_to': lambda current, arg: current is not None and current <= arg,
+    # Dates and timestamps (ISO strings compare correctly as strings)
+    'before': lambda current, arg: current is not None and current < arg,
+    'after': lambda current, arg: current is not None and current > arg,
+    'on_or_before': lambda current, arg: current is not None and current <= arg,
+    'on_or_after': lambda current, arg: current is not None and current >= arg,
+}
+
+
+def _test(current, condition):
+    if not isinstance(condition, dict) or len(condition) != 1:
+        raise MockError(400, 'validation_error', f"Invalid filter condition: {condition!r}")
+    (name, arg), = condition.items()
+    test = CONDITIONS.get(name)
+    if test is None:
+        raise MockError(400, 'validation_error', f"Unsupported filter condition: {name}")
+    return test(current, arg)
+
+
+class MockDatabase:
+    """
+    One database: its schema and its pages, in the order they were added
+    (the order unsorted queries return them in).
+
+    Args:
+        database_id: Database id the scripts query
+        pages: Raw page dicts (e.g. from a Snapshot)
+        properties: Schema {name: {id, name, type, <type>: {}}}; inferred
+                    from the pages if omitted
+    """
+
+    def __init__(self, database_id, pages, title='Therapists', properties=None, created_time=None):
+        self.id = database_id
+        self.title = title
+        self.pages = {}
+        for page in pages:
+            page = dict(page, object='page', parent={"type": "database_id", "database_id": database_id})
+            page.setdefault('archived', False)
+            # created_time drives the shard ranges; every real page has one
+            page.setdefault('created_time', page.get('last_edited_time') or now_iso())
+            self.pages[page['id']] = page
+
+        self.properties = properties or self._infer_schema()
+        self.created_time = created_time or min(
+            (page['created_time'] for page in self.pages.values() if page.get('created_time')),
+            default=now_iso(),
+        )
+        self.last_edited_time = now_iso()
+
+    def _infer_schema(self):
+        properties = {}
+        for page in self.pages.values():
+            for name, prop in page.get('properties', {}).items():
+                if name not in properties:
+                    kind = prop.get('type')
+                    properties[name] = {"id": prop.get('id') or self._new_property_id(), "name": name,
+                                        "type": kind, kind: {}}
+        return properties
+
+    def _new_property_id(self):
+        return uuid.uuid4().hex[:4]
+
+    def to_notion(self):
+        return {
+            "object": "database",
+            "id": self.id,
+            "created_time": self.created_time,
+            "last_edited_time": self.last_edited_time,
+            "title": read_value('title', [{"text": {"content": self.title}}]),
+            "properties": self.properties,
+            "archived": False,
+        }
+
+    def property_name(self, key):
+        """Property name for a name or (possibly percent-encoded) property id"""
+        if key in self.properties:
+            return key
+        key = unquote(key)
+        for name, spec in self.properties.items():
+            if unquote(spec['id']) == key:
+                return name
+        return None
+
+    # === QUERIES ===
+
+    def matches(self, page, where):
+        if not where:
+            return True
+        if 'and' in where:
+            return all(self.matches(page, part) for part in where['and'])
+        if 'or' in where:
+            return any(self.matches(page, part) for part in where['or'])
+        if 'timestamp' in where:
+            timestamp = where['timestamp']
+            return _test(page.get(timestamp), where.get(timestamp))
+
+        name = self.property_name(where.get('property', ''))
+        if name is None:
+            raise MockError(400, 'validation_error', f"Could not find property with name or id: {where.get('property')}")
+        kind = next((key for key in where if key != 'property'), None)
+        return _test(plain_value(page['properties'].get(name)), where.get(kind))
+
+    def select(self, where=None, sorts=None):
+        """Ids of the live pages matching a Notion filter, in query order"""
+        pages = [page for page in self.pages.values() if not page.get('archived') and self.matches(page, where)]
+
+        for sort in reversed(sorts or []):
+            if 'timestamp' in sort:
+                def key(page, timestamp=sort['timestamp']):
+                    return page.get(timestamp) or ''
+            else:
+                name = self.property_name(sort.get('property', ''))
+                if name is None:
+                    raise MockError(400, 'validation_error', f"Could not find sort property: {sort.get('property')}")
+
+                def key(page, name=name):
+                    value = plain_value(page['properties'].get(name))
+                    return (value is None, value if value is not None else '')
+            pages.sort(key=key, reverse=sort.get('direction') == 'descending')
+
+        return [page['id'] for page in pages]
+
+    def project(self, page, names):
+        """The page with only the named properties (filter_properties)"""
+        if names is None:
+            return page
+        return dict(page, properties={name: prop for name, prop in page['properties'].items() if name in names})
+
+    # === WRITES ===
+
+    def update_page(self, page_id, body):
+        page = self.pages[page_id]
+        properties = dict(page['properties'])
+
+        for key, value in (body.get('properties') or {}).items():
+            name = self.property_name(key)
+            if name is None:
+                raise MockError(400, 'validation_error', f"{key} is not a property that exists.")
+            spec = self.properties[name]
+            kind = spec['type']
+            if not isinstance(value, dict) or kind not in value:
+                raise MockError(400, 'validation_error',
+                                f"{name} is expected to be {kind}. Body: {json.dumps(value)}")
+            properties[name] = {"id": spec['id'], "type": kind, kind: read_value(kind, value[kind])}
+
+        # Pages are replaced, never changed in place, so a response being
+        # serialised on another thread never sees a half-applied write
+        page = dict(page, properties=properties, last_edited_time=edited_iso())
+        if 'archived' in body:
+            page['archived'] = bool(body['archived'])
+        self.pages[page_id] = page
+        return page
+
+    def update_schema(self, body):
+        for key, spec in (body.get('properties') or {}).items():
+            name = self.property_name(key)
+
+            if spec is None:
+                # Remove the property
+                if name is not None:
+                    del self.properties[name]
+                    self._rewrite_pages(lambda props: props.pop(name, None))
+                continue
+
+            kind = next((k for k in spec if k not in ('name', 'id', 'type')), None)
+            if name is None:
+                # Add it, empty on every page
+                if kind is None:
+                    raise MockError(400, 'validation_error', f"Property {key} needs a type.")
+                name = key
+                self.properties[name] = {"id": self._new_property_id(), "name": name, "type": kind, kind: spec[kind]}
+                empty = {"id": self.properties[name]['id'], "type": kind, kind: EMPTY_VALUES.get(kind)}
+                self._rewrite_pages(lambda props: props.setdefault(name, empty))
+            elif kind is not None:
+                self.properties[name].update({"type": kind, kind: spec[kind]})
+
+            new_name = spec.get('name')
+            if new_name and new_name != name:
+                self.properties[new_name] = dict(self.properties.pop(name), name=new_name)
+                self._rewrite_pages(lambda props: props.update({new_name: props.pop(name)}) if name in props else None)
+
+        if body.get('title'):
+            self.title = ''.join(item.get('text', {}).get('content', '') for item in body['title'])
+        self.last_edited_time = now_iso()
+        return self.to_notion()
+
+    def _rewrite_pages(self, change):
+        for page_id, page in self.pages.items():
+            properties = dict(page['properties'])
+            change(properties)
+            self.pages[page_id] = dict(page, properties=properties)
+
+
+class MockNotion:
+    """
+    In-memory Notion workspace answering API requests.
+
+    Args:
+        latency: Seconds added to every response
+        jitter: Up to this many more seconds, at random
+        rate: Sustained requests per second before 429s (None = unlimited)
+        burst: Requests allowed back-to-back on top of the rate
+        failure_rate: Share of requests answered with a 503
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, rate=None, burst=10, failure_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.limiter = RateLimiter(rate=rate, burst=burst) if rate else None
+
+        self.databases = {}
+        self.stats = Counter()
+
+        self._cursors = {}   # start_cursor -> (matching page ids, offset)
+        self._lock = threading.Lock()
+
+    def add_database(self, database_id, pages, **options):
+        """Create a database from raw page dicts; returns the MockDatabase"""
+        database = MockDatabase(database_id, pages, **options)
+        self.databases[database_id] = database
+        return database
+
+    def add_snapshot(self, path, database_id=None):
+        """Seed a database from a snapshot file (named <database id>.sqlite by default)"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        database_id = database_id or os.path.splitext(os.path.basename(path))[0]
+        with Snapshot(database_id, path=path) as snapshot:
+            return self.add_database(database_id, snapshot.pages())
+
+    def _database(self, database_id):
+        database = self.databases.get(database_id)
+        if database is None:
+            raise MockError(404, 'object_not_found', f"Could not find database with ID: {database_id}.")
+        return database
+
+    def _page(self, page_id):
+        for database in self.databases.values():
+            if page_id in database.pages:
+                return database
+        raise MockError(404, 'object_not_found', f"Could not find page with ID: {page_id}.")
+
+    # === REQUESTS ===
+
+    def handle(self, method, path, query=None, body=None, headers=None):
+        """
+        Answer one request.
+
+        Args:
+            path: Path below the API root, e.g. 'databases/<id>/query'
+            query: Parsed query string ({name: [values]})
+
+        Returns:
+            (status, extra headers, JSON body)
+        """
+        parts = [part for part in path.split('/') if part]
+        route = f"{method} {parts[0] if parts else ''}{'/query' if parts[-1:] == ['query'] else ''}"
+        self.stats['requests'] += 1
+        self.stats[route] += 1
+
+        wait = self.limiter.reserve() if self.limiter else 0
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        try:
+            if not (headers or {}).get('Authorization', '').startswith('Bearer '):
+                raise MockError(401, 'unauthorized', "API token is invalid.")
+            if wait:
+                self.stats['throttled'] += 1
+                error = MockError(429, 'rate_limited', "You have been rate limited. Please try again in a few minutes.")
+                return 429, {'Retry-After': f"{wait:.3f}"}, error.body()
+            if self.failure_rate and random.random() < self.failure_rate:
+                self.stats['failed'] += 1
+                raise MockError(503, 'service_unavailable', "Notion is unavailable, please try again later.")
+
+            with self._lock:
+                return 200, {}, self._route(method, parts, query or {}, body or {})
+        except MockError as e:
+            return e.status, {}, e.body()
+
+    def _route(self, method, parts, query, body):
+        if len(parts) == 3 and parts[0] == 'databases' and parts[2] == 'query' and method == 'POST':
+            return self._query(self._database(parts[1]), query, body)
+        if len(parts) == 2 and parts[0] == 'databases':
+            database = self._database(parts[1])
+            if method == 'GET':
+                return database.to_notion()
+            if method == 'PATCH':
+                return database.update_schema(body)
+        if len(parts) == 2 and parts[0] == 'pages':
+            database = self._page(parts[1])
+            if method == 'GET':
+                return database.pages[parts[1]]
+            if method == 'PATCH':
+                return database.update_page(parts[1], body)
+        raise MockError(400, 'invalid_request_url', f"Invalid request URL: {method} /{'/'.join(parts)}")
+
+    def _query(self, database, query, body):
+        page_size = body.get('page_size', MAX_PAGE_SIZE)
+        if not isinstance(page_size, int) or not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise MockError(400, 'validation_error', f"body.page_size should be between 1 and {MAX_PAGE_SIZE}.")
+
+        cursor = body.get('start_cursor')
+        if cursor:
+            # Like a database cursor, a query keeps the matches it started with
+            if cursor not in self._cursors:
+                raise MockError(400, 'validation_error', f"Invalid start_cursor: {cursor}")
+            ids, offset = self._cursors.pop(cursor)
+        else:
+            ids, offset = database.select(body.get('filter'), body.get('sorts')), 0
+
+        names = None
+        if 'filter_properties' in query:
+            names = {database.property_name(key) for key in query['filter_properties']}
+
+        batch = ids[offset:offset + page_size]
+        next_cursor = None
+        if offset + page_size < len(ids):
+            next_cursor = str(uuid.uuid4())
+            self._cursors[next_cursor] = (ids, offset + page_size)
+
+        return {
+            "object": "list",
+            "results": [database.project(database.pages[page_id], names) for page_id in batch],
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "type": "page_or_database",
+        }
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for a MockNotion (set as the server's `mock`)"""
+
+    protocol_version = 'HTTP/1.1'
+
+    # Headers and body go out in separate writes; with Nagle on, the body
+    # waits for the client's delayed ACK (~40 ms) on every kept-alive response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self):
+        url = urlsplit(self.path)
+        path = url.path
+        if path.startswith('/v1/'):
+            path = path[len('/v1/'):]
+
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length)) if length else {}
+        except ValueError:
+            status, headers, payload = 400, {}, MockError(400, 'invalid_json', "Error parsing JSON body.").body()
+        else:
+            status, headers, payload = self.server.mock.handle(
+                self.command, path, parse_qs(url.query), body, self.headers
+            )
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = _respond
+
+
+def start_server(mock, host='127.0.0.1', port=0):
+    """
+    Serve a MockNotion on a background thread.
+
+    Returns:
+        (server, base_url): call server.shutdown() to stop it; base_url is
+        the API root to give NotionClient or NOTION_API_URL
+    """
+    server = ThreadingHTTPServer((host, port), MockRequestHandler)
+    server.daemon_threads = True
+    server.mock = mock
+    threading.Thread(target=server.serve_forever, name='mock-notion', daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/v1"
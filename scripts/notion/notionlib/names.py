@@ -0,0 +1,190 @@
+"""
+Fuzzy matching of therapist names.
+
+Nothing in the scripts notices that "Jane Smith", "Dr Jane Smith" and
+"Smith, Jane (MAPS)" are the same person. Comparing every name with every
+other is quadratic, so NameIndex first puts each record into a few small
+blocks keyed by a phonetic code, and only scores pairs that share a block:
+
+    blocks     Soundex(surname) + first initial, and the reverse
+               (catching "Smith Jane"), e.g. ('S530', 'j') / ('J500', 's')
+    score      trigram similarity of the normalised names, 1.0 for equal
+               token sets, 0.85 for a matching surname and initial
+               ("J Smith" / "Jane Smith")
+
+Names are normalised before either step: accents folded, lowercased, and
+titles and credentials ("Dr", "Ms", "MAPS", "PhD", "Psychologist") dropped.
+
+Usage:
+    names = NameIndex()
+    for therapist in snapshot.rows(COLUMNS):
+        names.add(therapist)
+    for match in names.matches():
+        print(match.a.display_name, match.b.display_name, match.score)
+"""
+
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+
+# Words that aren't part of the name itself
+NAME_NOISE = {
+    'dr', 'doctor', 'mr', 'mrs', 'ms', 'miss', 'mx', 'prof', 'professor', 'assoc',
+    'phd', 'dpsych', 'mpsych', 'bpsych', 'ba', 'bsc', 'ma', 'msc', 'hons', 'maps', 'faps',
+    'mcop', 'mcclp', 'aprs', 'ahpra', 'psychologist', 'psychotherapist', 'counsellor',
+    'counselor', 'clinical', 'registered', 'provisional', 'social', 'worker',
+}
+
+NON_LETTERS = re.compile(r'[^a-z]+')
+
+# Blocks larger than this are too generic to be useful ("S530" + "j" in a
+# big directory) and are skipped rather than compared pairwise
+MAX_BLOCK_SIZE = 200
+
+# Pairs scoring at least this are reported
+MATCH_THRESHOLD = 0.8
+
+NameMatch = namedtuple('NameMatch', ['a', 'b', 'score'])
+
+SOUNDEX_CODES = {}
+for letters, digit in (('bfpv', '1'), ('cgjkqsxz', '2'), ('dt', '3'), ('l', '4'), ('mn', '5'), ('r', '6')):
+    SOUNDEX_CODES.update(dict.fromkeys(letters, digit))
+
+
+def name_tokens(name):
+    """
+    Normalised tokens of a name: accents folded, lowercase, titles and
+    credentials removed ("Dr Jane Smith-Jones, MAPS" -> ['jane', 'smith', 'jones'])
+    """
+    if not name:
+        return []
+    folded = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode().lower()
+    tokens = NON_LETTERS.sub(' ', folded.replace("'", '')).split()
+    # dict.fromkeys: drop repeats ("Jane Smith" title + "Smith" last name)
+    return list(dict.fromkeys(token for token in tokens if token not in NAME_NOISE))
+
+
+@lru_cache(maxsize=65536)
+def soundex(word):
+    """American Soundex code ("smith" -> "S530")"""
+    if not word:
+        return ''
+    code = word[0].upper()
+    last = SOUNDEX_CODES.get(word[0], '')
+    for char in word[1:]:
+        digit = SOUNDEX_CODES.get(char, '')
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in 'hw':
+            last = digit
+    return code.ljust(4, '0')
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NormalizedName:
+    """A name's tokens, token set and trigrams, computed once"""
+
+    __slots__ = ('tokens', 'token_set', 'grams')
+
+    def __init__(self, name):
+        self.tokens = name_tokens(name)
+        self.token_set = frozenset(self.tokens)
+        self.grams = trigrams(' '.join(sorted(self.tokens)))
+
+    def __bool__(self):
+        return bool(self.tokens)
+
+
+def name_similarity(a, b):
+    """
+    Similarity of two NormalizedNames, 0.0 - 1.0.
+
+    Equal token sets (any order) score 1.0; the same surname with a matching
+    first initial ("j smith" / "jane smith") scores 0.85; otherwise the
+    trigram Jaccard similarity of the sorted names.
+    """
+    if not a or not b:
+        return 0.0
+    if a.token_set == b.token_set:
+        return 1.0
+    first_a, first_b = a.tokens[0], b.tokens[0]
+    if a.tokens[-1] == b.tokens[-1] and first_a[0] == first_b[0] and (len(first_a) == 1 or len(first_b) == 1):
+        return 0.85
+    return len(a.grams & b.grams) / len(a.grams | b.grams)
+
+
+def blocking_keys(tokens):
+    """Phonetic block keys for a token list (see module docstring)"""
+    if not tokens:
+        return ()
+    first, last = tokens[0], tokens[-1]
+    if len(tokens) == 1:
+        return ((soundex(first), ''),)
+    return ((soundex(last), first[0]), (soundex(first), last[0]))
+
+
+class NameIndex:
+    """
+    Blocking index over record names.
+
+    Args:
+        name: Function returning the name to match for a record
+              (default: TherapistRecord.full_name)
+    """
+
+    def __init__(self, name=lambda record: record.full_name):
+        self.name = name
+        self.records = []
+        self.names = []
+        self._blocks = defaultdict(list)
+        self.skipped_blocks = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, record):
+        name = NormalizedName(self.name(record))
+        if not name:
+            return
+        i = len(self.records)
+        self.records.append(record)
+        self.names.append(name)
+        for key in blocking_keys(name.tokens):
+            self._blocks[key].append(i)
+
+    def matches(self, threshold=MATCH_THRESHOLD):
+        """
+        Candidate duplicate pairs scoring at least `threshold`.
+
+        Returns:
+            list of NameMatch(a, b, score), best first
+        """
+        names = self.names
+        seen = set()
+        found = []
+        self.skipped_blocks = 0
+
+        for members in self._blocks.values():
+            if len(members) < 2:
+                continue
+            if len(members) > MAX_BLOCK_SIZE:
+                self.skipped_blocks += 1
+                continue
+            for x, i in enumerate(members):
+                for j in members[x + 1:]:
+                    if (i, j) in seen:
+                        continue
+                    seen.add((i, j))
+                    score = name_similarity(names[i], names[j])
+                    if score >= threshold:
+                        found.append(NameMatch(self.records[i], self.records[j], round(score, 2)))
+
+        found.sort(key=lambda match: match.score, reverse=True)
+        return found
@@ -0,0 +1,72 @@
+"""
+Process-pool stage for CPU-bound interpretation.
+
+Interpreting "Other contacts" text (tokenising, regexes, platform rules) is
+pure Python, so threads don't help and a big directory import (tens of
+thousands of rows) is parsed on one core. map_in_processes() sends the
+inputs to a pool of worker processes in chunks and hands the results back
+in input order, as they arrive, so the main thread keeps building the plan
+while the workers parse the next chunks:
+
+    texts = [therapist.other_contacts for therapist in rows]
+    contexts = [row_context(therapist) for therapist in rows]
+    for therapist, interpreted in zip(rows, map_in_processes(interpret, texts, contexts, workers=4)):
+        fix(therapist, plan, interpreted)
+
+The function must be picklable (defined at module level in the script or in
+notionlib), and so must its arguments and results. Chunks amortise the
+pickling; with workers=1, or fewer rows than one chunk, everything runs
+inline with no pool at all.
+
+Workers are always forked, whatever the platform's default start method:
+the interpreters live in the running script (__main__, or a module loaded
+with notionlib.cli.load_script()), which a spawned worker can't import.
+Where fork isn't available (Windows) --workers falls back to inline.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Rows sent to a worker per round trip
+DEFAULT_CHUNK_SIZE = 512
+
+# Workers inherit the parent's modules instead of re-importing them
+START_METHOD = 'fork'
+
+
+def resolve_workers(workers):
+    """
+    Worker count for a --workers value: 0 means one per CPU core. Always 1
+    where worker processes can't be forked.
+    """
+    if workers != 1 and START_METHOD not in multiprocessing.get_all_start_methods():
+        print(f"⚠️  --workers needs the '{START_METHOD}' start method, which this platform lacks - "
+              f"interpreting in this process")
+        return 1
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def map_in_processes(func, *iterables, workers=1, chunksize=DEFAULT_CHUNK_SIZE):
+    """
+    Yield func(*args) for each set of arguments, in order.
+
+    Args:
+        func: Module-level function to run in the workers
+        iterables: Argument lists, as for map()
+        workers: Worker processes (1 = run inline; 0 = one per core)
+        chunksize: Rows per task sent to a worker
+    """
+    workers = resolve_workers(workers)
+    columns = [list(iterable) for iterable in iterables]
+    rows = min((len(column) for column in columns), default=0)
+
+    if workers <= 1 or rows <= chunksize:
+        yield from map(func, *columns)
+        return
+
+    context = multiprocessing.get_context(START_METHOD)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        yield from pool.map(func, *columns, chunksize=chunksize)
@@ -0,0 +1,123 @@
+"""
+Australian phone number normalisation and formatting.
+
+find-duplicate-phones.py and fix-duplicate-phones.py each carried their own
+normalize_phone()/format_australian_phone() pair, run per row, with a
+recursive call for +61 numbers. Here a raw string is parsed once into a Phone
+(compact digits, national form, display format, kind) and the result is
+cached, so a column with thousands of rows but far fewer distinct values costs
+one parse per distinct value:
+
+    phones = parse_phones(therapist.phone for therapist in rows)
+    if same_number(phones[0], parse_phone("+61 3 9087 8379")):
+        ...
+
+Formats:
+    mobile       04XX XXX XXX
+    landline     (0X) XXXX XXXX
+    local_rate   1300 XXX XXX / 1800 XXX XXX
+
+Numbers that fit none of these keep their raw text.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Shortest digit run treated as a phone number (8-digit local landline)
+MIN_DIGITS = 8
+
+# Australian phone shapes in free text, in order of preference
+# (used by notionlib.extract to rank number tokens)
+PHONE_SHAPES = [
+    re.compile(r'\+?61\s?[2-478]\s?\d{4}\s?\d{4}'),   # International
+    re.compile(r'\(0\d\)\s?\d{4}\s?\d{4}'),           # (0X) XXXX XXXX
+    re.compile(r'0[2-478]\d{8}'),                      # 0XXXXXXXXX
+    re.compile(r'04\d{2}\s?\d{3}\s?\d{3}'),           # Mobile
+    re.compile(r'1[38]00\s?\d{3}\s?\d{3}'),           # 1300/1800
+]
+
+# Characters dropped when comparing numbers
+PUNCTUATION = re.compile(r'[\s()\-+]')
+
+Phone = namedtuple('Phone', ['raw', 'compact', 'national', 'formatted', 'kind'])
+Phone.__doc__ = """
+A parsed phone value.
+
+raw        the text as given
+compact    raw without spaces, brackets, dashes and '+'
+national   compact with a leading 61 replaced by 0 ("61390878379" -> "0390878379")
+formatted  display format, or raw when the number has no known shape
+kind       'mobile', 'landline', 'local_rate', or None
+"""
+
+EMPTY = Phone('', '', '', '', None)
+
+
+@lru_cache(maxsize=65536)
+def parse_phone(raw):
+    """
+    Parse one raw phone string (cached per distinct string).
+
+    Returns:
+        Phone; EMPTY for "" / None
+    """
+    if not raw:
+        return EMPTY
+
+    raw = str(raw)
+    compact = PUNCTUATION.sub('', raw)
+    national = compact
+    if compact.startswith('61') and len(compact) >= 11:
+        # "+61 3 ..." and "+61 (0) 3 ..." both become "03 ..."
+        national = compact[2:] if compact[2] == '0' else '0' + compact[2:]
+
+    formatted, kind = raw, None
+    if len(national) == 10:
+        if national.startswith('04'):
+            formatted, kind = f"{national[:4]} {national[4:7]} {national[7:]}", 'mobile'
+        elif national[0] == '0' and national[1] in '23578':
+            formatted, kind = f"({national[:2]}) {national[2:6]} {national[6:]}", 'landline'
+        elif national[0] == '1':
+            formatted, kind = f"{national[:4]} {national[4:7]} {national[7:]}", 'local_rate'
+
+    return Phone(raw, compact, national, formatted, kind)
+
+
+def parse_phones(values):
+    """
+    Parse a whole column (or list of extracted numbers) in one batch.
+
+    Each distinct value is parsed once, however often it repeats.
+
+    Returns:
+        list of Phone, in the order of `values`
+    """
+    values = list(values)
+    parsed = {raw: parse_phone(raw) for raw in set(values)}
+    return [parsed[raw] for raw in values]
+
+
+def normalize_phone(phone):
+    """Phone number without spaces, brackets, dashes or '+', for comparison"""
+    return parse_phone(phone).compact
+
+
+def format_phone(phone):
+    """Consistent Australian display format, or the value unchanged if it has no known shape"""
+    return parse_phone(phone).formatted
+
+
+def same_number(a, b):
+    """
+    Whether two parsed phones are the same number.
+
+    +61 and 0-prefixed forms compare equal, and a number missing its area
+    code matches the full number it ends ("9087 8379" vs "(03) 9087 8379").
+    """
+    if a.national == b.national:
+        return True
+    if not a.national or not b.national:
+        return False
+    shorter, longer = sorted((a.national, b.national), key=len)
+    return len(shorter) >= MIN_DIGITS and longer.endswith(shorter)
@@ -0,0 +1,174 @@
+"""
+Write plans: diff proposed values against the snapshot before PATCHing.
+
+The cleanup scripts used to build an `updates` payload per row and always
+send it, even when Notion already held the same value (fix-duplicate-phones.py
+rewriting an already formatted Phone, say). A WritePlan takes plain values
+instead, compares each one with the record it came from, and keeps only the
+columns that actually change. Changes from several fixers to the same page are
+coalesced into a single PATCH.
+
+Fixers chained over the same records (run-maintenance.py) see each other's
+pending values through view(); the plan keeps comparing against what Notion
+holds, so a later fixer putting a value back cancels the earlier change.
+
+Usage:
+    plan = WritePlan()
+    for therapist in snapshot.rows(COLUMNS, WHERE):
+        plan.update(therapist, {PHONE: formatted, OTHER_CONTACTS: ""})
+
+    plan.report()
+    with WriteExecutor(client, on_result=print_write_result, snapshot=snapshot) as writer:
+        plan.apply(writer)
+
+A plan can also be saved instead of applied (the fixers' --plan mode): save()
+writes one JSON object per changed page, with plain (unencoded) values:
+
+    {"page_id": "...", "label": "Jane Smith", "last_edited_time": "...",
+     "changes": {"Phone": "(03) 9087 8379", "Other contact details, ...": ""}}
+
+load_plan() reads such a file back.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+from notionlib.columns import COLUMN_TYPES
+from notionlib.properties import encode_property
+
+PageChange = namedtuple('PageChange', ['page_id', 'label', 'changes', 'last_edited_time'])
+
+
+def _comparable(value):
+    """Normalise a plain value so decoded and proposed values compare equal"""
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ', '.join(value)
+    return value
+
+
+class WritePlan:
+    """
+    Pending property changes, per page.
+
+    Records passed in need page_id, display_name, has(column) and get(column)
+    (see TherapistRecord). A column the record didn't read can't be compared,
+    so a change to it is always kept.
+
+    Args:
+        column_types: Column name -> Notion property type, used to encode
+                      values for the PATCH
+    """
+
+    def __init__(self, column_types=COLUMN_TYPES):
+        self.column_types = column_types
+        self._pages = {}
+
+        self.proposed = 0
+        self.unchanged = 0
+
+    def __len__(self):
+        return len(self._pages)
+
+    def __iter__(self):
+        for page_id, (label, changes, last_edited_time, _) in self._pages.items():
+            yield PageChange(page_id, label, changes, last_edited_time)
+
+    @property
+    def changes(self):
+        """Total number of property values that will be written"""
+        return sum(len(entry[1]) for entry in self._pages.values())
+
+    def set(self, record, column, value, label=None):
+        """
+        Propose one column value for a record's page.
+
+        Args:
+            label: Name reported for the page (default: record.display_name)
+
+        Returns:
+            True if it differs from the current value and will be written
+        """
+        self.proposed += 1
+        entry = self._pages.get(record.page_id)
+
+        # Compare with the value Notion holds, even when `record` is a view
+        # that already shows an earlier pending change
+        if entry and column in entry[1]:
+            known = column in entry[3]
+            current = entry[3].get(column)
+        else:
+            known = record.has(column)
+            current = record.get(column) if known else None
+
+        if known and _comparable(current) == _comparable(value):
+            self.unchanged += 1
+            # A later fixer putting the value back cancels an earlier change
+            if entry and column in entry[1]:
+                del entry[1][column]
+                entry[3].pop(column, None)
+                if not entry[1]:
+                    del self._pages[record.page_id]
+            return False
+
+        if entry is None:
+            entry = self._pages[record.page_id] = (label or record.display_name, {}, record.last_edited_time, {})
+        if known and column not in entry[1]:
+            entry[3][column] = current
+        entry[1][column] = value
+        return True
+
+    def update(self, record, values, label=None):
+        """
+        Propose several column values for a record's page (see set()).
+
+        Returns:
+            dict of the columns (and values) that will actually be written
+        """
+        return {column: value for column, value in values.items() if self.set(record, column, value, label)}
+
+    def view(self, record):
+        """The record as it will be once this plan's changes to it are written"""
+        entry = self._pages.get(record.page_id)
+        return record.updated(entry[1]) if entry else record
+
+    def properties(self, changes):
+        """PATCH payload for a page's changes"""
+        return {
+            column: encode_property(self.column_types[column], value)
+            for column, value in changes.items()
+        }
+
+    def report(self):
+        print(f"📋 Write plan: {len(self)} pages, {self.changes} property changes")
+        if self.unchanged:
+            print(f"   Skipped {self.unchanged} values Notion already has")
+        print()
+
+    def apply(self, writer):
+        """Submit one PATCH per changed page to a WriteExecutor"""
+        for page_id, (label, changes, _, _) in self._pages.items():
+            writer.submit(page_id, self.properties(changes), label=label)
+        return len(self._pages)
+
+    def save(self, path):
+        """Write the plan as JSONL (one changed page per line)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for change in self:
+                f.write(json.dumps(change._asdict(), ensure_ascii=False) + '\n')
+        return len(self._pages)
+
+
+def load_plan(path):
+    """Read a plan saved by WritePlan.save(), yielding PageChanges"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield PageChange(entry['page_id'], entry.get('label', ''), entry['changes'],
+                                 entry.get('last_edited_time'))
@@ -0,0 +1,172 @@
+"""
+Registry of social platforms the "Other contacts" cleanup knows about.
+
+Each PlatformRule describes one platform once: the words that name it, the
+domains its links live on, what a handle looks like, how to build the
+canonical value for its Notion column, and which column that is. The
+extraction engine (notionlib.extract) reads KEYWORDS and DOMAINS, the lookup
+tables compiled from the registered rules, so classifying a token costs one
+dict lookup however many platforms are registered.
+
+Adding a platform:
+    register(PlatformRule(
+        'threads',
+        keywords=('threads',),
+        domains=('threads.net',),
+        profile_url='https://threads.net/@{handle}',
+    ))
+"""
+
+import re
+
+from notionlib.columns import FACEBOOK, INSTAGRAM, LINKEDIN, TWITTER
+
+# Compiled lookup tables, updated in place by register()
+KEYWORDS = {}   # lowercase word -> platform name
+DOMAINS = {}    # registered domain -> platform name
+PLATFORMS = {}  # platform name -> PlatformRule, in registration order
+
+
+class PlatformRule:
+    """
+    How to recognise one platform and what to write for it.
+
+    Args:
+        name: Platform name; also the key used in the interpreters' result
+              dicts and `existing_<name>` context entries
+        label: Name shown in reports ("LinkedIn")
+        icon: Emoji shown next to extracted values
+        keywords: Lowercase words that name the platform ("ig", "insta")
+        domains: Domains its links live on (subdomains match too)
+        handle_chars: Characters a handle may contain; values found in free
+                      text are cut to the leading match
+        profile_url: Format string for a canonical profile URL from {handle}
+        column: Notion column the value belongs in (None: no column, the
+                scripts put such links in Admin Notes)
+        column_format: Format string for the column value (default: the
+                       profile URL)
+        path_prefix: Path segment before the handle in profile links
+                     ('in' for linkedin.com/in/<handle>)
+        reserved: First path segments that are never a handle
+                  (facebook.com/pages/..., facebook.com/profile.php)
+    """
+
+    __slots__ = ('name', 'label', 'icon', 'keywords', 'domains', 'handle_chars', 'profile_url',
+                 'column', 'column_format', 'path_prefix', 'reserved')
+
+    def __init__(self, name, keywords, domains, label=None, icon='🔗', handle_chars=r'[a-z0-9_.]+',
+                 profile_url=None, column=None, column_format=None, path_prefix=None, reserved=()):
+        self.name = name
+        self.label = label or name.title()
+        self.icon = icon
+        self.keywords = tuple(keywords)
+        self.domains = tuple(domains)
+        self.handle_chars = re.compile(handle_chars)
+        self.profile_url = profile_url
+        self.column = column
+        self.column_format = column_format or profile_url
+        self.path_prefix = path_prefix
+        self.reserved = frozenset(reserved)
+
+    def url(self, handle):
+        """Canonical profile URL for a handle"""
+        return self.profile_url.format(handle=handle)
+
+    def value(self, handle):
+        """What to store in the platform's column for a handle"""
+        return self.column_format.format(handle=handle)
+
+    def handle_from_link(self, token):
+        """
+        Handle from a url/domain token pointing at this platform, or None
+        when the link isn't a plain profile (a LinkedIn company page, a
+        Facebook profile.php?id= link, ...).
+        """
+        segments = token.segments
+        if self.path_prefix:
+            if len(segments) < 2 or segments[0].lower() != self.path_prefix:
+                return None
+            segments = segments[1:]
+        if len(segments) != 1 or segments[0].lower() in self.reserved:
+            return None
+        match = self.handle_chars.fullmatch(segments[0].lstrip('@').lower())
+        return match.group(0) if match else None
+
+    def value_from_link(self, token):
+        """
+        Column value for a link: canonical when it's a plain profile, else
+        the link as given. None for a bare domain ("facebook.com").
+        """
+        handle = self.handle_from_link(token)
+        if handle:
+            return self.value(handle)
+        if not token.segments:
+            return None
+        return token.text if token.kind == 'url' else f"https://{token.text}"
+
+    def __repr__(self):
+        return f"PlatformRule({self.name!r})"
+
+
+def register(rule):
+    """Add (or replace) a platform and recompile the lookup tables"""
+    PLATFORMS[rule.name] = rule
+    KEYWORDS.clear()
+    DOMAINS.clear()
+    for registered in PLATFORMS.values():
+        KEYWORDS.update((keyword, registered.name) for keyword in registered.keywords)
+        DOMAINS.update((domain, registered.name) for domain in registered.domains)
+    return rule
+
+
+def social_platforms():
+    """Registered platforms that have a Notion column, in registration order"""
+    return [rule for rule in PLATFORMS.values() if rule.column]
+
+
+register(PlatformRule(
+    'instagram',
+    icon='📸',
+    keywords=('instagram', 'insta', 'ig'),
+    domains=('instagram.com', 'instagr.am'),
+    profile_url='https://instagram.com/{handle}',
+    column=INSTAGRAM,
+    column_format='@{handle}',
+))
+register(PlatformRule(
+    'facebook',
+    icon='👥',
+    keywords=('facebook', 'fb', 'fbk'),
+    domains=('facebook.com', 'fb.com', 'fb.me'),
+    profile_url='https://facebook.com/{handle}',
+    column=FACEBOOK,
+    reserved=('profile.php', 'pages', 'pg', 'groups', 'people', 'events', 'sharer.php'),
+))
+register(PlatformRule(
+    'twitter',
+    icon='🐦',
+    keywords=('twitter', 'x'),
+    domains=('twitter.com', 'x.com'),
+    handle_chars=r'[a-z0-9_]+',
+    profile_url='https://twitter.com/{handle}',
+    column=TWITTER,
+))
+register(PlatformRule(
+    'linkedin',
+    label='LinkedIn',
+    icon='💼',
+    keywords=('linkedin',),
+    domains=('linkedin.com',),
+    handle_chars=r'[a-z0-9-]+',
+    profile_url='https://linkedin.com/in/{handle}',
+    column=LINKEDIN,
+    path_prefix='in',
+))
+register(PlatformRule(
+    'tiktok',
+    label='TikTok',
+    icon='🎵',
+    keywords=('tiktok',),
+    domains=('tiktok.com',),
+    profile_url='https://tiktok.com/@{handle}',
+))
@@ -0,0 +1,107 @@
+"""
+Column projection: fetch and decode only the properties a script uses.
+
+The therapists database is wide (see show-column-names.py) and every query
+returns every property payload. A script declares its columns once:
+
+    COLUMNS = Projection([FIRST_NAME, LAST_NAME, PHONE, OTHER_CONTACTS])
+
+and then:
+  - live queries send filter_properties, so Notion only returns those columns
+  - snapshot reads pull just those properties out of the stored JSON in SQLite
+  - each page is decoded once into a compact Row (or TherapistRecord)
+"""
+
+from urllib.parse import quote, unquote
+
+from notionlib.properties import DECODERS
+
+
+class Row:
+    """
+    Decoded view of one page: id, last_edited_time and the projected columns.
+
+    Values are held in a tuple indexed through the projection's shared column
+    map, so a row costs a few slots rather than a dict of raw property JSON.
+    """
+
+    __slots__ = ('id', 'last_edited_time', '_values', '_index')
+
+    def __init__(self, page_id, last_edited_time, values, index):
+        self.id = page_id
+        self.last_edited_time = last_edited_time
+        self._values = values
+        self._index = index
+
+    def __getitem__(self, column):
+        return self._values[self._index[column]]
+
+    def get(self, column, default=""):
+        i = self._index.get(column)
+        return self._values[i] if i is not None else default
+
+    def __repr__(self):
+        fields = ', '.join(f"{c}={self[c]!r}" for c in self._index)
+        return f"Row({self.id}, {fields})"
+
+
+class Projection:
+    """
+    The set of columns a script reads.
+
+    Args:
+        columns: Column names to fetch and decode
+        factory: Called as factory(page_id, last_edited_time, values, index)
+                 to build each decoded row (default: Row)
+    """
+
+    def __init__(self, columns, factory=Row):
+        self.columns = tuple(dict.fromkeys(columns))
+        self.factory = factory
+        self.index = {column: i for i, column in enumerate(self.columns)}
+        self._property_ids = {}
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def property_ids(self, client, database_id):
+        """Resolve column names to Notion property IDs (one schema GET per database)"""
+        if database_id not in self._property_ids:
+            schema = client.get_database(database_id).get('properties', {})
+            self._property_ids[database_id] = [
+                schema[column]['id'] for column in self.columns if column in schema
+            ]
+        return self._property_ids[database_id]
+
+    def query_params(self, client, database_id):
+        """
+        filter_properties query string for databases/{id}/query.
+
+        Property IDs come back from the API already percent-encoded (e.g.
+        "%3AUPp"), so they are normalised here and the string is passed to
+        requests pre-encoded to avoid double encoding.
+        """
+        ids = self.property_ids(client, database_id)
+        return '&'.join(f"filter_properties={quote(unquote(pid), safe='')}" for pid in ids)
+
+    def decode(self, page):
+        """Build a Row from a full (or already projected) page dict"""
+        props = page.get('properties', {})
+        return self.decode_properties(
+            page.get('id'),
+            page.get('last_edited_time'),
+            [props.get(column) for column in self.columns]
+        )
+
+    def decode_properties(self, page_id, last_edited_time, props):
+        """Build a Row from per-column property dicts (as read from the snapshot)"""
+        decoders = DECODERS
+        values = []
+        for prop in props:
+            if prop:
+                prop_type = prop.get('type')
+                decoder = decoders.get(prop_type)
+                values.append(decoder(prop.get(prop_type)) if decoder else "")
+            else:
+                values.append("")
+        return self.factory(page_id, last_edited_time, tuple(values), self.index)
@@ -0,0 +1,196 @@
+"""
+Decoding and encoding of Notion property values.
+
+Each property type has one small decoder in DECODERS, looked up by the
+payload's `type`, so every script gets the same plain value for a column:
+
+    text types (title, rich_text)   -> all fragments concatenated, "" if empty
+    url / email / phone_number      -> the string, "" if unset
+    number                          -> int/float or None
+    checkbox                        -> bool
+    select / status                 -> option name, "" if unset
+    multi_select / people / files   -> names joined with ", "
+    date                            -> start date, "" if unset
+    formula / rollup                -> decoded according to their result type
+
+Unknown or missing properties decode to "".
+
+Use decode_properties() to decode a whole page's properties (or a subset of
+columns) in one pass. encode_property() goes the other way, building the
+payload a page PATCH expects from a plain value.
+"""
+
+# Notion rejects rich_text/title fragments longer than this
+MAX_TEXT_LENGTH = 2000
+
+
+def _text(items):
+    if not items:
+        return ""
+    if len(items) == 1:
+        return items[0].get('plain_text', '')
+    return ''.join(item.get('plain_text', '') for item in items)
+
+
+def _string(value):
+    return value or ""
+
+
+def _name(option):
+    return option.get('name', '') if option else ""
+
+
+def _names(options):
+    return ', '.join(option.get('name', '') for option in options or [])
+
+
+def _date(date):
+    return date.get('start', '') if date else ""
+
+
+def _user(user):
+    return (user.get('name') or user.get('id', '')) if user else ""
+
+
+def _formula(formula):
+    if not formula:
+        return ""
+    result_type = formula.get('type')
+    value = formula.get(result_type)
+    return _date(value) if result_type == 'date' else value
+
+
+def _rollup(rollup):
+    if not rollup:
+        return ""
+    result_type = rollup.get('type')
+    if result_type == 'array':
+        values = (get_property_value(item) for item in rollup.get('array') or [])
+        return ', '.join(str(value) for value in values if value not in ("", None))
+    value = rollup.get(result_type)
+    return _date(value) if result_type == 'date' else value
+
+
+def _unique_id(unique_id):
+    if not unique_id:
+        return ""
+    prefix = unique_id.get('prefix')
+    number = unique_id.get('number')
+    return f"{prefix}-{number}" if prefix else number
+
+
+# Property type -> decoder for the value stored under prop[type]
+DECODERS = {
+    'title': _text,
+    'rich_text': _text,
+    'url': _string,
+    'email': _string,
+    'phone_number': _string,
+    'number': lambda value: value,
+    'checkbox': bool,
+    'select': _name,
+    'status': _name,
+    'multi_select': _names,
+    'people': lambda people: ', '.join(_user(person) for person in people or []),
+    'files': _names,
+    'relation': lambda relations: ', '.join(r.get('id', '') for r in relations or []),
+    'date': _date,
+    'formula': _formula,
+    'rollup': _rollup,
+    'created_time': _string,
+    'last_edited_time': _string,
+    'created_by': _user,
+    'last_edited_by': _user,
+    'unique_id': _unique_id,
+    'verification': lambda verification: verification.get('state', '') if verification else "",
+}
+
+
+def get_property_value(prop):
+    """Extract the plain value from a Notion property payload"""
+    if not prop:
+        return ""
+
+    prop_type = prop.get('type')
+    decoder = DECODERS.get(prop_type)
+    if decoder is None:
+        return ""
+    return decoder(prop.get(prop_type))
+
+
+def decode_properties(properties, columns=None):
+    """
+    Decode a page's properties dict in one pass.
+
+    Args:
+        properties: page['properties']
+        columns: Only decode these columns (missing ones decode to "");
+                 all columns by default
+
+    Returns:
+        dict of column name -> plain value
+    """
+    decoders = DECODERS
+    decoded = {}
+
+    if columns is None:
+        items = properties.items()
+    else:
+        items = ((column, properties.get(column)) for column in columns)
+
+    for column, prop in items:
+        if prop:
+            prop_type = prop.get('type')
+            decoder = decoders.get(prop_type)
+            decoded[column] = decoder(prop.get(prop_type)) if decoder else ""
+        else:
+            decoded[column] = ""
+
+    return decoded
+
+
+# === ENCODING ===
+
+def _encode_text(value):
+    if not value:
+        return []
+    value = str(value)
+    return [
+        {'text': {'content': value[i:i + MAX_TEXT_LENGTH]}}
+        for i in range(0, len(value), MAX_TEXT_LENGTH)
+    ]
+
+
+def _encode_options(value):
+    if isinstance(value, str):
+        value = [name.strip() for name in value.split(',')]
+    return [{'name': name} for name in value or [] if name]
+
+
+# Property type -> encoder producing the value stored under payload[type]
+ENCODERS = {
+    'title': _encode_text,
+    'rich_text': _encode_text,
+    'url': lambda value: value or None,
+    'email': lambda value: value or None,
+    'phone_number': lambda value: value or None,
+    'number': lambda value: value,
+    'checkbox': bool,
+    'select': lambda value: {'name': value} if value else None,
+    'status': lambda value: {'name': value} if value else None,
+    'multi_select': _encode_options,
+    'date': lambda value: {'start': value} if value else None,
+}
+
+
+def encode_property(prop_type, value):
+    """
+    Build a PATCH payload for one property from a plain value.
+
+    Empty values ("" / None) clear the property. Long text is split into
+    2000-character fragments.
+    """
+    encoder = ENCODERS.get(prop_type)
+    if encoder is None:
+        raise ValueError(f"Can't write {prop_type} properties")
+    return {prop_type: encoder(value)}
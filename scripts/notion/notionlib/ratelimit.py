@@ -0,0 +1,105 @@
+"""
+Adaptive token-bucket rate limiter for the Notion API.
+
+Notion allows an average of about three requests per second per integration.
+The scripts used to sleep a fixed 0.334s *after* each PATCH, on top of the
+request latency, so a 300ms round trip halved real throughput. The bucket
+below meters request *starts* instead: a request only waits if the budget is
+actually spent, so throughput sits close to the limit regardless of latency.
+
+On a 429 the limiter honours Retry-After by pausing every caller until it
+has passed, and halves the rate; successful requests then creep the rate back
+up towards the configured ceiling (additive increase, multiplicative decrease).
+"""
+
+import threading
+import time
+
+DEFAULT_RATE = 3.0
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by every request a client makes.
+
+    Args:
+        rate: Requests per second to aim for (and never exceed)
+        burst: Maximum number of requests that may start back-to-back
+        min_rate: Floor the rate is never reduced below after 429s
+        recovery: Requests per second added back after each success
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=3, min_rate=0.5, recovery=0.05):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = burst
+        self.min_rate = min_rate
+        self.recovery = recovery
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """
+        Take a token if one is available.
+
+        Returns:
+            0 if the request may be sent now, otherwise the seconds to wait
+            before trying again (acquire() and the asyncio limiter in
+            notionlib.aio both loop on this)
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            if now < self._blocked_until:
+                return self._blocked_until - now
+
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            wait = self.reserve()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def on_success(self):
+        """Record a successful request and recover towards the full rate"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.recovery)
+
+    def on_throttle(self, retry_after=None):
+        """
+        Record a 429. Everyone waits out Retry-After (or one request interval
+        if the header is missing) and the sustained rate is halved.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self._blocked_until = max(self._blocked_until, now + pause)
+            self._tokens = 0.0
+            self._updated = now + pause
+
+
+def parse_retry_after(value):
+    """Retry-After in seconds, or None if missing/unparseable"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
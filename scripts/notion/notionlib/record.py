@@ -0,0 +1,160 @@
+"""
+TherapistRecord: one therapist row, decoded once and shared by every script.
+
+Scripts used to pull First Name / Last Name / Fullname out of each page and
+rebuild the display name with their own copy of the same if/elif chain. A
+record is built straight from the snapshot read:
+
+    COLUMNS = TherapistRecord.projection([PHONE, OTHER_CONTACTS])
+    for therapist in snapshot.rows(COLUMNS, WHERE):
+        print(therapist.display_name, therapist.phone)
+
+Fields whose column isn't in the projection keep their empty default, so a
+record only costs the slots below, whatever the script reads.
+"""
+
+from notionlib.columns import (
+    ADMIN_NOTES,
+    BULK_BILLING,
+    BUSINESS_NAME,
+    EMAIL,
+    FACEBOOK,
+    FIRST_NAME,
+    FULLNAME,
+    INSTAGRAM,
+    LAST_NAME,
+    LINKEDIN,
+    OTHER_CONTACTS,
+    PHONE,
+    PRICE_TIER,
+    REBATES,
+    SESSION_FEE,
+    TWITTER,
+    WEBSITE,
+)
+from notionlib.projection import Projection
+from notionlib.properties import decode_properties
+
+# (attribute, column, default when the column isn't projected)
+FIELDS = (
+    ('first_name', FIRST_NAME, ""),
+    ('last_name', LAST_NAME, ""),
+    ('fullname', FULLNAME, ""),
+    ('business_name', BUSINESS_NAME, ""),
+    ('email', EMAIL, ""),
+    ('phone', PHONE, ""),
+    ('website', WEBSITE, ""),
+    ('other_contacts', OTHER_CONTACTS, ""),
+    ('instagram', INSTAGRAM, ""),
+    ('facebook', FACEBOOK, ""),
+    ('twitter', TWITTER, ""),
+    ('linkedin', LINKEDIN, ""),
+    ('session_fee', SESSION_FEE, None),
+    ('bulk_billing', BULK_BILLING, False),
+    ('rebates', REBATES, ""),
+    ('price_tier', PRICE_TIER, ""),
+    ('admin_notes', ADMIN_NOTES, ""),
+)
+
+# Column -> attribute, for reading a record by column name
+ATTRIBUTES = {column: attr for attr, column, _ in FIELDS}
+
+# Columns every therapist projection includes (display_name needs them)
+NAME_COLUMNS = (FIRST_NAME, LAST_NAME, FULLNAME)
+
+
+class TherapistRecord:
+    """Decoded therapist page"""
+
+    __slots__ = ('page_id', 'last_edited_time', '_loaded') + tuple(attr for attr, _, _ in FIELDS)
+
+    def __init__(self, page_id, last_edited_time=None, **fields):
+        self.page_id = page_id
+        self.last_edited_time = last_edited_time
+        self._loaded = frozenset(column for column, attr in ATTRIBUTES.items() if attr in fields)
+        for attr, _, default in FIELDS:
+            setattr(self, attr, fields.pop(attr, default))
+        if fields:
+            raise TypeError(f"Unknown TherapistRecord fields: {', '.join(fields)}")
+
+    @classmethod
+    def projection(cls, columns=()):
+        """Projection of the name columns plus `columns` that yields records"""
+        return Projection(NAME_COLUMNS + tuple(columns), factory=cls.from_values)
+
+    @classmethod
+    def from_values(cls, page_id, last_edited_time, values, index):
+        """Build a record from a projection's decoded values (Projection factory)"""
+        record = cls.__new__(cls)
+        record.page_id = page_id
+        record.last_edited_time = last_edited_time
+        record._loaded = index
+        for attr, column, default in FIELDS:
+            i = index.get(column)
+            setattr(record, attr, values[i] if i is not None else default)
+        return record
+
+    @classmethod
+    def from_page(cls, page):
+        """Build a record from a raw Notion page dict"""
+        props = page.get('properties', {})
+        decoded = decode_properties(props, [column for _, column, _ in FIELDS if column in props])
+        return cls(
+            page.get('id'),
+            page.get('last_edited_time'),
+            **{attr: decoded[column] for attr, column, _ in FIELDS if column in decoded}
+        )
+
+    def has(self, column):
+        """Whether `column` was actually read (rather than left at its default)"""
+        return column in self._loaded
+
+    def get(self, column):
+        """Current value of a column, by column name"""
+        return getattr(self, ATTRIBUTES[column])
+
+    def updated(self, values):
+        """Copy of the record with some columns changed ({column: value})"""
+        record = self.__class__.__new__(self.__class__)
+        record.page_id = self.page_id
+        record.last_edited_time = self.last_edited_time
+        record._loaded = frozenset(self._loaded) | frozenset(values)
+        for attr, column, _ in FIELDS:
+            setattr(record, attr, values[column] if column in values else getattr(self, attr))
+        return record
+
+    @property
+    def id(self):
+        return self.page_id
+
+    @property
+    def display_name(self):
+        """First + last name, else Fullname, else whichever name part exists"""
+        if self.first_name and self.last_name:
+            return f"{self.first_name} {self.last_name}"
+        return self.fullname or self.first_name or self.last_name or "Unknown"
+
+    @property
+    def full_name(self):
+        """
+        "First Last" for the title column. The Fullname column holds the
+        first name, so it wins over the title, which may already hold the
+        full name.
+        """
+        first = self.fullname or self.first_name
+        if first and self.last_name:
+            return f"{first} {self.last_name}"
+        return first or "Unknown"
+
+    @property
+    def socials(self):
+        """Existing social media handles/URLs by platform ('' when unset)"""
+        return {
+            'instagram': self.instagram,
+            'facebook': self.facebook,
+            'twitter': self.twitter,
+            'linkedin': self.linkedin,
+        }
+
+    def __repr__(self):
+        return f"TherapistRecord({self.page_id}, {self.display_name!r})"
@@ -0,0 +1,77 @@
+"""
+Retry policy for transient Notion API failures.
+
+A 500 in the middle of a full scan used to end the script (NotionAPIError ->
+exit(1)), and a PATCH that hit a 502 or a conflict was printed as an error and
+never tried again. The client now classifies each failure and retries the
+transient ones with exponential backoff and full jitter:
+
+    throttled    429 - Retry-After is honoured through the shared RateLimiter
+    conflict     409 - another write to the same page landed first
+    server       500, 502, 503, 504
+    timeout      requests.Timeout
+    connection   requests.ConnectionError (reset, refused, DNS blip)
+
+Other 4xx responses (bad request, missing permission, unknown page) are
+permanent and raised straight away. Every retry goes back through the
+RateLimiter, so retries spend the same global request budget as everything
+else instead of hammering the API.
+"""
+
+import random
+
+import requests
+
+# Status codes worth retrying, by kind
+RETRYABLE_STATUS = {
+    429: 'throttled',
+    409: 'conflict',
+    500: 'server',
+    502: 'server',
+    503: 'server',
+    504: 'server',
+}
+
+
+def classify(status_code=None, error=None):
+    """
+    Kind of transient failure, or None if it is permanent.
+
+    Args:
+        status_code: HTTP status of a non-200 response
+        error: requests exception raised instead of a response
+    """
+    if error is not None:
+        if isinstance(error, requests.Timeout):
+            return 'timeout'
+        if isinstance(error, requests.ConnectionError):
+            return 'connection'
+        return None
+    return RETRYABLE_STATUS.get(status_code)
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    The n-th retry waits a random time between 0 and
+    min(max_delay, base_delay * 2**n) seconds, which spreads the retries of
+    concurrent writers instead of having them all come back at once.
+
+    Args:
+        max_retries: Retries per request before the failure is raised
+        base_delay: First backoff ceiling in seconds
+        max_delay: Largest backoff ceiling in seconds
+    """
+
+    def __init__(self, max_retries=5, base_delay=0.5, max_delay=30.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        """Seconds to wait before retry number `attempt` (0-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
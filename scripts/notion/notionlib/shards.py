@@ -0,0 +1,157 @@
+"""
+Sharded full scans.
+
+A Notion query is a single cursor: every batch of 100 pages needs the
+next_cursor from the previous one, so a full scan of a big database is a
+chain of round trips and bound by latency, not by the rate limit.
+iter_sharded() splits the scan into disjoint created_time ranges, pages
+through each range on its own thread and merges the pages as they arrive:
+
+    created_time < t1 | t1 <= created_time < t2 | ... | created_time >= t3
+
+The first range is the probe batch described below, which covers everything
+created before t1; only the last range is open-ended, so every page lands in
+exactly one of them whatever its timestamp. All shards share the client's
+RateLimiter, so the speed-up comes from overlapping round trips, up to the
+request budget.
+
+The scan starts with one plain query for the oldest batch (sorted by
+created_time). A database that fits in it costs a single request as before.
+Otherwise the shards cover the rest: equal slices of time from the last
+created_time in that batch to now, the first one starting there rather than
+open-ended, so the pages already yielded aren't fetched again (only those
+sharing the boundary timestamp are, and they are skipped). A database filled
+mostly by one bulk import gains less, but is still read correctly.
+
+NOTION_QUERY_SHARDS sets the number of shards (1 turns sharding off).
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from notionlib.config import query_shards
+from notionlib.filters import all_of, created_before, created_on_or_after
+
+# Pages buffered between the shard threads and the consumer
+QUEUE_SIZE = 1000
+
+_DONE = object()
+
+
+def _iso(moment):
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def shard_filters(start, end, count, where=None, open_start=True):
+    """
+    Filters splitting [start, end) into `count` created_time ranges, the
+    last open-ended, each combined with `where` if given.
+
+    Args:
+        start, end: datetimes (or ISO strings)
+        open_start: Whether the first range also takes everything created
+                    before `start`
+    """
+    if isinstance(start, str):
+        start = datetime.fromisoformat(start.replace('Z', '+00:00'))
+    if isinstance(end, str):
+        end = datetime.fromisoformat(end.replace('Z', '+00:00'))
+
+    step = (end - start) / count
+    bounds = [_iso(start + step * i) for i in range(count)]
+
+    filters = []
+    for i in range(count):
+        parts = []
+        if i > 0 or not open_start:
+            parts.append(created_on_or_after(bounds[i]))
+        if i < count - 1:
+            parts.append(created_before(bounds[i + 1]))
+        if where is not None:
+            parts.append(where)
+        filters.append(parts[0] if len(parts) == 1 else all_of(*parts))
+    return filters
+
+
+def iter_sharded(client, database_id, shards=None, where=None, params=None, page_size=100):
+    """
+    Yield every page of a (filtered) full query, with the scan split across
+    `shards` concurrent created_time ranges. Pages come in no particular
+    order.
+
+    Args:
+        client: NotionClient (its RateLimiter is shared by the shards)
+        shards: Number of ranges (default NOTION_QUERY_SHARDS, or 4)
+        where: Optional Filter applied to every shard
+        params: Query string, e.g. Projection.query_params()
+    """
+    shards = shards or query_shards()
+    body = {"filter": where.to_notion()} if where is not None else {}
+
+    if shards <= 1:
+        yield from client.iter_query(database_id, page_size=page_size, params=params, **body)
+        return
+
+    # Oldest pages first, so the shards can start where this batch ends
+    oldest = [{"timestamp": "created_time", "direction": "ascending"}]
+    first = client.query_database(database_id, None, page_size, params, sorts=oldest, **body)
+    results = first.get('results', [])
+    yield from results
+    if not first.get('has_more'):
+        return
+
+    start = results[-1].get('created_time') if results else None
+    now = datetime.now(timezone.utc)
+    if not start or datetime.fromisoformat(start.replace('Z', '+00:00')) >= now:
+        # No usable boundary: carry on with the same cursor
+        data = first
+        while data.get('has_more'):
+            data = client.query_database(database_id, data.get('next_cursor'), page_size, params,
+                                         sorts=oldest, **body)
+            yield from data.get('results', [])
+        return
+
+    # Pages created at exactly `start` are in the first batch and the first shard
+    seen = {page['id'] for page in results if page.get('created_time') == start}
+
+    filters = shard_filters(start, now, shards, where, open_start=False)
+    pages = queue.Queue(maxsize=QUEUE_SIZE)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scan(shard):
+        try:
+            for page in client.iter_query(database_id, page_size=page_size, prefetch=False,
+                                          params=params, filter=shard.to_notion()):
+                if not put(page):
+                    return
+            put(_DONE)
+        except Exception as e:
+            put(e)
+
+    with ThreadPoolExecutor(max_workers=shards, thread_name_prefix='notion-shard') as pool:
+        for shard in filters:
+            pool.submit(scan, shard)
+
+        try:
+            running = len(filters)
+            while running:
+                item = pages.get()
+                if item is _DONE:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                elif item['id'] not in seen:
+                    yield item
+        finally:
+            stop.set()
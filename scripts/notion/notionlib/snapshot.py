@@ -0,0 +1,265 @@
+"""
+Local SQLite snapshot of a Notion database.
+
+Every script used to page through the whole therapists database before doing
+anything, so running show-remaining-other-contacts.py and then
+find-duplicate-phones.py cost two full scans. The snapshot keeps the raw page
+JSON on disk and refreshes it incrementally: only pages whose last_edited_time
+is on or after the newest one already stored are fetched again.
+
+Incremental queries can't see pages that were deleted or archived in Notion,
+so a full refresh (which also drops vanished pages) runs on first use and
+whenever the last full refresh is older than FULL_REFRESH_AFTER.
+
+Reads accept a notionlib.filters Filter, which is evaluated inside SQLite so
+only matching rows are decoded, and rows() takes a Projection so only the
+declared columns are pulled out of the stored JSON. With NOTION_SNAPSHOT=off
+the snapshot is kept in memory and both are pushed down into the Notion query
+(filter and filter_properties) instead.
+
+Plan mode (see notionlib.cli) reads the snapshot offline: load_pages(...,
+offline=True) opens what is already on disk without any Notion request.
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+from notionlib.config import snapshot_dir
+from notionlib.shards import iter_sharded
+
+FULL_REFRESH_AFTER = 24 * 60 * 60
+READ_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id TEXT PRIMARY KEY,
+    last_edited_time TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SnapshotMissing(Exception):
+    """An offline read found no synced snapshot on disk"""
+
+
+class Snapshot:
+    """
+    On-disk copy of one database's pages.
+
+    Args:
+        database_id: Notion database the snapshot mirrors
+        path: SQLite file (defaults to <database_id>.sqlite in snapshot_dir(),
+              .cache/ next to the scripts); ':memory:' gives a throwaway
+              snapshot for one run
+    """
+
+    def __init__(self, database_id, path=None):
+        self.database_id = database_id
+        self.path = path or snapshot_path(database_id)
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count()
+
+    def close(self):
+        self.db.close()
+
+    # === META ===
+
+    def _get_meta(self, key, default=None):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def cursor(self):
+        """Newest last_edited_time seen by a refresh query (None before the first sync)"""
+        return self._get_meta('cursor')
+
+    def needs_full_refresh(self):
+        last_full = float(self._get_meta('full_refresh_at', 0))
+        return self.cursor is None or time.time() - last_full > FULL_REFRESH_AFTER
+
+    # === PAGES ===
+
+    def upsert(self, page):
+        """Store (or replace) one page, e.g. the page returned by a successful PATCH"""
+        # ON CONFLICT keeps the existing rowid, so a page rewritten while
+        # pages() is iterating is not yielded a second time
+        self.db.execute(
+            "INSERT INTO pages (id, last_edited_time, data) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET last_edited_time = excluded.last_edited_time, data = excluded.data",
+            (page['id'], page.get('last_edited_time', ''), json.dumps(page))
+        )
+
+    def count(self, where=None):
+        """Number of stored pages, optionally only those matching a Filter"""
+        clause, params = where.to_sql() if where else ("1", [])
+        return self.db.execute(f"SELECT COUNT(*) FROM pages WHERE {clause}", params).fetchone()[0]
+
+    def edited_times(self):
+        """dict of page id -> stored last_edited_time"""
+        return dict(self.db.execute("SELECT id, last_edited_time FROM pages"))
+
+    def pages(self, where=None):
+        """
+        Yield stored pages as raw Notion page dicts, optionally only those
+        matching a Filter.
+
+        Rows are read in small keyset batches rather than through one open
+        cursor, so memory stays flat and writes can happen mid-iteration.
+        """
+        clause, params = where.to_sql() if where else ("1", [])
+        last_rowid = 0
+        while True:
+            rows = self.db.execute(
+                f"SELECT rowid, data FROM pages WHERE rowid > ? AND ({clause}) ORDER BY rowid LIMIT ?",
+                (last_rowid, *params, READ_BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                return
+            for last_rowid, data in rows:
+                yield json.loads(data)
+
+    def rows(self, projection, where=None):
+        """
+        Yield a compact Row per stored page (optionally matching a Filter),
+        extracting and decoding only the projection's columns.
+        """
+        clause, params = where.to_sql() if where else ("1", [])
+        paths = [f'$.properties."{column}"' for column in projection.columns]
+        selects = ''.join(", json_extract(data, ?)" for _ in paths)
+        last_rowid = 0
+
+        while True:
+            rows = self.db.execute(
+                f"SELECT rowid, id, last_edited_time{selects} FROM pages "
+                f"WHERE rowid > ? AND ({clause}) ORDER BY rowid LIMIT ?",
+                (*paths, last_rowid, *params, READ_BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                return
+            for last_rowid, page_id, last_edited_time, *props in rows:
+                props = [json.loads(prop) if prop else None for prop in props]
+                yield projection.decode_properties(page_id, last_edited_time, props)
+
+    def commit(self):
+        self.db.commit()
+
+    # === REFRESH ===
+
+    def refresh(self, client, full=None, where=None, projection=None, shards=None):
+        """
+        Bring the snapshot up to date and return how many pages were fetched.
+
+        Args:
+            client: NotionClient used for the query
+            full: Force (True) or skip (False) a full refresh; by default a
+                  full refresh happens only when needs_full_refresh() says so
+            where: Filter pushed down into a full query. The snapshot then only
+                   holds matching pages, so this is meant for ':memory:'
+                   snapshots and no sync cursor is recorded.
+            projection: Projection pushed down as filter_properties alongside
+                        `where` (same caveat: stored pages are partial)
+            shards: Concurrent created_time ranges for full queries (see
+                    notionlib.shards); incremental queries stay sequential
+        """
+        partial = where is not None or projection is not None
+        if partial:
+            full = True
+        elif full is None:
+            full = self.needs_full_refresh()
+
+        started = time.time()
+        cursor = self.cursor
+
+        if partial:
+            params = projection.query_params(client, self.database_id) if projection is not None else None
+            results = iter_sharded(client, self.database_id, shards, where=where, params=params)
+        elif full:
+            results = iter_sharded(client, self.database_id, shards)
+        else:
+            results = client.iter_query(
+                self.database_id,
+                filter={"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": cursor}},
+                sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}]
+            )
+
+        fetched = 0
+        with self.db:
+            if full:
+                self.db.execute("DELETE FROM pages")
+
+            for page in results:
+                fetched += 1
+                self.upsert(page)
+                edited = page.get('last_edited_time')
+                if edited and (cursor is None or edited > cursor):
+                    cursor = edited
+
+            if partial:
+                return fetched
+            if cursor:
+                self._set_meta('cursor', cursor)
+            if full:
+                self._set_meta('full_refresh_at', started)
+
+        return fetched
+
+
+def snapshot_path(database_id):
+    """Default snapshot file for a database"""
+    return os.path.join(snapshot_dir(), f"{database_id}.sqlite")
+
+
+def load_pages(client, database_id, where=None, columns=None, full=None, offline=False):
+    """
+    Refresh the snapshot for database_id and return it ready to read.
+
+    With offline=True nothing is fetched: the snapshot on disk is returned
+    as it is, and SnapshotMissing is raised if it has never been synced.
+
+    Set NOTION_SNAPSHOT=off to bypass the on-disk cache: the pages matching
+    `where` are then queried live (with the filter and the `columns`
+    Projection pushed down to Notion) into an in-memory snapshot for this
+    run only.
+    """
+    if offline:
+        path = snapshot_path(database_id)
+        snapshot = Snapshot(database_id, path=path) if os.path.exists(path) else None
+        if snapshot is None or snapshot.cursor is None:
+            if snapshot is not None:
+                snapshot.close()
+            raise SnapshotMissing(f"no local snapshot in {snapshot_dir()} yet - run without --plan, or add --refresh")
+        print(f"🗄️  Snapshot: {len(snapshot)} pages (offline, not refreshed)")
+        return snapshot
+
+    if os.getenv('NOTION_SNAPSHOT', 'on').lower() in ('off', '0', 'false'):
+        snapshot = Snapshot(database_id, path=':memory:')
+        fetched = snapshot.refresh(client, full=True, where=where, projection=columns)
+        print(f"🗄️  Live query: {fetched} pages fetched from Notion")
+        return snapshot
+
+    snapshot = Snapshot(database_id)
+    fetched = snapshot.refresh(client, full=full)
+    print(f"🗄️  Snapshot: {len(snapshot)} pages ({fetched} fetched from Notion)")
+    return snapshot
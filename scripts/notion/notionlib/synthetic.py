@@ -0,0 +1,208 @@
+"""
+Synthetic therapists database for benchmarks and the mock server.
+
+synthetic_pages(count) builds Notion page dicts shaped like the real
+database (every column in notionlib.columns, property ids, created and
+edited times) with the kind of mess the cleanup scripts exist for: "Other
+contacts" text ranging from "as above" and "n/a" to "Instagram: @handle",
+bare domains, several URLs on one line and phone numbers missing their
+leading 0, phones typed five different ways, shared practice numbers and
+websites, half-filled social columns. Values are drawn from a seeded RNG,
+so a given (count, seed) always produces the same pages.
+
+    mock = MockNotion()
+    mock.add_database('bench', synthetic_pages(10000))
+"""
+
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from notionlib.columns import (
+    ADMIN_NOTES,
+    BULK_BILLING,
+    BUSINESS_NAME,
+    COLUMN_TYPES,
+    EMAIL,
+    FACEBOOK,
+    FIRST_NAME,
+    FULLNAME,
+    INSTAGRAM,
+    LAST_NAME,
+    LINKEDIN,
+    OTHER_CONTACTS,
+    PHONE,
+    PRICE_TIER,
+    REBATES,
+    SESSION_FEE,
+    TWITTER,
+    WEBSITE,
+)
+from notionlib.mockserver import read_value
+
+FIRST_NAMES = [
+    'Jane', 'Bob', 'Amy', 'Carl', 'Dana', 'Priya', 'Tom', 'Mei', 'Sam', 'Olivia',
+    'Liam', 'Aisha', 'Noah', 'Chloe', 'Raj', 'Grace', 'Ethan', 'Zoe', 'Lucas', 'Hannah',
+]
+LAST_NAMES = [
+    'Smith', 'Jones', 'Lee', 'Ng', 'Wu', 'Patel', 'Brown', 'Nguyen', 'Wilson', 'Taylor',
+    "O'Brien", 'Kaur', 'Martin', 'Chen', 'Singh', 'Kelly', 'Murphy', 'Tran', 'Walker', 'Young',
+]
+PRACTICE_WORDS = ['Mindful', 'Bayside', 'Northside', 'Clear Path', 'Healing', 'Inner West', 'Harbour', 'Sunrise']
+PRACTICE_KINDS = ['Psychology', 'Counselling', 'Therapy', 'Wellbeing Centre']
+SUBURBS = ['Fitzroy', 'Carlton', 'Geelong', 'Ballarat', 'Bendigo', 'Richmond', 'Brunswick', 'Frankston']
+REBATE_OPTIONS = ['Medicare', 'Private health', 'NDIS', 'Sliding scale', 'EAP']
+
+# Therapists in a clinic share its phone number and website
+CLINIC_SHARE = 0.15
+
+# Share of rows with anything in "Other contacts"
+OTHER_CONTACTS_SHARE = 0.7
+
+START = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+def _iso(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _slug(*parts):
+    return ''.join(part.lower() for part in parts).replace("'", '').replace(' ', '')
+
+
+def _phone(rng):
+    """An Australian number, typed one of the ways people type them"""
+    if rng.random() < 0.6:
+        digits = f"04{rng.randrange(10**8):08d}"
+        return rng.choice([
+            digits,
+            f"{digits[:4]} {digits[4:7]} {digits[7:]}",
+            f"+61 {digits[1:4]} {digits[4:7]} {digits[7:]}",
+            f"{digits[:4]}-{digits[4:7]}-{digits[7:]}",
+        ])
+    area, local = rng.choice(['03', '02']), f"{rng.randrange(10**8):08d}"
+    return rng.choice([
+        f"{area}{local}",
+        f"({area}) {local[:4]} {local[4:]}",
+        f"{local[:4]} {local[4:]}",
+        f"+61 {area[1]} {local[:4]} {local[4:]}",
+    ])
+
+
+def _other_contacts(rng, person, clinic):
+    """Free text for "Other contacts", as therapists actually filled it in"""
+    handle = rng.choice([person['slug'], f"{person['slug']}.psych", f"{person['first'].lower()}_counselling"])
+    templates = [
+        lambda: 'as above',
+        lambda: rng.choice(['n/a', 'N/A', 'nil', 'none', 'see above', 'same as above']),
+        lambda: 'linkedin',
+        lambda: f"Instagram: @{handle}",
+        lambda: f"@{handle}",
+        lambda: f"@{handle} (instagram)",
+        lambda: f"Facebook & Instagram - {handle}",
+        lambda: f"IG {handle}",
+        lambda: handle if '_' in handle else f"{handle}_x",
+        lambda: f"https://www.facebook.com/{handle} www.{person['slug']}.com.au",
+        lambda: f"facebook.com/{handle}",
+        lambda: f"https://instagram.com/{handle}/",
+        lambda: f"linkedin.com/in/{person['slug']}",
+        lambda: f"https://www.tiktok.com/@{handle}",
+        lambda: f"Twitter: @{handle}",
+        lambda: f"www.{person['slug']}psychology.com.au",
+        lambda: f"Ph {_phone(rng)}",
+        lambda: f"Mobile: {_phone(rng)}  email {person['email']}",
+        lambda: f"4{rng.randrange(10**8):08d}",
+        lambda: person['email'],
+        lambda: f"https://www.psychologytoday.com/au/counselling/{person['slug']}-{rng.randrange(10**6)}",
+        lambda: f"Listed on the APS directory (psychology.com.au) - {rng.choice(SUBURBS)}",
+        lambda: clinic['name'] if clinic else f"{rng.choice(PRACTICE_WORDS)} {rng.choice(PRACTICE_KINDS)}",
+        lambda: f"{clinic['phone'] if clinic else _phone(rng)}, {clinic['website'] if clinic else 'www.example.com.au'}",
+        lambda: f"Instagram @{handle} / FB {handle} / {_phone(rng)}",
+    ]
+    text = rng.choice(templates)()
+    # Stray whitespace and case, as pasted from the intake form
+    if rng.random() < 0.1:
+        text = f"  {text} "
+    if rng.random() < 0.05:
+        text = text.upper()
+    return text
+
+
+def _values(rng, index, clinics):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    person = {'first': first, 'last': last, 'slug': _slug(first, last)}
+    person['email'] = f"{person['slug']}{index}@example.com.au"
+    clinic = rng.choice(clinics) if clinics and rng.random() < CLINIC_SHARE else None
+
+    values = {
+        FIRST_NAME: first,
+        LAST_NAME: last,
+        FULLNAME: f"{first} {last}" if rng.random() < 0.8 else None,
+        BUSINESS_NAME: clinic['name'] if clinic else (
+            f"{last} {rng.choice(PRACTICE_KINDS)}" if rng.random() < 0.4 else None),
+        EMAIL: person['email'] if rng.random() < 0.9 else None,
+        PHONE: clinic['phone'] if clinic else (_phone(rng) if rng.random() < 0.75 else None),
+        WEBSITE: clinic['website'] if clinic else (
+            f"https://www.{person['slug']}.com.au" if rng.random() < 0.35 else None),
+        INSTAGRAM: f"@{person['slug']}" if rng.random() < 0.1 else None,
+        FACEBOOK: f"https://facebook.com/{person['slug']}" if rng.random() < 0.1 else None,
+        TWITTER: None,
+        LINKEDIN: f"https://linkedin.com/in/{person['slug']}" if rng.random() < 0.05 else None,
+        SESSION_FEE: rng.choice([None, 90, 110, 140, 160, 175, 195, 220, 240, 260, 300]),
+        BULK_BILLING: rng.random() < 0.1,
+        REBATES: rng.sample(REBATE_OPTIONS, rng.randrange(3)),
+        PRICE_TIER: None,
+        ADMIN_NOTES: "Imported from intake form" if rng.random() < 0.2 else None,
+    }
+    if rng.random() < OTHER_CONTACTS_SHARE:
+        values[OTHER_CONTACTS] = _other_contacts(rng, person, clinic)
+    return values
+
+
+def _property(kind, value):
+    """A column value in write format, as the scripts would PATCH it"""
+    if kind in ('title', 'rich_text'):
+        return [{"text": {"content": value}}] if value else []
+    if kind in ('select', 'status'):
+        return {"name": value} if value else None
+    if kind == 'multi_select':
+        return [{"name": option} for option in value or []]
+    if kind == 'checkbox':
+        return bool(value)
+    return value
+
+
+def synthetic_pages(count, seed=0):
+    """
+    Yield `count` therapist pages (raw Notion page dicts).
+
+    Args:
+        count: Number of pages
+        seed: RNG seed; the same seed gives the same pages
+    """
+    rng = random.Random(seed)
+    property_ids = {column: f"p{i:03d}" for i, column in enumerate(COLUMN_TYPES)}
+
+    clinics = []
+    for _ in range(max(1, count // 50)):
+        name = f"{rng.choice(PRACTICE_WORDS)} {rng.choice(PRACTICE_KINDS)} {rng.choice(SUBURBS)}"
+        clinics.append({'name': name, 'phone': _phone(rng), 'website': f"https://www.{_slug(name)}.com.au"})
+
+    span = (datetime(2025, 10, 1, tzinfo=timezone.utc) - START).total_seconds()
+    for index in range(count):
+        values = _values(rng, index, clinics)
+        created = START + timedelta(seconds=span * index / max(1, count))
+        edited = created + timedelta(days=rng.randrange(0, 60))
+
+        yield {
+            "object": "page",
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "created_time": _iso(created),
+            "last_edited_time": _iso(edited),
+            "archived": False,
+            "properties": {
+                column: {"id": property_ids[column], "type": kind,
+                         kind: read_value(kind, _property(kind, values.get(column)))}
+                for column, kind in COLUMN_TYPES.items()
+            },
+        }
@@ -0,0 +1,129 @@
+"""
+Concurrent page writer.
+
+The cleanup scripts used to send one PATCH to /v1/pages/{id} and wait for it
+before moving to the next row, so a full-database run was bound by round-trip
+latency rather than by Notion's rate limit. WriteExecutor keeps a small number
+of PATCHes in flight on a thread pool; they all go through the client's shared
+RateLimiter, so concurrency fills the request budget without exceeding it.
+
+Results are handed back on the caller's thread (from submit() and close()) so
+scripts can keep printing their per-row success/error lines without worker
+threads interleaving output. Transient errors are already retried by the
+client, so a failure here is final; scripts list them at the end with
+print_failed_pages().
+"""
+
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from notionlib.client import NotionAPIError
+
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+class WriteResult(namedtuple('WriteResult', ['page_id', 'label', 'page', 'error'])):
+    """Outcome of one page PATCH; `page` is the updated page on success"""
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class WriteExecutor:
+    """
+    Send page updates concurrently with a bounded number in flight.
+
+    Args:
+        client: NotionClient used for the PATCHes (its rate limiter is shared)
+        max_in_flight: Number of PATCHes allowed to be outstanding at once
+        on_result: Optional callback(WriteResult), called on the submitting thread
+        snapshot: Optional Snapshot to keep current with the pages Notion returns
+
+    Usage:
+        with WriteExecutor(client, on_result=report) as writer:
+            for page_id, updates in changes:
+                writer.submit(page_id, updates, label=name)
+    """
+
+    def __init__(self, client, max_in_flight=DEFAULT_MAX_IN_FLIGHT, on_result=None, snapshot=None):
+        self.client = client
+        self.max_in_flight = max_in_flight
+        self.on_result = on_result
+        self.snapshot = snapshot
+
+        self.succeeded = 0
+        self.failures = []
+
+        self._pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='notion-write')
+        self._pending = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, page_id, properties, label):
+        try:
+            page = self.client.update_page(page_id, properties)
+            return WriteResult(page_id, label, page, None)
+        except (NotionAPIError, requests.RequestException) as e:
+            return WriteResult(page_id, label, None, e)
+
+    def _collect(self, futures):
+        for future in futures:
+            self._pending.discard(future)
+            result = future.result()
+
+            if result.ok:
+                self.succeeded += 1
+                if self.snapshot is not None:
+                    self.snapshot.upsert(result.page)
+            else:
+                self.failures.append(result)
+
+            if self.on_result:
+                self.on_result(result)
+
+    def submit(self, page_id, properties, label=None):
+        """Queue a PATCH, blocking while the in-flight window is full"""
+        # Allow one extra window of queued work so workers never sit idle
+        while len(self._pending) >= self.max_in_flight * 2:
+            done, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+            self._collect(done)
+
+        self._pending.add(self._pool.submit(self._write, page_id, properties, label))
+        self._collect([f for f in self._pending if f.done()])
+
+    def flush(self):
+        """Wait for every queued PATCH to finish"""
+        if self._pending:
+            done, _ = wait(self._pending)
+            self._collect(done)
+
+    def close(self):
+        self.flush()
+        self._pool.shutdown()
+        if self.snapshot is not None:
+            self.snapshot.commit()
+
+
+def print_failed_pages(failures):
+    """Final list of the pages whose update still failed after all retries"""
+    if not failures:
+        return
+    print()
+    print(f"❌ Failed pages ({len(failures)}):")
+    for result in failures:
+        print(f"   • {result.label}  ({result.page_id}): {result.error}")
+
+
+def print_write_result(result):
+    """Per-row success/error line used by the scripts as their on_result callback"""
+    if result.ok:
+        print(f"   ✅ Updated: {result.label}")
+    else:
+        print(f"   ❌ Error ({result.label}): {result.error}")
@@ -8,42 +8,20 @@ Reorganize name columns in Notion database:
 This will make the card view show the full name instead of just first name.
 """
 
-import os
-import requests
-import time
-from dotenv import load_dotenv
+from notionlib import WriteExecutor, print_failed_pages, print_write_result, require_env
+from notionlib.cli import fixer_arguments, fixer_client, load_snapshot, save_plan
+from notionlib.columns import FIRST_NAME, FULLNAME
+from notionlib.plan import WritePlan
+from notionlib.record import TherapistRecord
 
-load_dotenv()
+THERAPISTS_DB_ID = require_env('THERAPISTS_DATABASE_ID')
 
-NOTION_TOKEN = os.getenv('NOTION_TOKEN')
-THERAPISTS_DB_ID = os.getenv('THERAPISTS_DATABASE_ID')
-
-if not NOTION_TOKEN or not THERAPISTS_DB_ID:
-    print("❌ Error: NOTION_TOKEN and THERAPISTS_DATABASE_ID required in .env")
-    exit(1)
-
-NOTION_VERSION = "2022-06-28"
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Notion-Version": NOTION_VERSION,
-    "Content-Type": "application/json"
-}
-
-def get_property_value(prop):
-    """Extract value from a Notion property"""
-    if not prop:
-        return ""
-    
-    prop_type = prop.get('type')
-    
-    if prop_type == 'title':
-        return prop.get('title', [{}])[0].get('plain_text', '') if prop.get('title') else ''
-    elif prop_type == 'rich_text':
-        return prop.get('rich_text', [{}])[0].get('plain_text', '') if prop.get('rich_text') else ''
-    
-    return ""
+# Columns this script reads (everything else is neither fetched nor decoded)
+COLUMNS = TherapistRecord.projection()
 
 def main():
+    args = fixer_arguments(__file__, __doc__)
+    
     print("═" * 80)
     print("  Reorganize Name Columns")
     print("  Making 'Full Name' the title column for better card display")
@@ -66,63 +44,34 @@ def main():
     print()
     print("🔍 Reading database...\n")
     
-    # Query the database
-    url = f"https://api.notion.com/v1/databases/{THERAPISTS_DB_ID}/query"
-    all_results = []
-    has_more = True
-    start_cursor = None
+    # Refresh the local snapshot (only pages edited since the last run are fetched),
+    # or read it offline in --plan mode
+    client = fixer_client(args)
+    snapshot = load_snapshot(client, THERAPISTS_DB_ID, args, columns=COLUMNS)
     
-    while has_more:
-        payload = {"page_size": 100}
-        if start_cursor:
-            payload["start_cursor"] = start_cursor
-        
-        response = requests.post(url, headers=HEADERS, json=payload)
-        
-        if response.status_code != 200:
-            print(f"❌ Error: {response.json()}")
-            exit(1)
-        
-        data = response.json()
-        all_results.extend(data.get('results', []))
-        has_more = data.get('has_more', False)
-        start_cursor = data.get('next_cursor')
-    
-    print(f"✅ Found {len(all_results)} total entries\n")
+    print(f"✅ Found {len(snapshot)} total entries\n")
     print("═" * 80)
     print()
     
-    updated_count = 0
+    plan = WritePlan()
     
-    for entry in all_results:
-        props = entry.get('properties', {})
-        page_id = entry.get('id')
-        
+    for therapist in snapshot.rows(COLUMNS):
         # Get current values
-        current_first_name_title = get_property_value(props.get('First Name'))  # This is the title column
-        current_last_name = get_property_value(props.get('Last Name'))
-        current_fullname_text = get_property_value(props.get('Fullname'))  # This has the actual first name
+        current_first_name_title = therapist.first_name  # This is the title column
+        current_last_name = therapist.last_name
+        current_fullname_text = therapist.fullname  # This has the actual first name
         
         # Determine what to use for each field
         # New Full Name (title) = First + Last
-        if current_fullname_text and current_last_name:
-            new_full_name = f"{current_fullname_text} {current_last_name}"
-        elif current_first_name_title and current_last_name:
-            new_full_name = f"{current_first_name_title} {current_last_name}"
-        elif current_fullname_text:
-            new_full_name = current_fullname_text
-        elif current_first_name_title:
-            new_full_name = current_first_name_title
-        else:
-            new_full_name = "Unknown"
+        new_full_name = therapist.full_name
         
         # New First Name (from Fullname field)
         new_first_name = current_fullname_text if current_fullname_text else current_first_name_title
         
         # Build the update
         updates = {
-            'First Name': {'title': [{'text': {'content': new_full_name}}]},  # Title column becomes Full Name
-            'Fullname': {'rich_text': [{'text': {'content': new_first_name}}]}  # Fullname becomes First Name
+            FIRST_NAME: new_full_name,  # Title column becomes Full Name
+            FULLNAME: new_first_name  # Fullname becomes First Name
         }
         
         print(f"📝 {new_full_name}")
@@ -134,30 +83,30 @@ def main():
         print(f"      Title column: \"{new_full_name}\" (shows on cards)")
         print(f"      Fullname field: \"{new_first_name}\" (will become 'First Name')")
         
-        # Update the page
-        update_url = f"https://api.notion.com/v1/pages/{page_id}"
-        update_payload = {"properties": updates}
-        
-        update_response = requests.patch(update_url, headers=HEADERS, json=update_payload)
-        
-        if update_response.status_code == 200:
-            print(f"   ✅ Updated successfully")
-            updated_count += 1
-        else:
-            error_data = update_response.json()
-            print(f"   ❌ Error: {error_data.get('message', 'Unknown error')}")
+        # Queue the update (columns that already hold these values are skipped)
+        plan.update(therapist, updates, label=new_full_name)
         
         print("   " + "─" * 76)
         print()
-        
-        # Rate limiting
-        time.sleep(0.334)
     
+    plan.report()
+    
+    if args.plan:
+        save_plan(plan, args)
+        return
+    
+    with WriteExecutor(client, on_result=print_write_result, snapshot=snapshot) as writer:
+        plan.apply(writer)
+    
+    print_failed_pages(writer.failures)
+    updated_count = writer.succeeded
+
     print()
     print("═" * 80)
     print()
     print("📊 Summary:")
     print(f"   Entries updated: {updated_count}")
+    print(f"   Failed updates: {len(writer.failures)}")
     print()
     print("⚠️  IMPORTANT: Manual steps required in Notion:")
     print()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Run the routine cleanup fixers as one pass over the database.
+
+Running the fixers one after another costs a database read and a write
+stream each. Here each fixer is a stage: its own fix(therapist, plan),
+applied to every row in a single scan, in this order:
+
+    fix-duplicate-phones.py
+    clean-other-contacts.py
+    intelligent-cleanup-other-contacts.py
+    final-comprehensive-cleanup.py
+    auto-populate-price-tier.py
+
+A stage sees the changes earlier stages queued for the row (a cleared
+"Other Contacts", a newly filled Phone), exactly as if they had been written
+before it ran, and only rows passing its own WHERE filter reach it. All
+changes go into one WritePlan, so each page gets at most one PATCH.
+
+Takes --plan / --refresh like the fixers themselves.
+"""
+
+from notionlib import WriteExecutor, print_failed_pages, print_write_result, require_env
+from notionlib.cli import fixer_arguments, fixer_client, load_script, load_snapshot, save_plan
+from notionlib.filters import any_of
+from notionlib.plan import WritePlan
+from notionlib.record import TherapistRecord
+
+THERAPISTS_DB_ID = require_env('THERAPISTS_DATABASE_ID')
+
+# Fixer scripts run as stages, in order; each provides WHERE, COLUMNS and fix(therapist, plan)
+STAGES = [
+    'fix-duplicate-phones.py',
+    'clean-other-contacts.py',
+    'intelligent-cleanup-other-contacts.py',
+    'final-comprehensive-cleanup.py',
+    'auto-populate-price-tier.py',
+]
+
+def main():
+    args = fixer_arguments(__file__, __doc__)
+
+    print("═" * 80)
+    print("  Maintenance Pass")
+    print(f"  {len(STAGES)} cleanup stages, one scan, one write per page")
+    print("═" * 80)
+    print()
+
+    stages = [(name, load_script(name)) for name in STAGES]
+
+    # Every column any stage reads, and every row any stage wants
+    columns = TherapistRecord.projection([column for _, stage in stages for column in stage.COLUMNS])
+    where = any_of(*[stage.WHERE for _, stage in stages])
+
+    print("🔍 Reading Victorian Therapists database...\n")
+
+    # Refresh the local snapshot (only pages edited since the last run are fetched),
+    # or read it offline in --plan mode
+    client = fixer_client(args)
+    snapshot = load_snapshot(client, THERAPISTS_DB_ID, args, where=where, columns=columns)
+
+    print(f"✅ Found {snapshot.count(where)} entries for at least one stage\n")
+    print("═" * 80)
+    print()
+
+    plan = WritePlan()
+    changed = {name: 0 for name, _ in stages}
+
+    for therapist in snapshot.rows(columns, where):
+        for name, stage in stages:
+            # The row as earlier stages left it
+            record = plan.view(therapist)
+            if stage.WHERE.matches(record) and stage.fix(record, plan):
+                changed[name] += 1
+
+    plan.report()
+
+    if args.plan:
+        save_plan(plan, args)
+        return
+
+    with WriteExecutor(client, on_result=print_write_result, snapshot=snapshot) as writer:
+        plan.apply(writer)
+
+    print_failed_pages(writer.failures)
+
+    print()
+    print("═" * 80)
+    print()
+    print("📊 Summary:")
+    for name, count in changed.items():
+        print(f"   {name}: {count} entries changed")
+    print(f"   Pages updated: {writer.succeeded}")
+    print(f"   Failed updates: {len(writer.failures)}")
+    print()
+    print("✅ Maintenance pass complete!")
+
+if __name__ == "__main__":
+    main()
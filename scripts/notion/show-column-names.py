@@ -1,34 +1,20 @@
 #!/usr/bin/env python3
-import os
-import json
-import requests
-from dotenv import load_dotenv
+from notionlib import NotionAPIError, NotionClient, require_env
+from notionlib.properties import decode_properties
 
-# Load environment variables
-load_dotenv()
-
-NOTION_TOKEN = os.getenv('NOTION_TOKEN')
-THERAPISTS_DB_ID = os.getenv('THERAPISTS_DATABASE_ID')
-
-NOTION_VERSION = "2022-06-28"
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Notion-Version": NOTION_VERSION,
-    "Content-Type": "application/json"
-}
+NOTION_TOKEN, THERAPISTS_DB_ID = require_env('NOTION_TOKEN', 'THERAPISTS_DATABASE_ID')
+client = NotionClient(NOTION_TOKEN)
 
 def main():
     print("🔍 Fetching database schema...\n")
     
     # Get database schema
-    url = f"https://api.notion.com/v1/databases/{THERAPISTS_DB_ID}"
-    response = requests.get(url, headers=HEADERS)
-    
-    if response.status_code != 200:
-        print(f"❌ Error: {response.json()}")
+    try:
+        data = client.get_database(THERAPISTS_DB_ID)
+    except NotionAPIError as e:
+        print(f"❌ Error: {e.body}")
         exit(1)
     
-    data = response.json()
     properties = data.get('properties', {})
     
     print(f"📊 Database: {data.get('title', [{}])[0].get('plain_text', 'Unknown')}\n")
@@ -46,15 +32,12 @@ def main():
     # Now fetch one entry to see what columns have data
     print("\n🔍 Fetching sample entry...\n")
     
-    url = f"https://api.notion.com/v1/databases/{THERAPISTS_DB_ID}/query"
-    payload = {"page_size": 1}
-    response = requests.post(url, headers=HEADERS, json=payload)
-    
-    if response.status_code != 200:
-        print(f"❌ Error: {response.json()}")
+    try:
+        data = client.query_database(THERAPISTS_DB_ID, page_size=1)
+    except NotionAPIError as e:
+        print(f"❌ Error: {e.body}")
         exit(1)
     
-    data = response.json()
     results = data.get('results', [])
     
     if not results:
@@ -66,32 +49,13 @@ def main():
     print("Sample entry property values:")
     print("═" * 80)
     
-    for name, prop in entry_props.items():
-        prop_type = prop.get('type')
-        value = ""
-        
-        if prop_type == 'title':
-            value = prop.get('title', [{}])[0].get('plain_text', '') if prop.get('title') else ''
-        elif prop_type == 'rich_text':
-            value = prop.get('rich_text', [{}])[0].get('plain_text', '') if prop.get('rich_text') else ''
-        elif prop_type == 'phone_number':
-            value = prop.get('phone_number', '')
-        elif prop_type == 'url':
-            value = prop.get('url', '')
-        elif prop_type == 'email':
-            value = prop.get('email', '')
-        elif prop_type == 'select':
-            value = prop.get('select', {}).get('name', '') if prop.get('select') else ''
-        elif prop_type == 'multi_select':
-            value = ', '.join([s.get('name', '') for s in prop.get('multi_select', [])])
-        elif prop_type == 'checkbox':
-            value = '✓' if prop.get('checkbox') else '✗'
-        elif prop_type == 'date':
-            value = prop.get('date', {}).get('start', '') if prop.get('date') else ''
+    for name, value in decode_properties(entry_props).items():
+        if entry_props[name].get('type') == 'checkbox':
+            value = '✓' if value else '✗'
         
         if value:
             # Truncate long values
-            display_value = value[:100] + '...' if len(str(value)) > 100 else value
+            display_value = str(value)[:100] + '...' if len(str(value)) > 100 else value
             print(f"• {name}")
             print(f"  Value: {display_value}")
             print()
@@ -0,0 +1,57 @@
+"""
+Shared fixtures for the notionlib and script tests.
+
+Scripts under test run as subprocesses against an in-process MockNotion, with
+their snapshot directory, plan files and interpretation cache in tmp_path, so
+nothing touches Notion or the real .cache/.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from notionlib.mockserver import MockNotion, start_server  # noqa: E402
+from notionlib.synthetic import synthetic_pages  # noqa: E402
+
+DATABASE_ID = 'test-db'
+
+
+@pytest.fixture
+def mock_api():
+    """(MockNotion, base_url) serving a small synthetic therapists database"""
+    mock = MockNotion()
+    mock.add_database(DATABASE_ID, synthetic_pages(40, seed=1))
+    server, base_url = start_server(mock)
+    yield mock, base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def run_script(mock_api, tmp_path):
+    """run_script('<script>.py', *args) -> CompletedProcess, pointed at the mock"""
+    _, base_url = mock_api
+    env = dict(
+        os.environ,
+        NOTION_API_URL=base_url,
+        NOTION_TOKEN='mock',
+        THERAPISTS_DATABASE_ID=DATABASE_ID,
+        NOTION_SNAPSHOT_DIR=str(tmp_path / 'cache'),
+        NOTION_MEMO='off',
+    )
+    env.pop('NOTION_SNAPSHOT', None)
+
+    def run(script, *args, **overrides):
+        result = subprocess.run(
+            [sys.executable, os.path.join(SCRIPTS_DIR, script), *args],
+            env={**env, **overrides}, cwd=tmp_path, capture_output=True, text=True, timeout=120,
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+        return result
+
+    return run
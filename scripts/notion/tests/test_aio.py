@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import DATABASE_ID
+from notionlib.columns import ADMIN_NOTES
+from notionlib.mockserver import plain_value
+from notionlib.properties import encode_property
+
+httpx = pytest.importorskip('httpx')
+
+from notionlib.aio import AsyncNotionClient, AsyncRateLimiter, AsyncWriteExecutor  # noqa: E402
+
+
+def unlimited():
+    return AsyncRateLimiter(rate=1000, burst=1000)
+
+
+def test_query_and_write(mock_api):
+    mock, base_url = mock_api
+    results = []
+
+    async def run():
+        async with AsyncNotionClient('mock', base_url=base_url, rate_limiter=unlimited()) as client:
+            pages = await client.query_all(DATABASE_ID, page_size=15)
+            async with AsyncWriteExecutor(client, max_in_flight=3, on_result=results.append) as writer:
+                for page in pages[:5]:
+                    await writer.submit(page['id'], {ADMIN_NOTES: encode_property('rich_text', 'Async')})
+                await writer.submit('no-such-page', {ADMIN_NOTES: encode_property('rich_text', 'Async')})
+        return pages, writer
+
+    pages, writer = asyncio.run(run())
+
+    assert len(pages) == 40
+    assert mock.stats['POST databases/query'] == 3
+    assert writer.succeeded == 5
+    assert [failure.page_id for failure in writer.failures] == ['no-such-page']
+    assert writer.failures[0].error.status_code == 404
+    assert len(results) == 6
+    database = mock.databases[DATABASE_ID]
+    assert [plain_value(database.pages[page['id']]['properties'][ADMIN_NOTES]) for page in pages[:5]] == ['Async'] * 5
+
+
+def test_unexpected_errors_propagate():
+    class BrokenClient:
+        async def update_page(self, page_id, properties):
+            raise ValueError("bug")
+
+    async def run():
+        async with AsyncWriteExecutor(BrokenClient(), max_in_flight=1) as writer:
+            await writer.submit('page-1', {})
+            await writer.submit('page-2', {})   # the first write gave its slot back
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
+def test_apply_plan_async(mock_api, run_script, tmp_path):
+    mock, _ = mock_api
+    database = mock.databases[DATABASE_ID]
+    page_ids = sorted(database.pages)[:4]
+    plan = tmp_path / 'plan.jsonl'
+    plan.write_text(''.join(json.dumps({'page_id': page_id, 'changes': {ADMIN_NOTES: 'Async'}}) + '\n'
+                            for page_id in page_ids))
+
+    result = run_script('apply-plan.py', str(plan), '--async')
+    assert 'Entries updated: 4' in result.stdout
+    assert 'Plan complete: 4/4 pages' in result.stdout
+    assert mock.stats['PATCH pages'] == 4
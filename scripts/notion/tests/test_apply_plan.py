@@ -0,0 +1,79 @@
+import json
+
+from conftest import DATABASE_ID
+from notionlib.columns import ADMIN_NOTES
+from notionlib.mockserver import plain_value
+from notionlib.plan import load_plan
+
+
+def write_plan(path, page_ids):
+    with open(path, 'w', encoding='utf-8') as f:
+        for page_id in page_ids:
+            f.write(json.dumps({'page_id': page_id, 'label': page_id[:8], 'changes': {ADMIN_NOTES: 'Reviewed'}}) + '\n')
+
+
+def admin_notes(database, page_ids):
+    return [plain_value(database.pages[page_id]['properties'][ADMIN_NOTES]) for page_id in page_ids]
+
+
+def test_apply_plan_resumes_and_is_idempotent(mock_api, run_script, tmp_path):
+    mock, _ = mock_api
+    database = mock.databases[DATABASE_ID]
+    page_ids = sorted(database.pages)[:6]
+    plan = str(tmp_path / 'plan.jsonl')
+    write_plan(plan, page_ids)
+
+    # Two pages can't be written this time (404), as if the run had died partway
+    missing = {page_id: database.pages.pop(page_id) for page_id in page_ids[:2]}
+    result = run_script('apply-plan.py', plan)
+    assert 'Entries updated: 4' in result.stdout
+    assert 'Failed updates: 2' in result.stdout
+    assert mock.stats['PATCH pages'] == 6
+
+    database.pages.update(missing)
+    result = run_script('apply-plan.py', plan)
+    assert 'Already applied: 4' in result.stdout
+    assert 'Entries updated: 2' in result.stdout
+    assert 'Plan complete: 6/6 pages' in result.stdout
+    assert mock.stats['PATCH pages'] == 8
+    assert admin_notes(database, page_ids) == ['Reviewed'] * 6
+
+    # Nothing left to send
+    result = run_script('apply-plan.py', plan)
+    assert 'To write now: 0' in result.stdout
+    assert mock.stats['PATCH pages'] == 8
+
+    # --restart sends everything again and leaves the same values
+    result = run_script('apply-plan.py', plan, '--restart')
+    assert 'Entries updated: 6' in result.stdout
+    assert mock.stats['PATCH pages'] == 14
+    assert admin_notes(database, page_ids) == ['Reviewed'] * 6
+
+
+def test_restart_after_apply_with_a_synced_snapshot(mock_api, run_script, tmp_path):
+    mock, _ = mock_api
+    database = mock.databases[DATABASE_ID]
+    plan = str(tmp_path / 'plan.jsonl')
+
+    run_script('clean-other-contacts.py', '--plan', plan, '--refresh')
+    changes = list(load_plan(plan))
+    assert changes and all(change.last_edited_time for change in changes)
+
+    # The snapshot now holds our own writes, each edited after planning
+    result = run_script('apply-plan.py', plan)
+    assert f'Entries updated: {len(changes)}' in result.stdout
+
+    result = run_script('apply-plan.py', plan, '--restart')
+    assert 'Edited since planning (held back): 0' in result.stdout
+    assert f'Entries updated: {len(changes)}' in result.stdout
+    assert mock.stats['PATCH pages'] == 2 * len(changes)
+
+    # Someone else edits a page afterwards: that one is held back
+    edited = changes[0].page_id
+    database.pages[edited] = dict(database.pages[edited], last_edited_time='2099-01-01T00:00:00.000Z')
+    run_script('clean-other-contacts.py', '--plan', str(tmp_path / 'sync.jsonl'), '--refresh')
+
+    result = run_script('apply-plan.py', plan, '--restart')
+    assert 'Edited since planning (held back): 1' in result.stdout
+    assert f'Entries updated: {len(changes) - 1}' in result.stdout
+    assert f'Held back: {changes[0].label}' in result.stdout
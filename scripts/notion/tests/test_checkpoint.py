@@ -0,0 +1,86 @@
+from notionlib.checkpoint import HEADER, Checkpoint, file_digest
+
+
+def write_plan(tmp_path, *page_ids):
+    path = tmp_path / 'plan.jsonl'
+    path.write_text(''.join(f'{{"page_id": "{page_id}", "changes": {{}}}}\n' for page_id in page_ids))
+    return str(path)
+
+
+def test_progress_is_kept_across_runs(tmp_path):
+    plan = write_plan(tmp_path, 'page-1', 'page-2', 'page-3')
+
+    with Checkpoint(plan) as done:
+        done.mark('page-1')
+        done.mark('page-3')
+        done.mark('page-1')
+
+    with Checkpoint(plan) as done:
+        assert not done.stale
+        assert len(done) == 2
+        assert 'page-1' in done and 'page-3' in done and 'page-2' not in done
+        done.mark('page-2')
+
+    with open(f"{plan}.done") as f:
+        assert f.read().splitlines() == [HEADER + file_digest(plan), 'page-1', 'page-3', 'page-2']
+
+
+def test_a_changed_plan_starts_afresh(tmp_path):
+    plan = write_plan(tmp_path, 'page-1', 'page-2')
+    with Checkpoint(plan) as done:
+        done.mark('page-1')
+
+    plan = write_plan(tmp_path, 'page-1', 'page-2', 'page-4')
+    with Checkpoint(plan) as done:
+        assert done.stale
+        assert len(done) == 0
+
+    # The stale progress was replaced, not appended to
+    with Checkpoint(plan) as done:
+        assert not done.stale
+        assert len(done) == 0
+
+
+def test_restart_ignores_progress(tmp_path):
+    plan = write_plan(tmp_path, 'page-1', 'page-2')
+    with Checkpoint(plan) as done:
+        done.mark('page-1')
+
+    with Checkpoint(plan, restart=True) as done:
+        assert not done.stale
+        assert 'page-1' not in done
+        done.mark('page-2')
+
+    with Checkpoint(plan) as done:
+        assert 'page-1' not in done and 'page-2' in done
+
+
+def test_edit_times_survive_a_restart(tmp_path):
+    plan = write_plan(tmp_path, 'page-1', 'page-2')
+    with Checkpoint(plan) as done:
+        done.mark('page-1', '2025-10-14T03:12:00.000Z')
+        done.mark('page-2', '2025-10-14T03:12:00.000Z')
+
+    with Checkpoint(plan, restart=True) as done:
+        assert len(done) == 0
+        assert done.written == {'page-1': '2025-10-14T03:12:00.000Z', 'page-2': '2025-10-14T03:12:00.000Z'}
+        done.mark('page-1', '2025-10-15T09:40:00.000Z')
+
+    # Interrupted restart: page-2 is outstanding, but its earlier write is remembered
+    with Checkpoint(plan) as done:
+        assert list(done.done) == ['page-1']
+        assert done.written == {'page-1': '2025-10-15T09:40:00.000Z', 'page-2': '2025-10-14T03:12:00.000Z'}
+
+    # A new plan forgets them
+    plan = write_plan(tmp_path, 'page-1', 'page-2', 'page-3')
+    with Checkpoint(plan) as done:
+        assert done.stale and done.written == {}
+
+
+def test_custom_path(tmp_path):
+    plan = write_plan(tmp_path, 'page-1')
+    path = str(tmp_path / 'progress.txt')
+    with Checkpoint(plan, path=path) as done:
+        done.mark('page-1')
+
+    assert 'page-1' in Checkpoint(plan, path=path)
@@ -0,0 +1,68 @@
+import socket
+
+import pytest
+
+from notionlib.cli import fixer_arguments, fixer_client, load_snapshot
+from notionlib.client import NotionClient
+from notionlib.memo import Memo
+from notionlib.retry import RetryPolicy
+from notionlib.snapshot import snapshot_path
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_offline_plan_needs_no_client(monkeypatch):
+    monkeypatch.delenv('NOTION_TOKEN', raising=False)
+    assert fixer_client(fixer_arguments('fix.py', argv=['--plan'])) is None
+
+
+def test_load_snapshot_reports_a_missing_snapshot(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('NOTION_SNAPSHOT_DIR', str(tmp_path))
+    with pytest.raises(SystemExit) as exited:
+        load_snapshot(None, 'never-synced', fixer_arguments('fix.py', argv=['--plan']))
+
+    assert exited.value.code == 1
+    assert capsys.readouterr().out.startswith('❌ Error: no local snapshot')
+
+
+def test_load_snapshot_reports_connection_errors(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('NOTION_SNAPSHOT_DIR', str(tmp_path))
+    client = NotionClient('mock', base_url=f"http://127.0.0.1:{unused_port()}/v1",
+                          retry=RetryPolicy(max_retries=1, base_delay=0.01))
+    with pytest.raises(SystemExit) as exited:
+        load_snapshot(client, 'unreachable', fixer_arguments('fix.py', argv=['--plan', '--refresh']))
+
+    assert exited.value.code == 1
+    assert capsys.readouterr().out.startswith('❌ Error: could not reach Notion:')
+
+
+def test_read_only_scripts_report_connection_errors(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('NOTION_SNAPSHOT_DIR', str(tmp_path))
+    client = NotionClient('mock', base_url=f"http://127.0.0.1:{unused_port()}/v1",
+                          retry=RetryPolicy(max_retries=1, base_delay=0.01))
+    with pytest.raises(SystemExit) as exited:
+        load_snapshot(client, 'unreachable')
+
+    assert exited.value.code == 1
+    assert capsys.readouterr().out.startswith('❌ Error: could not reach Notion:')
+
+
+@pytest.mark.parametrize('script', [
+    'find-duplicate-phones.py', 'find-duplicate-profiles.py', 'show-remaining-other-contacts.py',
+])
+def test_read_only_scripts_sync_a_snapshot(script, run_script, tmp_path):
+    run_script(script)
+    assert (tmp_path / 'cache' / 'test-db.sqlite').exists()
+
+
+def test_cache_paths_follow_the_snapshot_dir_set_after_import(tmp_path, monkeypatch):
+    monkeypatch.setenv('NOTION_SNAPSHOT_DIR', str(tmp_path))
+    monkeypatch.delenv('NOTION_MEMO', raising=False)
+
+    assert fixer_arguments('/x/fix.py', argv=['--plan']).plan == str(tmp_path / 'plans' / 'fix.jsonl')
+    assert snapshot_path('db') == str(tmp_path / 'db.sqlite')
+    assert Memo('test', None, key=None, version='1').path == str(tmp_path / 'memo.sqlite')
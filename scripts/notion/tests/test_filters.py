@@ -0,0 +1,70 @@
+import pytest
+
+from notionlib.columns import BULK_BILLING, OTHER_CONTACTS, PHONE, PRICE_TIER, REBATES
+from notionlib.filters import all_of, any_of, equals, is_empty, is_not_empty, TimestampFilter
+from notionlib.record import TherapistRecord
+from notionlib.snapshot import Snapshot
+from notionlib.synthetic import synthetic_pages
+
+COLUMNS = TherapistRecord.projection([PHONE, OTHER_CONTACTS, PRICE_TIER, BULK_BILLING, REBATES])
+
+FILTERS = [
+    is_empty(PHONE),
+    is_not_empty(OTHER_CONTACTS),
+    is_empty(REBATES),
+    equals(BULK_BILLING, True),
+    equals(BULK_BILLING, False),
+    all_of(is_not_empty(OTHER_CONTACTS), is_empty(PHONE)),
+    any_of(is_empty(PHONE), equals(BULK_BILLING, True)),
+    all_of(is_empty(PRICE_TIER), any_of(is_not_empty(PHONE), is_not_empty(REBATES))),
+    TimestampFilter('last_edited_time', 'on_or_after', '2024-06-01T00:00:00.000Z'),
+]
+
+
+@pytest.fixture(scope='module')
+def snapshot():
+    snapshot = Snapshot('filters', path=':memory:')
+    for page in synthetic_pages(300, seed=2):
+        snapshot.upsert(page)
+    snapshot.commit()
+    yield snapshot
+    snapshot.close()
+
+
+@pytest.mark.parametrize('where', FILTERS, ids=lambda where: repr(where.to_notion())[:60])
+def test_sql_and_records_agree(snapshot, where):
+    everything = list(snapshot.rows(COLUMNS))
+    expected = {record.page_id for record in everything if where.matches(record)}
+
+    assert {record.page_id for record in snapshot.rows(COLUMNS, where)} == expected
+    assert snapshot.count(where) == len(expected)
+    # A dataset where every filter would pass or fail everything proves nothing
+    assert 0 < len(expected) < len(everything)
+
+
+def test_select_equals_compares_the_option_name(snapshot):
+    page = next(snapshot.pages())
+    page['id'] = 'tiered'
+    page['properties'][PRICE_TIER]['select'] = {'name': 'Standard', 'color': 'default'}
+    snapshot.upsert(page)
+
+    where = equals(PRICE_TIER, 'Standard')
+    assert [record.page_id for record in snapshot.rows(COLUMNS, where)] == ['tiered']
+    assert where.matches(TherapistRecord('tiered', price_tier='Standard'))
+    assert not where.matches(TherapistRecord('other', price_tier='Premium'))
+
+
+def test_to_notion():
+    assert all_of(is_empty(PHONE), equals(PRICE_TIER, 'Standard')).to_notion() == {'and': [
+        {'property': PHONE, 'rich_text': {'is_empty': True}},
+        {'property': PRICE_TIER, 'select': {'equals': 'Standard'}},
+    ]}
+
+
+def test_unsupported_filters_are_rejected():
+    with pytest.raises(ValueError):
+        equals(REBATES, 'Medicare').to_sql()
+    with pytest.raises(ValueError):
+        is_empty('No Such Column')
+    with pytest.raises(ValueError):
+        TimestampFilter('created_time', 'before', '2024-01-01').matches(TherapistRecord('page-1'))
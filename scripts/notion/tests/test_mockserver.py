@@ -0,0 +1,66 @@
+import re
+import time
+
+from conftest import DATABASE_ID
+from notionlib.client import NotionClient
+from notionlib.columns import OTHER_CONTACTS
+from notionlib.mockserver import plain_value
+from notionlib.plan import load_plan
+from notionlib.ratelimit import RateLimiter
+
+
+def test_api_url_is_read_when_the_client_is_built(monkeypatch):
+    monkeypatch.setenv('NOTION_API_URL', 'http://127.0.0.1:9/v1/')
+    assert NotionClient('mock').base_url == 'http://127.0.0.1:9/v1'
+
+    monkeypatch.delenv('NOTION_API_URL')
+    monkeypatch.setattr('notionlib.config.load_dotenv', lambda: None)
+    assert NotionClient('mock').base_url == 'https://api.notion.com/v1'
+
+
+def test_kept_alive_responses_are_not_delayed(mock_api):
+    _, base_url = mock_api
+    client = NotionClient('mock', base_url=base_url, rate_limiter=RateLimiter(rate=1000, burst=1000))
+    client.get_database(DATABASE_ID)
+
+    # Nagle plus the client's delayed ACK used to hold each response ~40 ms
+    started = time.perf_counter()
+    for _ in range(20):
+        client.get_database(DATABASE_ID)
+    assert time.perf_counter() - started < 0.4
+    client.session.close()
+
+
+def plan_pages(output):
+    return int(re.search(r'Plan saved: (\d+) pages', output).group(1))
+
+
+def test_plan_then_apply(mock_api, run_script, tmp_path):
+    mock, _ = mock_api
+    database = mock.databases[DATABASE_ID]
+    plan = str(tmp_path / 'clean-other-contacts.jsonl')
+
+    # No snapshot yet: the first plan syncs one from the mock
+    result = run_script('clean-other-contacts.py', '--plan', plan, '--refresh')
+    assert 'Nothing was written to Notion' in result.stdout
+    changes = list(load_plan(plan))
+    assert changes and plan_pages(result.stdout) == len(changes)
+    assert 'PATCH pages' not in mock.stats
+
+    # Planning again offline needs no token and sends no request
+    requests = mock.stats['requests']
+    result = run_script('clean-other-contacts.py', '--plan', plan, NOTION_TOKEN='')
+    assert plan_pages(result.stdout) == len(changes)
+    assert mock.stats['requests'] == requests
+
+    result = run_script('apply-plan.py', plan)
+    assert f'Entries updated: {len(changes)}' in result.stdout
+    assert mock.stats['PATCH pages'] == len(changes)
+    for change in changes:
+        if OTHER_CONTACTS in change.changes:
+            stored = plain_value(database.pages[change.page_id]['properties'][OTHER_CONTACTS])
+            assert stored == change.changes[OTHER_CONTACTS]
+
+    # Applied: the database has nothing left to clean
+    result = run_script('clean-other-contacts.py', '--plan', plan, '--refresh')
+    assert plan_pages(result.stdout) == 0
@@ -0,0 +1,45 @@
+import multiprocessing
+
+import pytest
+
+from notionlib import parallel
+from notionlib.cli import load_script
+from notionlib.parallel import map_in_processes
+from notionlib.record import TherapistRecord
+from notionlib.synthetic import synthetic_pages
+
+
+@pytest.fixture
+def script(monkeypatch):
+    monkeypatch.setenv('THERAPISTS_DATABASE_ID', 'test-db')
+    monkeypatch.setenv('NOTION_MEMO', 'off')
+    return load_script('intelligent-cleanup-other-contacts.py')
+
+
+@pytest.fixture
+def rows(script):
+    records = [TherapistRecord.from_page(page) for page in synthetic_pages(1200, seed=6)]
+    return [record.other_contacts for record in records], [script.row_context(record) for record in records]
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_pool_matches_inline_for_a_loaded_script(script, rows):
+    texts, contexts = rows
+    inline = list(map_in_processes(script.interpret_other_contacts, texts, contexts, workers=1))
+    pooled = list(map_in_processes(script.interpret_other_contacts, texts, contexts, workers=2, chunksize=100))
+
+    assert pooled == inline
+
+
+def test_without_fork_workers_run_inline(script, rows, monkeypatch, capsys):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("no pool without fork")
+
+    monkeypatch.setattr(multiprocessing, 'get_all_start_methods', lambda: ['spawn'])
+    monkeypatch.setattr(parallel, 'ProcessPoolExecutor', no_pool)
+
+    texts, contexts = rows
+    results = list(map_in_processes(script.interpret_other_contacts, texts, contexts, workers=2, chunksize=100))
+
+    assert len(results) == len(texts)
+    assert "--workers needs the 'fork' start method" in capsys.readouterr().out
@@ -0,0 +1,112 @@
+from notionlib.columns import INSTAGRAM, OTHER_CONTACTS, PHONE, REBATES
+from notionlib.plan import PageChange, WritePlan, load_plan
+from notionlib.record import TherapistRecord
+
+
+def record(page_id='page-1', **fields):
+    fields.setdefault('first_name', 'Jane')
+    fields.setdefault('last_name', 'Smith')
+    return TherapistRecord(page_id, '2025-10-01T00:00:00.000Z', **fields)
+
+
+def test_unchanged_values_are_dropped():
+    plan = WritePlan()
+    therapist = record(phone='(03) 9087 8379', other_contacts='')
+
+    assert not plan.set(therapist, PHONE, '(03) 9087 8379')
+    assert not plan.set(therapist, OTHER_CONTACTS, None)   # None and "" both mean empty
+    assert len(plan) == 0
+    assert plan.unchanged == 2
+
+
+def test_unread_columns_are_always_written():
+    plan = WritePlan()
+    therapist = TherapistRecord('page-1', first_name='Jane')
+
+    assert plan.set(therapist, PHONE, '')
+    assert list(plan) == [PageChange('page-1', 'Jane', {PHONE: ''}, None)]
+
+
+def test_list_values_compare_with_decoded_text():
+    plan = WritePlan()
+    therapist = record(rebates='Medicare, NDIS')
+
+    assert not plan.set(therapist, REBATES, ['Medicare', 'NDIS'])
+
+
+def test_changes_to_one_page_are_coalesced():
+    plan = WritePlan()
+    therapist = record(phone='0412345678', other_contacts='@janesmith')
+
+    assert plan.update(therapist, {PHONE: '0412 345 678'}) == {PHONE: '0412 345 678'}
+    assert plan.update(therapist, {OTHER_CONTACTS: '', INSTAGRAM: '@janesmith'}) == {
+        OTHER_CONTACTS: '', INSTAGRAM: '@janesmith'}
+
+    assert len(plan) == 1
+    assert plan.changes == 3
+    change, = plan
+    assert change.label == 'Jane Smith'
+    assert change.changes == {PHONE: '0412 345 678', OTHER_CONTACTS: '', INSTAGRAM: '@janesmith'}
+
+
+def test_view_shows_pending_changes():
+    plan = WritePlan()
+    therapist = record(phone='', other_contacts='0412 345 678')
+    plan.update(therapist, {PHONE: '0412 345 678', OTHER_CONTACTS: ''})
+
+    view = plan.view(therapist)
+    assert (view.phone, view.other_contacts) == ('0412 345 678', '')
+    assert therapist.phone == ''
+    assert plan.view(record('page-2')) is not view
+
+
+def test_restoring_the_original_value_cancels_the_change():
+    plan = WritePlan()
+    therapist = record(phone='0412345678', other_contacts='x')
+
+    plan.set(therapist, PHONE, '0412 345 678')
+    plan.set(therapist, OTHER_CONTACTS, '')
+    # A later stage sees the pending value, but the plan compares with Notion's
+    assert not plan.set(plan.view(therapist), PHONE, '0412345678')
+    assert [change.changes for change in plan] == [{OTHER_CONTACTS: ''}]
+
+    assert not plan.set(plan.view(therapist), OTHER_CONTACTS, 'x')
+    assert len(plan) == 0
+
+
+def test_properties_encode_for_the_patch():
+    plan = WritePlan()
+    assert plan.properties({PHONE: '0412 345 678', OTHER_CONTACTS: ''}) == {
+        PHONE: {'rich_text': [{'text': {'content': '0412 345 678'}}]},
+        OTHER_CONTACTS: {'rich_text': []},
+    }
+
+
+def test_save_and_load_round_trip(tmp_path):
+    plan = WritePlan()
+    plan.update(record('page-1', phone='0412345678'), {PHONE: '0412 345 678'})
+    plan.update(record('page-2', other_contacts='n/a'), {OTHER_CONTACTS: ''}, label='Bob')
+
+    path = tmp_path / 'plans' / 'fix.jsonl'
+    assert plan.save(str(path)) == 2
+    assert list(load_plan(str(path))) == list(plan)
+
+
+class Writer:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, page_id, properties, label=None):
+        self.submitted.append((page_id, properties, label))
+
+
+def test_apply_submits_one_patch_per_page():
+    plan = WritePlan()
+    therapist = record(phone='0412345678', other_contacts='x')
+    plan.set(therapist, PHONE, '0412 345 678')
+    plan.set(therapist, OTHER_CONTACTS, '')
+
+    writer = Writer()
+    assert plan.apply(writer) == 1
+    assert writer.submitted == [('page-1', plan.properties(
+        {PHONE: '0412 345 678', OTHER_CONTACTS: ''}), 'Jane Smith')]
@@ -0,0 +1,93 @@
+import pytest
+
+from conftest import DATABASE_ID
+from notionlib.client import NotionClient
+from notionlib.columns import OTHER_CONTACTS
+from notionlib.filters import is_not_empty
+from notionlib.mockserver import MockDatabase
+from notionlib.ratelimit import RateLimiter
+from notionlib.shards import iter_sharded, shard_filters
+from notionlib.synthetic import synthetic_pages
+
+
+class CountingClient(NotionClient):
+    """NotionClient that counts the pages each query returns"""
+
+    fetched = 0
+
+    def query_database(self, *args, **kwargs):
+        data = super().query_database(*args, **kwargs)
+        self.fetched += len(data.get('results', []))
+        return data
+
+
+@pytest.fixture
+def client(mock_api):
+    mock, base_url = mock_api
+    mock.add_database(DATABASE_ID, synthetic_pages(350, seed=3))
+    client = CountingClient('mock', base_url=base_url, rate_limiter=RateLimiter(rate=1000, burst=1000))
+    yield client
+    client.session.close()
+
+
+@pytest.mark.parametrize('shards', [1, 2, 4, 7])
+def test_every_page_once_and_no_batch_read_twice(mock_api, client, shards):
+    mock, _ = mock_api
+    ids = [page['id'] for page in iter_sharded(client, DATABASE_ID, shards=shards)]
+
+    assert sorted(ids) == sorted(mock.databases[DATABASE_ID].pages)
+    # Only the page the shards start at comes back a second time
+    assert client.fetched <= 350 + 1
+    assert 'GET databases' not in mock.stats
+
+
+def test_filtered_scan(mock_api, client):
+    mock, _ = mock_api
+    database = mock.databases[DATABASE_ID]
+    where = is_not_empty(OTHER_CONTACTS)
+    expected = database.select(where.to_notion())
+
+    ids = [page['id'] for page in iter_sharded(client, DATABASE_ID, shards=4, where=where)]
+    assert sorted(ids) == sorted(expected)
+    assert client.fetched <= len(expected) + 1
+
+
+def test_boundary_ties_are_yielded_once(mock_api, client):
+    mock, _ = mock_api
+    pages = list(synthetic_pages(250, seed=4))
+    # The 100th oldest page and the next 20 share one created_time
+    for page in pages[99:120]:
+        page['created_time'] = pages[99]['created_time']
+    mock.databases[DATABASE_ID] = MockDatabase(DATABASE_ID, pages)
+
+    ids = [page['id'] for page in iter_sharded(client, DATABASE_ID, shards=4)]
+    assert sorted(ids) == sorted(page['id'] for page in pages)
+
+
+def test_small_database_costs_one_request(mock_api, client):
+    mock, _ = mock_api
+    mock.databases[DATABASE_ID] = MockDatabase(DATABASE_ID, synthetic_pages(60, seed=5))
+
+    assert len(list(iter_sharded(client, DATABASE_ID, shards=4))) == 60
+    assert mock.stats['POST databases/query'] == 1
+
+
+def test_shard_filters_cover_the_range():
+    start, end = '2024-01-01T00:00:00.000Z', '2024-01-05T00:00:00.000Z'
+    bounded = [f.to_notion() for f in shard_filters(start, end, 2, open_start=False)]
+    assert bounded == [
+        {'and': [{'timestamp': 'created_time', 'created_time': {'on_or_after': '2024-01-01T00:00:00.000Z'}},
+                 {'timestamp': 'created_time', 'created_time': {'before': '2024-01-03T00:00:00.000Z'}}]},
+        {'timestamp': 'created_time', 'created_time': {'on_or_after': '2024-01-03T00:00:00.000Z'}},
+    ]
+    assert shard_filters(start, end, 2)[0].to_notion() == bounded[0]['and'][1]
+
+
+def test_shard_count_is_read_when_the_scan_starts(mock_api, client, monkeypatch):
+    mock, _ = mock_api
+    monkeypatch.setenv('NOTION_QUERY_SHARDS', '1')
+    ids = [page['id'] for page in iter_sharded(client, DATABASE_ID)]
+
+    # One cursor: 350 pages in four batches, no probe and no shard queries
+    assert len(ids) == 350
+    assert mock.stats['POST databases/query'] == 4